@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Booking
+from .models import Booking, RoomOccupancy
 
 
 # Register your models here.
@@ -18,3 +18,13 @@ class BookingAdmin(admin.ModelAdmin):
     )
 
     list_filter = ("kind",)
+
+
+@admin.register(RoomOccupancy)
+class RoomOccupancyAdmin(admin.ModelAdmin):
+    list_display = (
+        "room",
+        "month",
+        "nights",
+        "updated_at",
+    )
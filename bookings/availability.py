@@ -0,0 +1,111 @@
+"""
+방 예약 가능 여부
+
+예약 기간은 [check_in, check_out) 반열린 구간임.
+체크아웃 하는 날에 다음 손님이 체크인 할 수 있음.
+모든 조회는 (room_id, check_in, check_out) 인덱스 하나로 끝남.
+PostgreSQL 에서는 exclusion constraint 가 겹치는 예약 자체를 막아줌 (0004 migration).
+SQLite 에는 그런 제약이 없어서 예약 가능 여부는 예약끼리 안 겹친다고 가정하지 않고 직접 확인함.
+"""
+
+import calendar
+from datetime import date, timedelta
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import Exists, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+from rooms.models import Room
+from .models import Booking
+
+
+def overlapping(check_in, check_out):
+    """[check_in, check_out) 와 겹치는 예약"""
+    return Q(check_in__lt=check_out, check_out__gt=check_in)
+
+
+def room_bookings(room):
+    return Booking.objects.filter(
+        room=room,
+        kind=Booking.BookingKindChoices.ROOM,
+    )
+
+
+def latest_check_in_before(room, day):
+    """day 이전에 시작한 가장 마지막 예약 (인덱스에서 한칸만 읽음)"""
+    return room_bookings(room).filter(check_in__lt=day).order_by("-check_in")
+
+
+def is_room_available(room, check_in, check_out):
+    """방이 [check_in, check_out) 동안 비어있는지 (겹치는 예약이 있는지 EXISTS 한번)"""
+    return not room_bookings(room).filter(overlapping(check_in, check_out)).exists()
+
+
+def free_nights(room, year, month):
+    """해당 월에서 예약이 없는 밤(날짜) 목록"""
+    first = date(year, month, 1)
+    days = calendar.monthrange(year, month)[1]
+    end = first + timedelta(days=days)
+    bookings = room_bookings(room).filter(overlapping(first, end))
+    if connection.vendor == "postgresql":
+        # exclusion constraint 가 있으면 이번달 전에 시작해서 이번달까지 이어지는 예약은 많아야 하나니까
+        # 그 예약의 check_in 부터만 읽으면 됨 (check_in 범위 스캔)
+        bookings = bookings.filter(
+            check_in__gte=Coalesce(
+                Subquery(latest_check_in_before(room, first).values("check_in")[:1]),
+                Value(first),
+            )
+        )
+    taken = set()
+    for check_in, check_out in bookings.values_list("check_in", "check_out"):
+        night = max(check_in, first)
+        while night < min(check_out, end):
+            taken.add(night)
+            night += timedelta(days=1)
+    return [
+        first + timedelta(days=i)
+        for i in range(days)
+        if first + timedelta(days=i) not in taken
+    ]
+
+
+def available_rooms(check_in, check_out, rooms=None):
+    """
+    [check_in, check_out) 동안 비어있는 방들
+
+    겹치는 예약이 없는 방만 남기는 anti-join (NOT EXISTS) 한번이라서
+    방마다 따로 확인할 필요가 없음.
+    """
+    if rooms is None:
+        rooms = Room.objects.all()
+    return rooms.filter(
+        ~Exists(
+            Booking.objects.filter(
+                overlapping(check_in, check_out),
+                room=OuterRef("pk"),
+                kind=Booking.BookingKindChoices.ROOM,
+            )
+        )
+    )
+
+
+def book_room(create, room, check_in, check_out):
+    """
+    겹치는 예약이 없을때만 create() 로 예약을 만듬.
+
+    PostgreSQL 에서는 방 row 를 select_for_update 로 잠궈서 같은 방에 대한 동시 예약을 줄세우고,
+    그래도 exclusion constraint 에 걸리면 IntegrityError 가 나니까 같은 에러로 바꿔줌.
+    SQLite 는 select_for_update 를 무시함. 두 트랜잭션이 같이 확인을 통과하면
+    늦게 쓰려는 쪽이 "database is locked" OperationalError 로 실패하니까 다시 시도하라는 에러로 바꿔줌.
+    """
+    try:
+        with transaction.atomic():
+            Room.objects.select_for_update().filter(pk=room.pk).first()
+            if not is_room_available(room, check_in, check_out):
+                raise ValidationError("이미 예약된 방입니다.")
+            return create()
+    except IntegrityError:
+        raise ValidationError("이미 예약된 방입니다.")
+    except OperationalError as error:
+        if "database is locked" not in str(error):
+            raise
+        raise ValidationError("다른 예약을 처리하는 중입니다. 잠시 후 다시 시도해주세요.")
@@ -0,0 +1,122 @@
+"""
+예약 날짜/시간 정규화
+
+방/체험 예약 serializer 가 같이 씀.
+입력은 ISO-8601 이면 아무 모양이나 받음 (2030-05-11, 2030-05-10T15:00:00.000Z, 2030-05-11T09:00+09:00 ...).
+필드마다 문자열을 한번만 파싱하고 방/체험의 timezone (Room.timezone, Experience.timezone) 으로 바꿈.
+
+- 체크인/체크아웃 (DateField): 시간이 있으면 그 장소 시간대의 날짜, 날짜만 있으면 그대로
+- 체험 시작/끝 (DateTimeField): 시간대가 없으면 그 장소 시간대의 시간으로 봄
+
+잘못된 입력은 필드 에러로 모아서 400 으로 돌려줌.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    return ZoneInfo(name)
+
+
+def validate_timezone(value):
+    try:
+        get_zone(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(f"{value} is not a valid timezone")
+
+
+def parse_moment(value):
+    """ISO-8601 문자열 -> date 또는 datetime, 잘못된 값이면 None"""
+    if isinstance(value, (date, datetime)):
+        return value
+    if not isinstance(value, str):
+        return None
+    try:
+        if len(value) == 10:
+            return parse_date(value)
+        return parse_datetime(value)
+    except ValueError:
+        # 모양은 맞는데 없는 날짜 (2030-02-30 등)
+        return None
+
+
+def to_local_date(moment, zone):
+    if isinstance(moment, datetime):
+        if timezone.is_aware(moment):
+            moment = moment.astimezone(zone)
+        return moment.date()
+    return moment
+
+
+def to_aware(moment, zone):
+    if not isinstance(moment, datetime):
+        moment = datetime.combine(moment, datetime.min.time())
+    if timezone.is_naive(moment):
+        return moment.replace(tzinfo=zone)
+    return moment
+
+
+def local_today(zone):
+    return timezone.now().astimezone(zone).date()
+
+
+class LocalDateField(serializers.Field):
+    """ISO-8601 날짜/시간 -> 장소 시간대의 날짜"""
+
+    default_error_messages = {
+        "invalid": "ISO-8601 날짜나 시간이어야 합니다.",
+    }
+
+    def to_internal_value(self, data):
+        moment = parse_moment(data)
+        if moment is None:
+            self.fail("invalid")
+        return to_local_date(moment, self.parent.get_zone())
+
+    def to_representation(self, value):
+        return value.isoformat()
+
+
+class LocalDateTimeField(LocalDateField):
+    """ISO-8601 날짜/시간 -> 시간대가 있는 datetime (없으면 장소 시간대)"""
+
+    def to_internal_value(self, data):
+        moment = parse_moment(data)
+        if moment is None:
+            self.fail("invalid")
+        return to_aware(moment, self.parent.get_zone())
+
+
+class BookingDatesMixin:
+    """
+    context 의 room / experience 시간대로 날짜를 바꾸고
+    오늘 이후인지는 validate_future 로 필드들을 한번에 확인함 (오늘 날짜도 한번만 구함)
+    """
+
+    def get_zone(self):
+        place = self.context.get("room") or self.context.get("experience")
+        return get_zone(place.timezone if place else settings.TIME_ZONE)
+
+    def validate_future(self, data, messages):
+        """messages: {필드: 오늘 이전일때 에러 메세지}"""
+        zone = self.get_zone()
+        today = local_today(zone)
+        errors = {}
+        for field, message in messages.items():
+            value = data.get(field)
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                value = value.astimezone(zone).date()
+            if value <= today:
+                errors[field] = [message]
+        if errors:
+            raise serializers.ValidationError(errors)
@@ -0,0 +1,80 @@
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from bookings.availability import free_nights, is_room_available
+from bookings.models import Booking
+from rooms.models import Room
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "방 하나의 예약 수에 따른 is_room_available / free_nights 응답시간을 측정합니다. (데이터는 롤백됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10,100,1000,10000",
+            help="방 하나에 넣을 예약 수 (콤마 구분)",
+        )
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        self.stdout.write(f"{'bookings':>10} {'is_free (ms)':>14} {'free_nights (ms)':>18}")
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    room = self.create_room(size)
+                    middle = date(2000, 1, 1) + timedelta(days=size)
+                    is_free = self.measure(
+                        options["repeat"],
+                        lambda: is_room_available(room, middle, middle + timedelta(days=3)),
+                    )
+                    nights = self.measure(
+                        options["repeat"],
+                        lambda: free_nights(room, middle.year, middle.month),
+                    )
+                    self.stdout.write(f"{size:>10} {is_free:>14.3f} {nights:>18.3f}")
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def create_room(self, size):
+        user = User.objects.create(username="bench-availability")
+        room = Room.objects.create(
+            name="bench",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="bench",
+            address="bench",
+            owner=user,
+        )
+        # 1박짜리 예약을 하루 걸러서 넣음
+        start = date(2000, 1, 1)
+        Booking.objects.bulk_create(
+            [
+                Booking(
+                    kind=Booking.BookingKindChoices.ROOM,
+                    user=user,
+                    room=room,
+                    check_in=start + timedelta(days=i * 2),
+                    check_out=start + timedelta(days=i * 2 + 1),
+                    guests=1,
+                )
+                for i in range(size)
+            ],
+            batch_size=1000,
+        )
+        return room
+
+    def measure(self, repeat, func):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat * 1000
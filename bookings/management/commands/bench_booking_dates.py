@@ -0,0 +1,68 @@
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from django.core.management.base import BaseCommand
+from bookings.dates import get_zone, parse_moment, to_local_date
+from bookings.serializers import CreateRoomBookingSerializer
+from rooms.models import Room
+
+KST = timezone(timedelta(hours=9))
+
+
+def strptime_date(value):
+    """예전 RoomBookings.post 방식 (UTC Z 문자열만, KST 고정)"""
+    moment = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+    return moment.replace(tzinfo=timezone.utc).astimezone(KST).date()
+
+
+class Command(BaseCommand):
+    help = "예약 날짜 입력 (ISO-8601) 을 몰아서 받을때 파싱/변환 시간을 측정합니다. (DB 안 씀)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--burst", type=int, default=100000, help="한번에 들어오는 입력 수")
+
+    def handle(self, *args, **options):
+        burst = options["burst"]
+        rng = random.Random(0)
+        start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        moments = [start + timedelta(minutes=rng.randrange(525600)) for _ in range(burst)]
+        utc = [moment.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z" for moment in moments]
+        mixed = [
+            [
+                value,
+                moment.astimezone(KST).isoformat(),
+                moment.date().isoformat(),
+                "tomorrow",
+            ][i % 4]
+            for i, (value, moment) in enumerate(zip(utc, moments))
+        ]
+        zone = get_zone("Asia/Seoul")
+        # 필드만 쓰니까 저장 안 한 방으로 충분함
+        field = CreateRoomBookingSerializer(context={"room": Room()}).fields["check_in"]
+
+        def new_path(values):
+            for value in values:
+                moment = parse_moment(value)
+                if moment is not None:
+                    to_local_date(moment, zone)
+
+        def field_path(values):
+            for value in values:
+                try:
+                    field.run_validation(value)
+                except Exception:
+                    pass
+
+        self.stdout.write(f"{'path':<28} {'total (ms)':>11} {'per input (us)':>15}")
+        for name, func, values in (
+            ("strptime + KST (old, Z)", lambda values: [strptime_date(v) for v in values], utc),
+            ("parse_moment (Z)", new_path, utc),
+            ("parse_moment (mixed)", new_path, mixed),
+            ("LocalDateField (mixed)", field_path, mixed),
+        ):
+            started = time.perf_counter()
+            func(values)
+            seconds = time.perf_counter() - started
+            self.stdout.write(
+                f"{name:<28} {seconds * 1000:>11.1f} {seconds / burst * 1e6:>15.2f}"
+            )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from bookings.models import RoomOccupancy
+
+
+class Command(BaseCommand):
+    help = "방 예약 현황 bitmap 을 지웁니다. 다음 조회때 Booking 테이블에서 다시 만들어짐. (bulk import 후에 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--room", type=int, help="이 방만 다시 만듬")
+
+    def handle(self, *args, **options):
+        occupancies = RoomOccupancy.objects.all()
+        if options["room"]:
+            occupancies = occupancies.filter(room_id=options["room"])
+        deleted, _ = occupancies.delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} months cleared"))
@@ -0,0 +1,68 @@
+# Generated by Django 4.1 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+# 같은 방의 [check_in, check_out) 구간이 겹치는 예약을 DB 에서 막음 (PostgreSQL 전용)
+EXCLUSION_CONSTRAINT = 'bookings_booking_room_no_overlap'
+
+
+def add_room_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # 이미 겹치는 예약이 있으면 ALTER TABLE 이 알아보기 힘든 에러로 실패하니까 먼저 확인
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT a.id, b.id, a.room_id
+            FROM bookings_booking a
+            JOIN bookings_booking b
+              ON a.room_id = b.room_id
+             AND a.id < b.id
+             AND a.check_in < b.check_out
+             AND b.check_in < a.check_out
+            WHERE a.kind = 'room' AND b.kind = 'room'
+            ORDER BY a.room_id, a.id
+            LIMIT 20
+            """
+        )
+        overlaps = cursor.fetchall()
+    if overlaps:
+        pairs = ', '.join(f'room {room}: #{a} / #{b}' for a, b, room in overlaps)
+        raise RuntimeError(
+            f'Overlapping room bookings must be resolved before {EXCLUSION_CONSTRAINT} '
+            f'can be added ({pairs})'
+        )
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(
+        f'''
+        ALTER TABLE bookings_booking ADD CONSTRAINT {EXCLUSION_CONSTRAINT}
+        EXCLUDE USING gist (
+            room_id WITH =,
+            daterange(check_in, check_out, '[)') WITH &&
+        )
+        WHERE (kind = 'room' AND check_in IS NOT NULL AND check_out IS NOT NULL)
+        '''
+    )
+
+
+def remove_room_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'ALTER TABLE bookings_booking DROP CONSTRAINT IF EXISTS {EXCLUSION_CONSTRAINT}'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_rename_experience_time_booking_experience_time_start_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', 'check_in', 'check_out'], name='bookings_bo_room_id_9b7de4_idx'),
+        ),
+        migrations.RunPython(add_room_exclusion_constraint, remove_room_exclusion_constraint),
+    ]
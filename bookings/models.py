@@ -60,3 +60,38 @@ class Booking(CommonModel):
 
     def __str__(self):
         return f"{self.kind.title()} booking for: {self.user}"
+
+    class Meta:
+        indexes = [
+            # 방 예약 겹침 검사 (bookings.availability)
+            models.Index(fields=["room", "check_in", "check_out"]),
+        ]
+
+
+class RoomOccupancy(CommonModel):
+    """
+    방의 한달치 예약 현황 bitmap
+
+    nights 의 n번째 비트가 1이면 그 달 (n+1)일 밤이 예약됨.
+    예약이 생기거나 지워질때 bookings.signals 에서 해당 달만 갱신함.
+    """
+
+    room = models.ForeignKey(
+        "rooms.Room",
+        on_delete=models.CASCADE,
+        related_name="occupancies",
+    )
+    month = models.DateField()  # 그 달 1일
+    nights = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.room} / {self.month:%Y-%m}"
+
+    class Meta:
+        verbose_name_plural = "Room occupancies"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "month"],
+                name="unique_room_occupancy_month",
+            ),
+        ]
@@ -0,0 +1,99 @@
+import calendar
+from datetime import date, timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .availability import overlapping, room_bookings
+from .models import Booking, RoomOccupancy
+
+
+def month_masks(check_in, check_out):
+    """[check_in, check_out) 를 (그 달 1일, 그 달 bitmap) 으로 나눔"""
+    masks = {}
+    night = check_in
+    while night < check_out:
+        month = night.replace(day=1)
+        masks[month] = masks.get(month, 0) | (1 << (night.day - 1))
+        night += timedelta(days=1)
+    return masks
+
+
+def is_stored(month):
+    """
+    RoomOccupancy 로 저장해두는 달인지 (이번달 ~ CALENDAR_MONTHS_AHEAD 달 뒤)
+
+    아무 달이나 ?month= 로 물어볼 수 있으니까 그때마다 row 가 쌓이지 않게
+    범위 밖의 달은 저장하지 않고 매번 Booking 테이블에서 계산함.
+    """
+    first = timezone.localdate().replace(day=1)
+    months = (month.year - first.year) * 12 + month.month - first.month
+    return 0 <= months <= settings.CALENDAR_MONTHS_AHEAD
+
+
+def count_nights(room_id, month):
+    """Booking 테이블에서 한달치 bitmap 을 계산함"""
+    end = month + timedelta(days=calendar.monthrange(month.year, month.month)[1])
+    nights = 0
+    for check_in, check_out in (
+        room_bookings(room_id)
+        .filter(overlapping(month, end))
+        .values_list("check_in", "check_out")
+    ):
+        nights |= month_masks(max(check_in, month), min(check_out, end)).get(month, 0)
+    return nights
+
+
+def build_month(room_id, month):
+    """Booking 테이블에서 한달치 bitmap 을 다시 만듬"""
+    nights = count_nights(room_id, month)
+    try:
+        with transaction.atomic():
+            occupancy, _ = RoomOccupancy.objects.update_or_create(
+                room_id=room_id,
+                month=month,
+                defaults={"nights": nights},
+            )
+    except IntegrityError:
+        # 동시에 같은 달을 만든 경우
+        occupancy = RoomOccupancy.objects.get(room_id=room_id, month=month)
+    return occupancy
+
+
+def get_month(room_id, year, month):
+    """한달치 bitmap (저장하는 달인데 아직 없으면 만듬)"""
+    month = date(year, month, 1)
+    if not is_stored(month):
+        return RoomOccupancy(room_id=room_id, month=month, nights=count_nights(room_id, month))
+    occupancy = RoomOccupancy.objects.filter(room_id=room_id, month=month).first()
+    if occupancy is None:
+        occupancy = build_month(room_id, month)
+    return occupancy
+
+
+def mark(room_id, check_in, check_out):
+    for month, mask in month_masks(check_in, check_out).items():
+        updated = RoomOccupancy.objects.filter(room_id=room_id, month=month).update(
+            nights=F("nights").bitor(mask)
+        )
+        if not updated and is_stored(month):
+            build_month(room_id, month)
+
+
+def unmark(room_id, check_in, check_out):
+    # 예약끼리 겹치지 않으니까 이 예약의 비트만 꺼도 됨
+    for month, mask in month_masks(check_in, check_out).items():
+        updated = RoomOccupancy.objects.filter(room_id=room_id, month=month).update(
+            nights=F("nights").bitand(~mask & 0x7FFFFFFF)
+        )
+        if not updated and is_stored(month):
+            build_month(room_id, month)
+
+
+def is_tracked(booking):
+    return (
+        booking.kind == Booking.BookingKindChoices.ROOM
+        and booking.room_id is not None
+        and booking.check_in is not None
+        and booking.check_out is not None
+    )
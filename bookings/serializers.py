@@ -1,12 +1,14 @@
-from django.utils import timezone
+from functools import partial
 from rest_framework import serializers
 from .models import Booking
+from .availability import book_room, is_room_available
+from .dates import BookingDatesMixin, LocalDateField, LocalDateTimeField
 
 
-class CreateRoomBookingSerializer(serializers.ModelSerializer):
+class CreateRoomBookingSerializer(BookingDatesMixin, serializers.ModelSerializer):
 
-    check_in = serializers.DateField()
-    check_out = serializers.DateField()
+    check_in = LocalDateField()
+    check_out = LocalDateField()
 
     class Meta:
         model = Booking
@@ -16,38 +18,36 @@ class CreateRoomBookingSerializer(serializers.ModelSerializer):
             "guests",
         )
 
-    def validate_check_in(self, value):
-        now = timezone.localtime(timezone.now()).date()
-        if value > now:
-            return value
-        else:
-            raise serializers.ValidationError("체크인은 오늘보다 하루 뒤여야 합니다!")
-
-    def validate_check_out(self, value):
-        now = timezone.localtime(timezone.now()).date()
-        if value > now:
-            return value
-        else:
-            raise serializers.ValidationError("체크아웃은 오늘보다 하루 뒤여야 합니다!")
-
     def validate(self, data):
+        self.validate_future(
+            data,
+            {
+                "check_in": "체크인은 오늘보다 하루 뒤여야 합니다!",
+                "check_out": "체크아웃은 오늘보다 하루 뒤여야 합니다!",
+            },
+        )
         room = self.context.get("room")
         if data["check_out"] <= data["check_in"]:
             raise serializers.ValidationError("체크인이 체크아웃보다 먼저와야합니다!")
 
-        if Booking.objects.filter(
-            room=room,
-            check_in__lte=data["check_out"],
-            check_out__gte=data["check_in"],
-        ).exists():
+        if not is_room_available(room, data["check_in"], data["check_out"]):
             raise serializers.ValidationError("이미 예약된 방입니다.")
 
         return data
 
+    def create(self, validated_data):
+        # validate 와 저장 사이에 다른 예약이 끼어들수 있으니 방을 잠그고 한번 더 확인
+        return book_room(
+            partial(super().create, validated_data),
+            validated_data["room"],
+            validated_data["check_in"],
+            validated_data["check_out"],
+        )
+
 
-class CreateExperienceBookingSerializer(serializers.ModelSerializer):
-    experience_time_start = serializers.DateTimeField()
-    experience_time_end = serializers.DateTimeField()
+class CreateExperienceBookingSerializer(BookingDatesMixin, serializers.ModelSerializer):
+    experience_time_start = LocalDateTimeField()
+    experience_time_end = LocalDateTimeField()
 
     class Meta:
         model = Booking
@@ -57,23 +57,14 @@ class CreateExperienceBookingSerializer(serializers.ModelSerializer):
             "guests",
         )
 
-    def validate_experience_time_start(self, data):
-        start = data.date()
-        now = timezone.localtime(timezone.now()).date()
-        if start > now:
-            return data
-        else:
-            raise serializers.ValidationError("예약은 오늘보다 하루 뒤여야 합니다!")
-
-    def validate_experience_time_end(self, data):
-        end = data.date()
-        now = timezone.localtime(timezone.now()).date()
-        if end > now:
-            return data
-        else:
-            raise serializers.ValidationError("예약은 오늘보다 하루 뒤여야 합니다!")
-
     def validate(self, data):
+        self.validate_future(
+            data,
+            {
+                "experience_time_start": "예약은 오늘보다 하루 뒤여야 합니다!",
+                "experience_time_end": "예약은 오늘보다 하루 뒤여야 합니다!",
+            },
+        )
         if data["experience_time_end"] <= data["experience_time_start"]:
             raise serializers.ValidationError("예약 종료 시간이 뒤로 가야합니다!")
 
@@ -86,9 +77,9 @@ class CreateExperienceBookingSerializer(serializers.ModelSerializer):
         return data
 
 
-class UpdateExperienceBookingSerializer(serializers.ModelSerializer):
-    experience_time_start = serializers.DateTimeField()
-    experience_time_end = serializers.DateTimeField()
+class UpdateExperienceBookingSerializer(BookingDatesMixin, serializers.ModelSerializer):
+    experience_time_start = LocalDateTimeField()
+    experience_time_end = LocalDateTimeField()
 
     class Meta:
         model = Booking
@@ -98,23 +89,14 @@ class UpdateExperienceBookingSerializer(serializers.ModelSerializer):
             "guests",
         )
 
-    def validate_experience_time_start(self, data):
-        start = data.date()
-        now = timezone.localtime(timezone.now()).date()
-        if start > now:
-            return data
-        else:
-            raise serializers.ValidationError("예약은 오늘보다 하루 뒤여야 합니다!")
-
-    def validate_experience_time_end(self, data):
-        end = data.date()
-        now = timezone.localtime(timezone.now()).date()
-        if end > now:
-            return data
-        else:
-            raise serializers.ValidationError("예약은 오늘보다 하루 뒤여야 합니다!")
-
     def validate(self, data):
+        self.validate_future(
+            data,
+            {
+                "experience_time_start": "예약은 오늘보다 하루 뒤여야 합니다!",
+                "experience_time_end": "예약은 오늘보다 하루 뒤여야 합니다!",
+            },
+        )
         if "experience_time_end" in data and "experience_time_start" in data:
             if data["experience_time_end"] <= data["experience_time_start"]:
                 raise serializers.ValidationError("예약 종료 시간이 뒤로 가야합니다!")
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from . import occupancy
+from .models import Booking
+
+
+@receiver(pre_save, sender=Booking)
+def remember_previous_stay(sender, instance, **kwargs):
+    instance._previous_stay = None
+    if instance.pk:
+        instance._previous_stay = Booking.objects.filter(pk=instance.pk).first()
+
+
+@receiver(post_save, sender=Booking)
+def update_occupancy_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_stay", None)
+    if previous is not None and occupancy.is_tracked(previous):
+        if (previous.room_id, previous.check_in, previous.check_out) == (
+            instance.room_id,
+            instance.check_in,
+            instance.check_out,
+        ) and previous.kind == instance.kind:
+            return
+        occupancy.unmark(previous.room_id, previous.check_in, previous.check_out)
+    if occupancy.is_tracked(instance):
+        occupancy.mark(instance.room_id, instance.check_in, instance.check_out)
+
+
+@receiver(post_delete, sender=Booking)
+def update_occupancy_on_delete(sender, instance, **kwargs):
+    if occupancy.is_tracked(instance):
+        occupancy.unmark(instance.room_id, instance.check_in, instance.check_out)
@@ -1,3 +1,290 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timedelta, timezone
+from django.db import OperationalError
+from django.utils.timezone import localdate
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+from experiences.models import Experience
+from rooms.models import Room
+from users.models import User
+from .availability import book_room, free_nights, is_room_available
+from .dates import parse_moment
+from .models import Booking, RoomOccupancy
 
-# Create your tests here.
+
+class TestRoomAvailability(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="guest")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=self.user,
+        )
+        self.booking = Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=date(2030, 5, 10),
+            check_out=date(2030, 5, 13),
+            guests=1,
+        )
+
+    def test_half_open_interval(self):
+        self.assertFalse(is_room_available(self.room, date(2030, 5, 12), date(2030, 5, 14)))
+        self.assertFalse(is_room_available(self.room, date(2030, 5, 8), date(2030, 5, 11)))
+        # 체크아웃 하는 날 체크인 가능
+        self.assertTrue(is_room_available(self.room, date(2030, 5, 13), date(2030, 5, 15)))
+        self.assertTrue(is_room_available(self.room, date(2030, 5, 8), date(2030, 5, 10)))
+
+    def test_overlapping_rows(self):
+        # exclusion constraint 가 없는 DB (SQLite) 에 이미 겹쳐 들어간 예약
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=date(2030, 5, 1),
+            check_out=date(2030, 5, 20),
+            guests=1,
+        )
+        self.assertFalse(is_room_available(self.room, date(2030, 5, 14), date(2030, 5, 15)))
+
+    def test_free_nights_with_overlapping_rows(self):
+        # 4월에 시작해서 5월까지 이어지는 예약 두개가 겹쳐 있음 (SQLite 에는 막는 제약이 없음)
+        for check_in, check_out in (
+            (date(2030, 4, 20), date(2030, 5, 15)),
+            (date(2030, 4, 28), date(2030, 5, 3)),
+        ):
+            Booking.objects.create(
+                kind=Booking.BookingKindChoices.ROOM,
+                user=self.user,
+                room=self.room,
+                check_in=check_in,
+                check_out=check_out,
+                guests=1,
+            )
+        nights = free_nights(self.room, 2030, 5)
+        self.assertEqual(nights[0], date(2030, 5, 15))
+        self.assertEqual(len(nights), 31 - 14)
+
+    def test_locked_database(self):
+        def create():
+            raise OperationalError("database is locked")
+
+        with self.assertRaises(ValidationError):
+            book_room(create, self.room, date(2030, 6, 1), date(2030, 6, 2))
+
+    def test_free_nights(self):
+        nights = free_nights(self.room, 2030, 5)
+        self.assertEqual(len(nights), 31 - 3)
+        self.assertNotIn(date(2030, 5, 12), nights)
+        self.assertIn(date(2030, 5, 13), nights)
+
+    def test_check_endpoint(self):
+        url = f"/api/v1/rooms/{self.room.pk}/bookings/check"
+        response = self.client.get(url, {"check_in": "2030-05-11", "check_out": "2030-05-12"})
+        self.assertEqual(response.json(), {"ok": False})
+        response = self.client.get(url, {"check_in": "2030-05-13", "check_out": "2030-05-14"})
+        self.assertEqual(response.json(), {"ok": True})
+        response = self.client.get(url, {"check_in": "tomorrow"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_rejects_overlap(self):
+        self.client.force_login(self.user)
+        url = f"/api/v1/rooms/{self.room.pk}/bookings"
+        response = self.client.post(
+            url,
+            {"check_in": "2030-05-12", "check_out": "2030-05-15", "guests": 1},
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            url,
+            {"check_in": "2030-05-13", "check_out": "2030-05-15", "guests": 1},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_available_rooms(self):
+        free_room = Room.objects.create(
+            name="Free",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=self.user,
+        )
+        url = "/api/v1/rooms/available"
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"check_in": "2030-05-11", "check_out": "2030-05-12"})
+        self.assertEqual([room["pk"] for room in response.json()], [free_room.pk])
+
+        response = self.client.get(url, {"check_in": "2030-05-13", "check_out": "2030-05-14"})
+        self.assertEqual(len(response.json()), 2)
+
+        response = self.client.get(
+            url,
+            {"check_in": "2030-05-13", "check_out": "2030-05-14", "city": "부산"},
+        )
+        self.assertEqual(response.json(), [])
+
+    def test_calendar(self):
+        url = f"/api/v1/rooms/{self.room.pk}/calendar"
+        response = self.client.get(url, {"month": "2030-05"})
+        data = response.json()
+        self.assertEqual(data["days"], 31)
+        # 10, 11, 12일 밤
+        self.assertEqual(data["nights"], 0b111 << 9)
+
+        etag = response["ETag"]
+        response = self.client.get(url, {"month": "2030-05"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # 달을 넘어가는 예약
+        booking = Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=date(2030, 5, 30),
+            check_out=date(2030, 6, 2),
+            guests=1,
+        )
+        response = self.client.get(url, {"month": "2030-05"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["nights"], (0b111 << 9) | (0b11 << 29))
+        response = self.client.get(url, {"month": "2030-06"})
+        self.assertEqual(response.json()["nights"], 0b1)
+
+        booking.delete()
+        self.booking.delete()
+        response = self.client.get(url, {"month": "2030-05"})
+        self.assertEqual(response.json()["nights"], 0)
+        response = self.client.get(url, {"month": "2030-13"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_calendar_stored_months(self):
+        url = f"/api/v1/rooms/{self.room.pk}/calendar"
+        this_month = localdate().replace(day=1)
+        response = self.client.get(url, {"month": f"{this_month:%Y-%m}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(RoomOccupancy.objects.filter(room=self.room, month=this_month).exists())
+
+        # 범위 밖의 달은 계산만 하고 저장하지 않음
+        for month in ("1999-01", "9998-12", "2030-05"):
+            response = self.client.get(url, {"month": month})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["nights"], 0b111 << 9)
+        self.assertEqual(RoomOccupancy.objects.filter(room=self.room).count(), 1)
+        response = self.client.get(url, {"month": "9999-12"})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestBookingDates(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="guest")
+        self.client.force_login(self.user)
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=self.user,
+            timezone="America/Los_Angeles",
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}/bookings"
+
+    def book(self, check_in, check_out):
+        return self.client.post(
+            self.url,
+            {"check_in": check_in, "check_out": check_out, "guests": 1},
+        )
+
+    def test_parse_moment(self):
+        self.assertEqual(parse_moment("2030-05-11"), date(2030, 5, 11))
+        self.assertEqual(
+            parse_moment("2030-05-10T15:00:00.000Z"),
+            datetime(2030, 5, 10, 15, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            parse_moment("2030-05-11T09:00+09:00").utcoffset(), timedelta(hours=9)
+        )
+        for value in ("2030-02-30", "tomorrow", "", None, 20300511):
+            self.assertIsNone(parse_moment(value), value)
+
+    def test_converts_to_room_timezone(self):
+        # UTC 5월 11일 03시 = LA 5월 10일 저녁
+        response = self.book("2030-05-11T03:00:00.000Z", "2030-05-12T10:00:00+09:00")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.json()["check_in"], response.json()["check_out"]),
+            ("2030-05-10", "2030-05-11"),
+        )
+        response = self.book("2030-05-11", "2030-05-12")
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_input_is_400(self):
+        response = self.book("tomorrow", "2030-02-30")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"check_in", "check_out"})
+        response = self.client.post(self.url, {"guests": 1})
+        self.assertEqual(response.status_code, 400)
+        response = self.book("2000-01-01", "2000-01-02")
+        self.assertEqual(set(response.json()), {"check_in", "check_out"})
+
+    def test_experience_naive_time_uses_experience_timezone(self):
+        experience = Experience.objects.create(
+            name="Tour",
+            host=self.user,
+            price=1,
+            address="addr",
+            start=time(9),
+            end=time(12),
+            description="desc",
+            timezone="America/New_York",
+        )
+        response = self.client.post(
+            f"/api/v1/experiences/{experience.pk}/bookings",
+            {
+                "experience_time_start": "2030-05-11T09:00",
+                "experience_time_end": "2030-05-11T12:00",
+                "guests": 1,
+            },
+        )
+        # 뉴욕 09시 = 서울 (settings.TIME_ZONE) 22시
+        self.assertEqual(
+            response.json()["experience_time_start"], "2030-05-11T22:00:00+09:00"
+        )
+
+    def test_experience_upcoming_bookings(self):
+        experience = Experience.objects.create(
+            name="Tour",
+            host=self.user,
+            price=1,
+            address="addr",
+            start=time(9),
+            end=time(12),
+            description="desc",
+            timezone="Pacific/Kiritimati",
+        )
+        now = datetime.now(timezone.utc)
+        # 이미 시작한 예약, 곧 (오늘 안에) 시작하는 예약, 내일 예약
+        for start in (
+            now - timedelta(minutes=30),
+            now + timedelta(minutes=30),
+            now + timedelta(days=1),
+        ):
+            Booking.objects.create(
+                kind=Booking.BookingKindChoices.EXPERIENCE,
+                user=self.user,
+                experience=experience,
+                experience_time_start=start,
+                experience_time_end=start + timedelta(hours=1),
+                guests=1,
+            )
+        response = self.client.get(f"/api/v1/experiences/{experience.pk}/bookings")
+        starts = [booking["experience_time_start"] for booking in response.json()]
+        self.assertEqual(len(starts), 2)
+        self.assertEqual(starts, sorted(starts))
@@ -1,11 +1,11 @@
-from rest_framework.decorators import api_view
 from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.status import HTTP_204_NO_CONTENT
-from rest_framework.views import APIView
-from rest_framework.viewsets import ModelViewSet
 from .models import Category
 from .serializers import CategorySerializer
+from common.cache import cache_response
+from common.mixins import ConditionalGetMixin
+from common.aio import AsyncAPIView, aget_object, alist
 
 # 개사기임 밑에 있는걸 다 압축하지만 커스터마이징할때는 단점이 있음. 직관성도 떨어짐
 # class CategoryViewSet(ModelViewSet):
@@ -13,24 +13,28 @@ from .serializers import CategorySerializer
 #     queryset = Category.objects.all()
 
 
-class Categories(APIView):
+class Categories(ConditionalGetMixin, AsyncAPIView):
 
-    def get(self, request):
+    def get_queryset(self, request):
         kind = request.query_params.get("kind")
         if kind == "room":
-            all_categories = Category.objects.filter(
-                kind=Category.CategoryKindChoices.ROOMS
-            )
+            return Category.objects.filter(kind=Category.CategoryKindChoices.ROOMS)
         else:
-            all_categories = Category.objects.filter(
+            return Category.objects.filter(
                 kind=Category.CategoryKindChoices.EXPERIENCES
             )
+
+    def get_validator_queryset(self, request):
+        return self.get_queryset(request)
+
+    @cache_response("categories")
+    async def get(self, request):
+        all_categories = await alist(self.get_queryset(request))
         serializer = CategorySerializer(all_categories, many=True)
         return Response(serializer.data)
 
     def post(self, request):
         serializer = CategorySerializer(data=request.data)
-        print(serializer.is_valid())
         if serializer.is_valid():
             new_category = serializer.save()
             return Response(CategorySerializer(new_category).data)
@@ -54,7 +58,8 @@ class Categories(APIView):
 #             return Response(serializer.errors)
 
 
-class CategoryDetail(APIView):
+class CategoryDetail(ConditionalGetMixin, AsyncAPIView):
+    validator_model = Category
 
     def get_object(self, pk):
         try:
@@ -63,9 +68,9 @@ class CategoryDetail(APIView):
             raise NotFound
         return category
 
-    def get(self, request, pk):
-        serializer = CategorySerializer(self.get_object(pk))
-        return Response(serializer.data)
+    async def get(self, request, pk):
+        category = await aget_object(Category.objects.all(), pk=pk)
+        return Response(CategorySerializer(category).data)
 
     def put(self, request, pk):
         serializer = CategorySerializer(
@@ -0,0 +1,83 @@
+"""
+async 조회 view
+
+uvicorn (config.asgi) 에서 동기 APIView 는 요청마다 view 전체를 스레드로 넘겨서 돌리는데
+AsyncAPIView 의 async def get 은 이벤트 루프에서 돌고 DB 는 async ORM (aget, async for) 으로 읽음.
+
+- 인증 / 권한 / ConditionalGetMixin 의 ETag 계산 / preload() 는 동기 코드라서 스레드로 한번에 넘김
+- async 가 아닌 handler (post, put, delete ...) 는 APIView.dispatch 를 통째로 스레드에서 돌림 (기존과 같음)
+- serializer 는 이벤트 루프에서 돌아서 DB 를 보면 안됨.
+  관계는 미리 읽어두고 (gather + set_prefetched, common.fast.aserialize)
+  요청마다 한번 읽는 값 (위시리스트, 환율표) 은 preload() 에서 읽어둠
+
+Django 4.1 async ORM 은 쿼리를 요청마다 정해진 스레드 하나에서 돌려서
+gather 로 같이 기다려도 쿼리끼리 겹쳐서 실행되지는 않음. 기다리는 동안 이벤트 루프가 다른 요청을 받는게 이득.
+"""
+
+import asyncio
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound
+from rest_framework.views import APIView
+
+
+async def aget_object(queryset, **lookup):
+    try:
+        return await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        raise NotFound
+
+
+async def alist(queryset):
+    return [obj async for obj in queryset]
+
+
+def set_prefetched(instance, **related):
+    """
+    따로 읽은 관계 목록을 prefetch_related 로 읽은 것처럼 넣어둠 (room.photos.all() 이 쿼리를 안 함)
+
+    이름은 prefetch 캐시 이름 (정방향 M2M 은 필드 이름, 역방향 FK 는 related_name)
+    """
+    cache = getattr(instance, "_prefetched_objects_cache", None) or {}
+    for name, objects in related.items():
+        queryset = getattr(instance, name).get_queryset()
+        queryset._result_cache = list(objects)
+        queryset._prefetch_done = True
+        cache[name] = queryset
+    instance._prefetched_objects_cache = cache
+
+
+class AsyncAPIView(APIView):
+    """async def 로 만든 handler 는 이벤트 루프에서, 나머지는 기존처럼 스레드에서 돌리는 APIView"""
+
+    view_is_async = True
+
+    def preload(self, request, *args, **kwargs):
+        """인증이 끝난 다음 같은 스레드에서 부름 (serializer 가 쓸 요청 단위 값을 미리 읽을때)"""
+
+    def get_handler(self, method):
+        method = method.lower()
+        if method in self.http_method_names:
+            return getattr(self, method, self.http_method_not_allowed)
+        return self.http_method_not_allowed
+
+    def prepare(self, request, *args, **kwargs):
+        self.initial(request, *args, **kwargs)
+        self.preload(request, *args, **kwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = self.get_handler(request.method)
+        if not asyncio.iscoroutinefunction(handler):
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.prepare)(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
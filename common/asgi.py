@@ -0,0 +1,78 @@
+"""
+config.asgi 에서 쓰는 ASGI handler
+
+Django 4.1 ASGIHandler 는 StreamingHttpResponse (방 export 처럼 queryset 을 읽으면서 내보내는 응답) 를
+이벤트 루프에서 그대로 돌려서 queryset.iterator() 가 SynchronousOnlyOperation 으로 죽음.
+여기서는 조각을 하나씩 요청 스레드 (thread_sensitive) 에서 꺼내서 보냄. 메모리는 기존처럼 조각 하나 크기.
+
+Django ASGIHandler 는 lifespan 도 받지 않아서 서버 루프에 묶인 자원 (소셜 로그인 httpx 클라이언트 등) 을
+열고 닫을 곳이 없음. settings.ASGI_LIFESPAN 의 coroutine 함수들을 startup / shutdown 때 부름.
+"""
+
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler as BaseASGIHandler
+from django.utils.module_loading import import_string
+
+# 스트림이 끝났다는 표시
+DONE = object()
+
+
+class ASGIHandler(BaseASGIHandler):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        return await super().__call__(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            event = message["type"].split(".")[-1]
+            try:
+                for path in settings.ASGI_LIFESPAN.get(event, ()):
+                    await import_string(path)()
+            except Exception as error:
+                await send({"type": f"lifespan.{event}.failed", "message": str(error)})
+            else:
+                await send({"type": f"lifespan.{event}.complete"})
+            if event == "shutdown":
+                return
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        response_headers = []
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode("ascii")
+            if isinstance(value, str):
+                value = value.encode("latin1")
+            response_headers.append((bytes(header), bytes(value)))
+        for c in response.cookies.values():
+            response_headers.append(
+                (b"Set-Cookie", c.output(header="").encode("ascii").strip())
+            )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": response_headers,
+            }
+        )
+        parts = iter(response)
+        read = sync_to_async(next, thread_sensitive=True)
+        while True:
+            part = await read(parts, DONE)
+            if part is DONE:
+                break
+            for chunk, _ in self.chunk_bytes(part):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    return ASGIHandler()
@@ -0,0 +1,177 @@
+"""
+공개 조회 API 응답 캐시
+
+serializer 를 거친 payload 를 (그룹, 주소+쿼리스트링) 별로 저장함.
+그룹마다 버전 키가 있어서 관련 모델이 바뀌면 (signals) 버전만 바꿔서 그 그룹 캐시를 한번에 버림.
+기본은 local-memory 캐시, REDIS_URL 이 있으면 Redis 를 씀 (config/settings.py CACHES).
+local-memory 캐시인데 워커가 여럿이면 signal 이 자기 워커 캐시만 버려서 응답 캐시를 끔
+(settings.RESPONSE_CACHE_ENABLED).
+"""
+
+import asyncio
+import hashlib
+import uuid
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework.response import Response
+from currencies import rates
+from . import metrics
+
+# 모델이 바뀌면 버려야 하는 캐시 그룹
+INVALIDATES = {
+    "rooms.Room": ("rooms",),
+    "rooms.Amenity": ("amenities", "rooms"),
+    "categories.Category": ("categories", "rooms"),
+    "experiences.Experience": ("perks",),
+    "experiences.Perk": ("perks",),
+    "medias.Photo": ("rooms",),
+    "reviews.Review": ("rooms",),
+    "users.User": ("users", "rooms"),
+}
+
+# local_price 처럼 환율로 바꾼 값이 들어가는 그룹, 키에 보는 사람 통화와 환율표 버전을 넣음 (currencies.rates)
+# 워커마다 환율표를 따로 들고 있어서 버전만 올리면 다른 워커가 예전 환율로 다시 채울수 있음
+PRICED_GROUPS = ("rooms",)
+
+# through 테이블만 바뀌는 관계 (방 편의시설, 체험 perks)
+M2M_INVALIDATES = {
+    ("rooms.Room", "amenities"): ("rooms",),
+    ("experiences.Experience", "perks"): ("perks",),
+}
+
+# 같이 캐시에 넣는 응답 헤더 (cursor 페이지네이션 Link 등)
+CACHED_HEADERS = ("Link",)
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(group):
+    return f"responses:version:{group}"
+
+
+def get_version(group):
+    cache = get_cache()
+    version = cache.get(version_key(group))
+    if version is None:
+        # 버전 키가 밀려나도 예전 캐시를 다시 쓰지 않게 매번 새 값으로 시작
+        cache.add(version_key(group), uuid.uuid4().hex, None)
+        version = cache.get(version_key(group))
+    return version
+
+
+def invalidate(*groups):
+    for group in groups:
+        get_cache().set(version_key(group), uuid.uuid4().hex, None)
+        metrics.incr(f"response_cache.{group}.invalidate")
+
+
+def response_key(group, request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    version = get_version(group)
+    if group in PRICED_GROUPS:
+        # 기준 통화로 보면 환율표를 안 읽음
+        version = ":".join([version, *rates.price_validator(request)])
+    return f"responses:{group}:{version}:{path}"
+
+
+def get_cached(group, request):
+    key = response_key(group, request)
+    cached = get_cache().get(key)
+    if cached is not None:
+        metrics.incr(f"response_cache.{group}.hit")
+    else:
+        metrics.incr(f"response_cache.{group}.miss")
+    return key, cached
+
+
+def store(key, response):
+    # 스트리밍 응답은 body 를 다 만들어두지 않으니까 캐시 안함
+    if isinstance(response, Response) and response.status_code == 200:
+        get_cache().set(
+            key,
+            {
+                "data": response.data,
+                "headers": {
+                    header: response[header]
+                    for header in CACHED_HEADERS
+                    if response.has_header(header)
+                },
+            },
+            settings.RESPONSE_CACHE_TIMEOUT,
+        )
+
+
+def cacheable(request, anonymous_only):
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return False
+    return not (anonymous_only and request.user.is_authenticated)
+
+
+def cache_response(group, anonymous_only=False):
+    """
+    APIView 의 get 에 붙이는 데코레이터
+
+    anonymous_only=True 면 is_owner, is_liked 처럼 유저마다 다른 값이 있는 응답이라
+    로그인 안한 요청만 캐시함.
+    async def get (common.aio) 이면 캐시 읽기/쓰기만 스레드로 넘김 (Redis 는 블로킹이라)
+    """
+
+    def decorator(method):
+        if asyncio.iscoroutinefunction(method):
+
+            @wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                if not cacheable(request, anonymous_only):
+                    return await method(view, request, *args, **kwargs)
+                key, cached = await sync_to_async(get_cached)(group, request)
+                if cached is not None:
+                    return Response(cached["data"], headers=cached["headers"])
+                response = await method(view, request, *args, **kwargs)
+                await sync_to_async(store)(key, response)
+                return response
+
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if not cacheable(request, anonymous_only):
+                return method(view, request, *args, **kwargs)
+            key, cached = get_cached(group, request)
+            if cached is not None:
+                return Response(cached["data"], headers=cached["headers"])
+            response = method(view, request, *args, **kwargs)
+            store(key, response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def connect_signals():
+    for label, groups in INVALIDATES.items():
+        model = apps.get_model(label)
+
+        def receiver(sender, groups=groups, **kwargs):
+            invalidate(*groups)
+
+        post_save.connect(receiver, sender=model, weak=False)
+        post_delete.connect(receiver, sender=model, weak=False)
+
+    for (label, field), groups in M2M_INVALIDATES.items():
+
+        def m2m_receiver(sender, action, groups=groups, **kwargs):
+            if action in ("post_add", "post_remove", "post_clear"):
+                invalidate(*groups)
+
+        m2m_changed.connect(
+            m2m_receiver,
+            sender=getattr(apps.get_model(label), field).through,
+            weak=False,
+        )
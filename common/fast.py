@@ -0,0 +1,311 @@
+"""
+읽기 전용 목록용 빠른 serializer
+
+DRF serializer 는 row 마다 필드별 get_attribute / to_representation 을 거쳐서 목록이 길면 그게 대부분의 시간임.
+여기서는 serializer 클래스를 한번만 분석해서 (.values() 컬럼, 필드별 변환 함수) 계획을 만들어두고
+.values() row(dict) 에서 바로 같은 모양의 dict 를 만듬.
+
+- 일반 필드: 값 그대로 (날짜 등은 DRF 필드의 to_representation)
+- SerializerMethodField: serializer 의 get_xxx 를 row 로 부름.
+  row 는 속성으로도 읽히고 모델 메소드 (room.rating() 등) 도 그대로 부를수 있음.
+  메소드에서 쓰는 컬럼은 serializer 의 row_columns 에 적어둠.
+- 정방향 FK 로 중첩된 serializer: JOIN 해서 같은 쿼리로 읽음
+- 역방향 FK / M2M 으로 중첩된 serializer: 관계마다 쿼리 한번으로 읽어서 부모 pk 로 붙임
+
+serializer 에 localize_page(items) 가 있으면 (currencies.serializers.LocalPriceMixin)
+다 만든 페이지를 한번 더 넘겨서 통화 변환 같은 페이지 단위 후처리를 함.
+
+async view (common.aio) 에서는 aserialize / apaginated_response 로 같은 결과를 async ORM 으로 만듬.
+
+계획을 못 만드는 필드 (파일, 관계 id, source 에 . 이 있는 필드 등) 가 있으면
+can_compile() 이 False 라서 view 는 기존 DRF serializer 를 씀.
+"""
+
+import asyncio
+import types
+from collections import defaultdict
+from functools import lru_cache
+from django.db.models import F
+from rest_framework import serializers
+from .mixins import reverse_path
+
+# to_representation 이 값을 그대로 돌려주는 필드 (DB 값이 이미 같은 타입)
+PLAIN_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.FloatField,
+    serializers.ChoiceField,
+    serializers.ReadOnlyField,
+)
+# context(request) 가 필요하거나 모델 객체가 있어야 하는 필드
+UNSUPPORTED_FIELDS = (
+    serializers.FileField,
+    serializers.RelatedField,
+    serializers.ManyRelatedField,
+    serializers.HiddenField,
+)
+PARENT = "_parent"
+
+
+class NotCompilable(Exception):
+    pass
+
+
+class Row(dict):
+    """.values() row 를 모델 객체처럼 읽게 해주는 dict (room.pk, room.rating() ...)"""
+
+    model = None
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            pass
+        attr = getattr(self.model, name, None)
+        if isinstance(attr, types.FunctionType):
+            return types.MethodType(attr, self)
+        raise AttributeError(name)
+
+
+class Plan:
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        serializer = serializer_class()
+        meta = getattr(serializer_class, "Meta", None)
+        self.model = getattr(meta, "model", None)
+        if self.model is None:
+            raise NotCompilable(f"{serializer_class.__name__} is not a ModelSerializer")
+        self.row_class = type(f"{self.model.__name__}Row", (Row,), {"model": self.model})
+        self.columns = ["pk", *getattr(serializer_class, "row_columns", ())]
+        # (이름, 종류, 정보)
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.fields.append(self.compile_field(name, field))
+
+    def add_column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+
+    def compile_field(self, name, field):
+        if isinstance(field, serializers.SerializerMethodField):
+            return name, "method", field.method_name
+        source = field.source
+        if "." in source or source == "*":
+            raise NotCompilable(f"{name}: source {source!r}")
+        if isinstance(field, (serializers.ListSerializer, serializers.BaseSerializer)):
+            return self.compile_nested(name, field)
+        if isinstance(field, UNSUPPORTED_FIELDS):
+            raise NotCompilable(f"{name}: {type(field).__name__}")
+        self.add_column(source)
+        convert = None if isinstance(field, PLAIN_FIELDS) else field.to_representation
+        return name, "value", (source, convert)
+
+    def compile_nested(self, name, field):
+        many = isinstance(field, serializers.ListSerializer)
+        child_class = type(field.child if many else field)
+        child = compile_plan(child_class)
+        model_field = self.model._meta.get_field(field.source)
+        if not many and model_field.concrete and not child.has_relations():
+            # 정방향 FK: JOIN 해서 user__name 같은 컬럼으로 같이 읽음
+            prefix = f"{field.source}__"
+            for column in child.columns:
+                self.add_column(prefix + column)
+            return name, "joined", (prefix, child)
+        related_model, lookup = reverse_path(self.model, field.source)
+        if related_model is not child.model:
+            raise NotCompilable(f"{name}: {related_model} != {child.model}")
+        return name, "related", (lookup, child, many)
+
+    def has_relations(self):
+        return any(kind in ("joined", "related") for _, kind, _ in self.fields)
+
+
+@lru_cache(maxsize=None)
+def compile_plan(serializer_class):
+    return Plan(serializer_class)
+
+
+def can_compile(serializer_class):
+    try:
+        compile_plan(serializer_class)
+    except NotCompilable:
+        return False
+    return True
+
+
+class FastSerializer:
+    """
+    fast = FastSerializer(RoomListSerializer, {"request": request})
+    data = fast.serialize(fast.values(Room.objects.all())[:24])
+
+    serializer_class(rows, many=True, context=context).data 와 같은 모양의 리스트를 만듬.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.plan = compile_plan(serializer_class)
+        # get_xxx 메소드는 context 가 있는 인스턴스로 불러야 함 (필드는 안 만듬)
+        self.serializer = serializer_class(context=context or {})
+        self.context = context
+        self.children = {}
+
+    def values(self, queryset, *extra):
+        """queryset 을 계획에 필요한 컬럼만 읽는 .values() 로 (extra: 페이지네이션 정렬 컬럼 등)"""
+        columns = list(self.plan.columns)
+        for column in extra:
+            if column not in columns:
+                columns.append(column)
+        return queryset.prefetch_related(None).values(*columns)
+
+    def child(self, name, plan):
+        if name not in self.children:
+            self.children[name] = FastSerializer(plan.serializer_class, self.context)
+        return self.children[name]
+
+    def related_queryset(self, name, lookup, plan, rows):
+        pks = [row["pk"] for row in rows]
+        child = self.child(name, plan)
+        queryset = child.values(
+            plan.model._default_manager.filter(**{f"{lookup}__in": pks})
+        ).annotate(**{PARENT: F(lookup)})
+        return child, queryset
+
+    @staticmethod
+    def group(child_rows, items):
+        grouped = defaultdict(list)
+        for child_row, data in zip(child_rows, items):
+            grouped[child_row[PARENT]].append(data)
+        return grouped
+
+    def load_related(self, name, lookup, plan, rows):
+        """부모 pk -> 직렬화된 자식 목록 (쿼리 한번)"""
+        child, queryset = self.related_queryset(name, lookup, plan, rows)
+        child_rows = list(queryset)
+        return self.group(child_rows, child.serialize(child_rows))
+
+    async def aload_related(self, name, lookup, plan, rows):
+        child, queryset = self.related_queryset(name, lookup, plan, rows)
+        child_rows = [row async for row in queryset]
+        return self.group(child_rows, await child.aserialize(child_rows))
+
+    def related_fields(self):
+        return [
+            (name, info[0], info[1])
+            for name, kind, info in self.plan.fields
+            if kind == "related"
+        ]
+
+    def serialize(self, rows):
+        if not isinstance(rows, list):
+            rows = list(rows)
+        if not rows:
+            return []
+        related = {
+            name: self.load_related(name, lookup, plan, rows)
+            for name, lookup, plan in self.related_fields()
+        }
+        return self.build(rows, related)
+
+    async def aserialize(self, rows):
+        """
+        async view 용 serialize (rows 는 이미 읽어둔 리스트)
+
+        관계 (photos, perks ...) 마다 따로 읽는 쿼리는 서로 상관이 없어서 gather 로 같이 기다림.
+        """
+        if not rows:
+            return []
+        fields = self.related_fields()
+        groups = await asyncio.gather(
+            *(self.aload_related(name, lookup, plan, rows) for name, lookup, plan in fields)
+        )
+        return self.build(rows, {name: grouped for (name, _, _), grouped in zip(fields, groups)})
+
+    def build(self, rows, related):
+        """rows + 미리 읽은 관계 (related: 이름 -> 부모 pk 별 목록) -> 직렬화된 목록 (쿼리 없음)"""
+        plan = self.plan
+        steps = []
+        for name, kind, info in plan.fields:
+            if kind == "value":
+                source, convert = info
+                steps.append((name, kind, (source, convert)))
+            elif kind == "method":
+                steps.append((name, kind, getattr(self.serializer, info)))
+            elif kind == "joined":
+                prefix, child_plan = info
+                steps.append((name, kind, (prefix, self.child(name, child_plan))))
+            else:
+                many = info[2]
+                steps.append((name, kind, (related[name], many)))
+
+        row_class = plan.row_class
+        output = []
+        for values in rows:
+            row = row_class(values)
+            data = {}
+            for name, kind, info in steps:
+                if kind == "value":
+                    source, convert = info
+                    value = row[source]
+                    if convert is not None and value is not None:
+                        value = convert(value)
+                    data[name] = value
+                elif kind == "method":
+                    data[name] = info(row)
+                elif kind == "joined":
+                    prefix, child = info
+                    if row[prefix + "pk"] is None:
+                        data[name] = None
+                    else:
+                        data[name] = child.build(
+                            [{column: row[prefix + column] for column in child.plan.columns}],
+                            {},
+                        )[0]
+                else:
+                    grouped, many = info
+                    children = grouped.get(row["pk"], [])
+                    if many:
+                        data[name] = children
+                    else:
+                        data[name] = children[0] if children else None
+            output.append(data)
+        localize_page = getattr(self.serializer, "localize_page", None)
+        if localize_page is not None:
+            localize_page(output)
+        return output
+
+
+def list_data(queryset, serializer_class, context=None):
+    """GET 목록 data: 계획을 만들 수 있으면 FastSerializer, 아니면 DRF serializer"""
+    if can_compile(serializer_class):
+        fast = FastSerializer(serializer_class, context)
+        return fast.serialize(fast.values(queryset))
+    return serializer_class(queryset, many=True, context=context or {}).data
+
+
+def paginated_response(paginator, request, queryset, serializer_class, context=None):
+    """CursorPagination 한 페이지를 list_data 와 같은 방식으로"""
+    if can_compile(serializer_class):
+        fast = FastSerializer(serializer_class, context)
+        ordering = [field.lstrip("-") for field in paginator.ordering]
+        page = paginator.paginate_queryset(fast.values(queryset, *ordering), request)
+        # 정렬용으로만 읽은 컬럼은 serialize 결과에 안 들어감
+        return paginator.get_paginated_response(fast.serialize(page))
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(
+        serializer_class(page, many=True, context=context or {}).data
+    )
+
+
+async def apaginated_response(paginator, request, queryset, serializer_class, context=None):
+    """async view 용 paginated_response"""
+    if can_compile(serializer_class):
+        fast = FastSerializer(serializer_class, context)
+        ordering = [field.lstrip("-") for field in paginator.ordering]
+        page = await paginator.apaginate_queryset(fast.values(queryset, *ordering), request)
+        return paginator.get_paginated_response(await fast.aserialize(page))
+    page = await paginator.apaginate_queryset(queryset, request)
+    return paginator.get_paginated_response(
+        serializer_class(page, many=True, context=context or {}).data
+    )
@@ -0,0 +1,41 @@
+"""
+M2M (방 편의시설, 체험 perk) 일괄 지정
+
+id 하나마다 get() + add() 하던걸 in_bulk 한번으로 검사하고
+through 테이블은 set()/add() 한번으로 씀 (이미 있는지 확인 + bulk insert).
+개수와 상관없이 쿼리 수가 일정함.
+"""
+
+from rest_framework.exceptions import ParseError
+
+
+def get_related(model, pks, name):
+    """
+    pks 에 해당하는 객체 목록, 없는 id 가 있으면 한번에 모아서 ParseError
+
+    name 은 에러 메세지에 쓰는 이름 (Amenity, Perk ...)
+    """
+    if pks is None:
+        return []
+    if not isinstance(pks, list):
+        raise ParseError(f"{name} should be a list of ids")
+    try:
+        pks = list(dict.fromkeys(int(pk) for pk in pks))
+    except (TypeError, ValueError):
+        raise ParseError(f"{name} should be a list of ids")
+    found = model.objects.in_bulk(pks)
+    missing = [pk for pk in pks if pk not in found]
+    if missing:
+        raise ParseError(f"{name} not found: {missing}")
+    return [found[pk] for pk in pks]
+
+
+def assign_related(manager, objects, replace=False):
+    """
+    replace=True 면 기존 관계를 objects 로 바꾸고 (빠진 것만 지우고 새 것만 추가)
+    아니면 objects 를 추가만 함
+    """
+    if replace:
+        manager.set(objects)
+    elif objects:
+        manager.add(*objects)
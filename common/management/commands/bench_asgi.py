@@ -0,0 +1,189 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from categories.models import Category
+from medias.covers import rebuild_covers
+from medias.models import Photo
+from reviews.models import Review
+from rooms.models import Amenity, Room
+from users.models import User
+
+PATHS = {
+    "rooms": "/api/v1/rooms/",
+    "room": "/api/v1/rooms/{pk}",
+    "reviews": "/api/v1/rooms/{pk}/reviews",
+    "categories": "/api/v1/categories/?kind=room",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "uvicorn 으로 config.asgi 를 띄워서 조회 API 의 requests/sec, p50, p99 를 잽니다. "
+        "--app-dir 로 다른 체크아웃 (git worktree 로 만든 이전 커밋 등) 을 띄우면 동기 view 와 비교할 수 있음 "
+        "(같은 DB 를 봐야 함). 만든 데이터는 끝나면 지움."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="주소마다 보낼 요청 수")
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--rooms", type=int, default=200)
+        parser.add_argument("--app-dir", default=str(settings.BASE_DIR))
+        parser.add_argument("--paths", default=",".join(PATHS), help="콤마 구분")
+
+    def handle(self, *args, **options):
+        owner = self.create_rooms(options["rooms"])
+        try:
+            pks = list(Room.objects.filter(owner=owner).values_list("pk", flat=True))
+            port = self.free_port()
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "config.asgi:application",
+                    "--app-dir",
+                    options["app_dir"],
+                    "--port",
+                    str(port),
+                    "--no-access-log",
+                    "--log-level",
+                    "warning",
+                ],
+                cwd=options["app_dir"],
+                env=os.environ.copy(),
+            )
+            try:
+                base = f"http://127.0.0.1:{port}"
+                self.wait_for(base)
+                self.stdout.write(
+                    f"{'path':>12} {'req/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'errors':>7}"
+                )
+                for name in options["paths"].split(","):
+                    result = asyncio.run(
+                        self.run(
+                            base,
+                            PATHS[name],
+                            pks,
+                            options["requests"],
+                            options["concurrency"],
+                        )
+                    )
+                    self.stdout.write(
+                        f"{name:>12} {result['rps']:>8.0f} {result['p50']:>9.1f} "
+                        f"{result['p99']:>9.1f} {result['errors']:>7}"
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+        finally:
+            self.cleanup(owner)
+
+    async def run(self, base, path, pks, total, concurrency):
+        latencies = []
+        errors = 0
+        queue = asyncio.Queue()
+        for i in range(total):
+            # 쿼리스트링을 매번 다르게 해서 응답 캐시 (common.cache) 를 안 타게 함
+            url = path.format(pk=pks[i % len(pks)])
+            queue.put_nowait(f"{url}{'&' if '?' in url else '?'}n={i}")
+
+        async def worker(client):
+            nonlocal errors
+            while not queue.empty():
+                url = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        limits = httpx.Limits(max_connections=concurrency)
+        # ALLOWED_HOSTS 에 있는 이름으로 (127.0.0.1 로 붙으면 400)
+        headers = {"Host": "localhost"}
+        async with httpx.AsyncClient(
+            base_url=base, limits=limits, headers=headers, timeout=60
+        ) as client:
+            await client.get(path.format(pk=pks[0]))
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            "rps": total / elapsed,
+            "p50": latencies[len(latencies) // 2] * 1000,
+            "p99": latencies[int(len(latencies) * 0.99)] * 1000,
+            "errors": errors,
+        }
+
+    def create_rooms(self, size):
+        owner = User.objects.create(username="bench-asgi")
+        category = Category.objects.create(
+            name="bench-asgi", kind=Category.CategoryKindChoices.ROOMS
+        )
+        amenities = Amenity.objects.bulk_create(
+            [Amenity(name=f"bench-asgi {i}") for i in range(5)]
+        )
+        rooms = Room.objects.bulk_create(
+            [
+                Room(
+                    name=f"bench {i}",
+                    price=i,
+                    rooms=1,
+                    toilets=1,
+                    description="bench",
+                    address="bench",
+                    owner=owner,
+                    category=category,
+                )
+                for i in range(size)
+            ]
+        )
+        Room.amenities.through.objects.bulk_create(
+            [
+                Room.amenities.through(room=room, amenity=amenity)
+                for room in rooms
+                for amenity in amenities
+            ]
+        )
+        Photo.objects.bulk_create(
+            [
+                Photo(file=f"https://example.com/{room.pk}-{i}.jpg", description="bench", room=room)
+                for room in rooms
+                for i in range(3)
+            ]
+        )
+        rebuild_covers("room", [room.pk for room in rooms])
+        Review.objects.bulk_create(
+            [
+                Review(user=owner, room=room, payload="bench", rating=5)
+                for room in rooms
+                for _ in range(5)
+            ]
+        )
+        return owner
+
+    def cleanup(self, owner):
+        Category.objects.filter(name="bench-asgi").delete()
+        Amenity.objects.filter(name__startswith="bench-asgi").delete()
+        owner.delete()
+
+    def free_port(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def wait_for(self, base):
+        for _ in range(100):
+            try:
+                httpx.get(f"{base}/api/v1/categories/", headers={"Host": "localhost"}, timeout=1)
+                return
+            except httpx.TransportError:
+                time.sleep(0.1)
+        raise RuntimeError("uvicorn did not start")
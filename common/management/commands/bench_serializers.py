@@ -0,0 +1,96 @@
+import time
+from django.db import transaction
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from common.fast import FastSerializer
+from medias.covers import rebuild_covers
+from medias.models import Photo
+from rooms.models import Room
+from rooms.serializers import RoomListSerializer
+from rooms.views import with_cover_photo
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "방 목록을 DRF serializer 와 common.fast 로 만들때 걸리는 시간을 비교합니다. (데이터는 롤백됨)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="100,1000,10000",
+            help="방 개수 (콤마 구분)",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        self.stdout.write(f"{'rows':>8} {'drf (ms)':>10} {'fast (ms)':>10} {'speedup':>8}")
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    user = self.create_rooms(size)
+                    request = Request(APIRequestFactory().get("/api/v1/rooms/"))
+                    request.user = user
+                    context = {"request": request}
+                    rooms = Room.objects.order_by("pk")
+
+                    def drf():
+                        return RoomListSerializer(
+                            with_cover_photo(rooms), many=True, context=context
+                        ).data
+
+                    def fast():
+                        serializer = FastSerializer(RoomListSerializer, context)
+                        return serializer.serialize(serializer.values(rooms))
+
+                    if JSONRenderer().render(drf()) != JSONRenderer().render(fast()):
+                        self.stderr.write(self.style.ERROR(f"{size}: output differs"))
+                    drf_ms = self.measure(options["repeat"], drf)
+                    fast_ms = self.measure(options["repeat"], fast)
+                    self.stdout.write(
+                        f"{size:>8} {drf_ms:>10.1f} {fast_ms:>10.1f} {drf_ms / fast_ms:>7.1f}x"
+                    )
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def create_rooms(self, size):
+        user = User.objects.create(username="bench-serializers")
+        rooms = Room.objects.bulk_create(
+            [
+                Room(
+                    name=f"bench {i}",
+                    price=i,
+                    rooms=1,
+                    toilets=1,
+                    description="bench",
+                    address="bench",
+                    owner=user,
+                    rating_sum=i % 50,
+                    review_count=i % 10,
+                )
+                for i in range(size)
+            ],
+            batch_size=1000,
+        )
+        Photo.objects.bulk_create(
+            [
+                Photo(file=f"https://example.com/{room.pk}.jpg", description="bench", room=room)
+                for room in rooms
+            ],
+            batch_size=1000,
+        )
+        rebuild_covers("room", [room.pk for room in rooms])
+        return user
+
+    def measure(self, repeat, func):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat * 1000
@@ -0,0 +1,54 @@
+"""
+프로세스 안에서만 세는 간단한 카운터/타이머/게이지 (마지막 값)
+
+워커(프로세스)마다 따로 세기 때문에 /api/v1/metrics 는 요청을 받은 워커의 값만 보여줌.
+"""
+
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_timers = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+_gauges = {}
+
+
+def incr(name, amount=1):
+    with _lock:
+        _counters[name] += amount
+
+
+def observe(name, seconds):
+    ms = seconds * 1000
+    with _lock:
+        timer = _timers[name]
+        timer["count"] += 1
+        timer["total_ms"] += ms
+        timer["max_ms"] = max(timer["max_ms"], ms)
+
+
+def gauge(name, value):
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot():
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "timers": {
+                name: {
+                    **timer,
+                    "avg_ms": timer["total_ms"] / timer["count"] if timer["count"] else 0,
+                }
+                for name, timer in _timers.items()
+            },
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+        _gauges.clear()
@@ -0,0 +1,35 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    async 도 되는 WhiteNoiseMiddleware
+
+    WhiteNoise 6 은 동기 전용이라 MIDDLEWARE 에 있으면 ASGI 에서 모든 요청이
+    스레드 -> 다시 이벤트 루프로 넘어가서 async view 도 결국 스레드를 거침.
+    정적 파일 주소가 아니면 그대로 다음 middleware 로 넘기고, 정적 파일만 스레드에서 열어서 돌려줌.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
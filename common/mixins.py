@@ -0,0 +1,147 @@
+import hashlib
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Max, Subquery, Value
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+from rest_framework.status import HTTP_304_NOT_MODIFIED
+
+
+class NotModified(Exception):
+    pass
+
+
+def reverse_path(model, path):
+    """
+    "photos", "rooms__photos" 같은 관계 경로를 반대 방향 lookup 으로 바꿈
+
+    (Room, "photos") -> (Photo, "room")
+    (Wishlist, "rooms__photos") -> (Photo, "room__wishlists")
+    """
+    names = []
+    for name in path.split("__"):
+        field = model._meta.get_field(name)
+        if field.auto_created and not field.concrete:
+            # 역방향 관계 (photos, reviews, videos ...)
+            names.insert(0, field.field.name)
+        else:
+            # 정방향 FK / M2M (category, amenities ...)
+            names.insert(0, field.related_query_name())
+        model = field.related_model
+    return model, "__".join(names)
+
+
+def latest_changes(queryset, relations=()):
+    """
+    queryset 과 관계된 row 들의 (가장 최근 updated_at, 개수) 목록
+
+    관계마다 스칼라 서브쿼리를 붙여서 쿼리 한번으로 끝냄.
+    """
+    aggregates = {"at": Max("updated_at"), "count": Count("pk")}
+    for i, relation in enumerate(relations):
+        model, lookup = reverse_path(queryset.model, relation)
+        related = (
+            model.objects.filter(**{f"{lookup}__in": queryset.values("pk")})
+            .order_by()
+            .annotate(_all=Value(1))
+            .values("_all")
+        )
+        aggregates[f"at_{i}"] = Max(
+            Subquery(related.annotate(value=Max("updated_at")).values("value"))
+        )
+        aggregates[f"count_{i}"] = Max(
+            Subquery(
+                related.annotate(value=Count("pk", distinct=True)).values("value")
+            )
+        )
+    row = queryset.aggregate(**aggregates)
+    changes = [{"at": row["at"], "count": row["count"]}]
+    for i in range(len(relations)):
+        changes.append({"at": row[f"at_{i}"], "count": row[f"count_{i}"]})
+    return changes
+
+
+class ConditionalGetMixin:
+    """
+    CommonModel.updated_at 으로 ETag / Last-Modified 를 만들어서
+    If-None-Match / If-Modified-Since 가 맞으면 serializer 를 거치지 않고 304 로 응답함.
+
+    view 에서 validator_model (url 에 pk 가 있으면 그 row 만) 이나 get_validator_queryset() 과
+    validator_relations 를 정의하면 됨. 둘 다 없으면 view 를 import 할때 ImproperlyConfigured.
+    삭제된 row 는 updated_at 에 안 잡히니까 ETag 에는 개수도 같이 넣음.
+    """
+
+    validator_model = None
+    validator_relations = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if (
+            cls.validator_model is None
+            and cls.get_validator_queryset is ConditionalGetMixin.get_validator_queryset
+        ):
+            raise ImproperlyConfigured(
+                f"{cls.__name__} should set validator_model or define get_validator_queryset()"
+            )
+
+    def get_validator_queryset(self, request, *args, **kwargs):
+        queryset = self.validator_model.objects.all()
+        if "pk" in kwargs:
+            queryset = queryset.filter(pk=kwargs["pk"])
+        return queryset
+
+    def get_validator_extra(self, request, *args, **kwargs):
+        # is_owner 처럼 유저마다 달라지는 값
+        return [request.user.pk]
+
+    def get_validators(self, request, *args, **kwargs):
+        queryset = self.get_validator_queryset(request, *args, **kwargs)
+        changes = latest_changes(queryset, self.validator_relations)
+        if not changes[0]["count"]:
+            # 없는 객체면 view 에서 404 를 내도록 그냥 넘어감
+            return None, None
+        source = repr(
+            (
+                request.get_full_path(),
+                [(change["at"], change["count"]) for change in changes],
+                self.get_validator_extra(request, *args, **kwargs),
+            )
+        )
+        etag = quote_etag(hashlib.md5(source.encode()).hexdigest())
+        last_modified = max(change["at"] for change in changes if change["at"])
+        return etag, last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag, self.last_modified = None, None
+        if request.method not in ("GET", "HEAD"):
+            return
+        self.etag, self.last_modified = self.get_validators(request, *args, **kwargs)
+        if self.etag and self.is_not_modified(request):
+            raise NotModified
+
+    def is_not_modified(self, request):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            return self.etag in parse_etags(if_none_match) or if_none_match == "*"
+        # 로그인 유저는 위시리스트 등 timestamp 에 안 잡히는 값이 있어서 ETag 로만 비교
+        if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        return (
+            not request.user.is_authenticated
+            and if_modified_since is not None
+            and int(self.last_modified.timestamp()) <= if_modified_since
+        )
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "etag", None) and response.status_code in (200, 304):
+            response["ETag"] = self.etag
+            if not request.user.is_authenticated:
+                response["Last-Modified"] = http_date(self.last_modified.timestamp())
+            patch_vary_headers(response, ("Cookie", "Authorization", "Jwt"))
+        return response
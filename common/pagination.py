@@ -0,0 +1,151 @@
+import base64
+import json
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorPagination:
+    """
+    Keyset(cursor) 페이지네이션
+
+    OFFSET 대신 마지막으로 본 행의 (created_at, pk) 값보다 뒤에 있는 행만 가져오니까
+    몇번째 페이지든 인덱스를 타고 page_size + 1 개만 읽음.
+    응답 body 는 기존처럼 리스트 그대로고, 다음/이전 페이지 주소는 Link 헤더로 내려줌.
+
+    예전 클라이언트가 쓰던 ?page=N 은 옮겨가는 동안 OFFSET 으로 계속 받아줌.
+    그 응답에도 Link 헤더가 있어서 다음 페이지부터는 cursor 로 넘어감.
+    """
+
+    cursor_query_param = "cursor"
+    page_query_param = "page"
+
+    def __init__(self, ordering=("created_at", "pk"), page_size=None):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size or settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """async view 용 (async ORM 으로 읽음)"""
+        return self.set_page(
+            [row async for row in self.page_queryset(queryset, request)]
+        )
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        self.cursor = self.decode_cursor(request, queryset)
+
+        ordering = self.ordering
+        if self.cursor is not None and self.cursor["reverse"]:
+            ordering = tuple(self.flip(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        self.offset = 0
+        if self.cursor is not None:
+            queryset = queryset.filter(self.keyset(ordering, self.cursor["position"]))
+        else:
+            self.offset = (self.decode_page(request) - 1) * self.page_size
+        return queryset[self.offset : self.offset + self.page_size + 1]
+
+    def set_page(self, rows):
+        cursor = self.cursor
+        reverse = cursor is not None and cursor["reverse"]
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None or self.offset > 0
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        links = []
+        if self.page and self.has_next:
+            links.append(f'<{self.get_link(self.page[-1], False)}>; rel="next"')
+        if self.page and self.has_previous:
+            links.append(f'<{self.get_link(self.page[0], True)}>; rel="prev"')
+        headers = {"Link": ", ".join(links)} if links else None
+        return Response(data, headers=headers)
+
+    def get_link(self, row, reverse):
+        position = [str(self.get_value(row, field)) for field in self.ordering]
+        token = base64.urlsafe_b64encode(
+            json.dumps([position, reverse]).encode()
+        ).decode()
+        return replace_query_param(
+            remove_query_param(self.request.build_absolute_uri(), self.page_query_param),
+            self.cursor_query_param,
+            token,
+        )
+
+    def decode_page(self, request):
+        """예전 ?page=N (1부터), 없으면 1"""
+        value = request.query_params.get(self.page_query_param)
+        if not value:
+            return 1
+        try:
+            page = int(value)
+            if page < 1:
+                raise ValueError
+        except ValueError:
+            raise ParseError("page should be a positive number, use the Link header cursor instead")
+        return page
+
+    def decode_cursor(self, request, queryset):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            position, reverse = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.get_field(queryset, field).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except Exception:
+            raise ParseError("Invalid cursor")
+        return {"position": position, "reverse": bool(reverse)}
+
+    def keyset(self, ordering, position):
+        # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y)
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        # OR 만으로는 인덱스 범위를 못 좁혀서 맨 앞부터 읽으니까 a >= x 를 같이 걸어줌
+        first, value = ordering[0], position[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": value}) & condition
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def get_field(queryset, field):
+        name = field.lstrip("-")
+        if name == "pk":
+            return queryset.model._meta.pk
+        if name in queryset.query.annotations:
+            # 검색 rank 처럼 annotate 로 붙인 값
+            return queryset.query.annotations[name].output_field
+        return queryset.model._meta.get_field(name)
+
+    @staticmethod
+    def get_value(row, field):
+        name = field.lstrip("-")
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
@@ -0,0 +1,68 @@
+"""
+큰 목록을 JSON 배열로 흘려보내는 응답
+
+목록 전체를 serializer.data 로 만든 다음 한번에 렌더링하면 워커 메모리가 row 수만큼 늘어남.
+여기서는 queryset.iterator(chunk_size) 로 읽으면서 row 하나씩 serialize 해서
+chunk 마다 JSON 배열 조각을 내보내니까 메모리는 chunk 하나 크기로 일정하고 첫 바이트도 바로 나감.
+DRF Renderer 는 bytes 하나를 돌려줘야 해서 StreamingHttpResponse 를 직접 씀.
+"""
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.utils import encoders
+from .fast import FastSerializer, can_compile
+
+# DRF JSONRenderer 기본값과 같은 모양 (compact, 한글 그대로)
+encoder = encoders.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def wants_stream(request):
+    """?stream 이 붙은 요청"""
+    return "stream" in request.query_params
+
+
+def iter_chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_json_array(queryset, serialize_chunk, chunk_size):
+    yield "["
+    separator = ""
+    for chunk in iter_chunks(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        yield separator + ",".join(encoder.encode(data) for data in serialize_chunk(chunk))
+        separator = ","
+    yield "]"
+
+
+def stream_response(queryset, serializer_class, context=None, chunk_size=None):
+    """
+    queryset 을 serializer_class(many=True).data 와 같은 JSON 배열로 스트리밍
+
+    common.fast 로 컴파일되는 serializer 면 chunk 마다 .values() row 로 한번에 만들고,
+    아니면 serializer 인스턴스 하나로 (필드는 만드는게 비싸서) row 마다 to_representation 만 부름.
+    """
+    if can_compile(serializer_class):
+        fast = FastSerializer(serializer_class, context)
+        queryset = fast.values(queryset)
+        serialize_chunk = fast.serialize
+    else:
+        serializer = serializer_class(context=context or {})
+
+        def serialize_chunk(chunk):
+            return [serializer.to_representation(instance) for instance in chunk]
+
+    return StreamingHttpResponse(
+        iter_json_array(
+            queryset,
+            serialize_chunk,
+            chunk_size or settings.STREAM_CHUNK_SIZE,
+        ),
+        content_type="application/json",
+    )
@@ -1,3 +1,390 @@
-from django.test import TestCase
+import asyncio
+from datetime import date, time
+from asgiref.sync import SyncToAsync, async_to_sync
+from django.http import StreamingHttpResponse
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.views import APIView
+from bookings.models import Booking
+from bookings.serializers import PublicBookingSerializer
+from categories.models import Category
+from currencies import rates
+from currencies.models import ExchangeRate
+from experiences.models import Experience, Perk
+from experiences.serializers import ExperienceListSerializer
+from medias.models import Photo, Video
+from medias.serializers import PhotoSerializer
+from reviews.models import Review
+from reviews.serializers import ReviewSerializer
+from rooms.models import Room
+from rooms.serializers import RoomListSerializer
+from users.models import User
+from wishlists.liked import get_liked
+from wishlists.models import Wishlist
+from wishlists.serializers import WishlistDetailSerializer, WishlistSerializer
+from categories.views import Categories
+from experiences.views import ExperienceDetail
+from rooms.views import RoomDetail, Rooms
+from users import oauth
+from wishlists.views import WishlistDetail
+from . import fast, metrics
+from .asgi import ASGIHandler
+from .mixins import ConditionalGetMixin
 
-# Create your tests here.
+
+class TestResponseCache(APITestCase):
+    URL = "/api/v1/categories/?kind=room"
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        Category.objects.create(name="Beach", kind=Category.CategoryKindChoices.ROOMS)
+
+    def test_cached_until_model_changes(self):
+        self.assertEqual(len(self.client.get(self.URL).json()), 1)
+        # 캐시에서 나오고 ETag 계산 쿼리만 남음
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.client.get(self.URL).json()), 1)
+
+        Category.objects.create(name="Cabin", kind=Category.CategoryKindChoices.ROOMS)
+        self.assertEqual(len(self.client.get(self.URL).json()), 2)
+
+        counters = metrics.snapshot()["counters"]
+        self.assertEqual(counters["response_cache.categories.hit"], 1)
+        self.assertEqual(counters["response_cache.categories.miss"], 2)
+
+    def test_query_string_is_part_of_key(self):
+        self.client.get(self.URL)
+        response = self.client.get("/api/v1/categories/?kind=experience")
+        self.assertEqual(response.json(), [])
+
+    def test_experience_perks_change(self):
+        host = User.objects.create(username="host")
+        experience = Experience.objects.create(
+            name="Tour",
+            host=host,
+            price=5,
+            address="addr",
+            start=time(9),
+            end=time(12),
+            description="desc",
+        )
+        perk = Perk.objects.create(name="Lunch")
+        url = f"/api/v1/experiences/{experience.pk}/perks"
+        self.assertEqual(self.client.get(url).json(), [])
+        # through 테이블만 바뀜 (m2m_changed)
+        experience.perks.add(perk)
+        self.assertEqual(len(self.client.get(url).json()), 1)
+
+    def test_rate_change(self):
+        rates.clear()
+        self.addCleanup(rates.clear)
+        rate = ExchangeRate.objects.create(currency="usd", rate="0.001")
+        room = Room.objects.create(
+            name="Room",
+            price=10000,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=User.objects.create(username="host"),
+        )
+        url = f"/api/v1/rooms/{room.pk}"
+        self.assertEqual(self.client.get(url, {"currency": "usd"}).json()["local_price"], "10.00")
+        self.assertEqual(self.client.get(url, {"currency": "usd"}).json()["local_price"], "10.00")
+        rate.rate = "0.002"
+        rate.save()
+        self.assertEqual(self.client.get(url, {"currency": "usd"}).json()["local_price"], "20.00")
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_disabled_for_process_local_cache(self):
+        self.client.get(self.URL)
+        self.client.get(self.URL)
+        counters = metrics.snapshot()["counters"]
+        self.assertNotIn("response_cache.categories.miss", counters)
+        self.assertNotIn("response_cache.categories.hit", counters)
+
+    def test_metrics_for_admin_only(self):
+        self.assertEqual(self.client.get("/api/v1/metrics").status_code, 403)
+        admin = User.objects.create(username="admin", is_staff=True)
+        self.client.force_login(admin)
+        self.client.get(self.URL)
+        response = self.client.get("/api/v1/metrics")
+        self.assertIn("response_cache.categories.miss", response.json()["counters"])
+
+
+class TestConditionalGet(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="host")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=self.user,
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}"
+
+    def test_etag(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        # 관계가 몇개든 ETag 계산은 쿼리 한번
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        # 사진이 추가되면 방 row 는 그대로여도 ETag 가 바뀜
+        photo = Photo.objects.create(file="https://example.com/a.jpg", description="a", room=self.room)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        photo.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_last_modified(self):
+        response = self.client.get(self.url)
+        last_modified = response["Last-Modified"]
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_user(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_owner"])
+
+    def test_owner_profile_change(self):
+        etag = self.client.get(self.url)["ETag"]
+        # 방 row 는 그대로지만 응답에 들어가는 owner 이름이 바뀜
+        self.user.name = "Renamed"
+        self.user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["owner"]["name"], "Renamed")
+
+    def test_rate_table_change(self):
+        rates.clear()
+        self.addCleanup(rates.clear)
+        ExchangeRate.objects.create(currency="usd", rate="0.00075")
+        etag = self.client.get(self.url, {"currency": "usd"})["ETag"]
+        ExchangeRate.objects.filter(currency="usd").update(rate="0.001")
+        rates.clear()
+        response = self.client.get(self.url, {"currency": "usd"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_view_without_validator_queryset(self):
+        with self.assertRaises(ImproperlyConfigured):
+
+            class Broken(ConditionalGetMixin, APIView):
+                validator_relations = ("photos",)
+
+    def test_missing_object(self):
+        response = self.client.get("/api/v1/rooms/999", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 404)
+
+
+class TestFastSerializer(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create(username="host", name="Host", avatar="https://a.com/a.jpg")
+        self.guest = User.objects.create(username="guest")
+        self.rooms = [
+            Room.objects.create(
+                name=f"Room {i}",
+                price=10 * i,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="addr",
+                kind=Room.RoomKindChoices.PRIVATE_ROOM,
+                owner=self.host if i % 2 else self.guest,
+            )
+            for i in range(4)
+        ]
+        for room in self.rooms[:3]:
+            Photo.objects.create(file=f"https://a.com/{room.pk}.jpg", description="p", room=room)
+        Photo.objects.create(file="https://a.com/extra.jpg", description="p", room=self.rooms[0])
+        Review.objects.create(user=self.guest, room=self.rooms[1], payload="good", rating=4)
+        Review.objects.create(user=self.host, room=self.rooms[1], payload="ok", rating=3)
+        self.experience = Experience.objects.create(
+            name="Tour",
+            host=self.host,
+            price=5,
+            address="addr",
+            start=time(9),
+            end=time(12),
+            description="desc",
+        )
+        Experience.objects.create(
+            name="Walk",
+            host=self.guest,
+            price=5,
+            address="addr",
+            start=time(9),
+            end=time(12),
+            description="desc",
+        )
+        Video.objects.create(file="https://a.com/v.mp4", experience=self.experience)
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.guest,
+            room=self.rooms[0],
+            check_in=date(2030, 1, 1),
+            check_out=date(2030, 1, 3),
+            guests=2,
+        )
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.EXPERIENCE,
+            user=self.guest,
+            experience=self.experience,
+            experience_time_start=timezone.now(),
+            experience_time_end=timezone.now(),
+            guests=1,
+        )
+        wishlist = Wishlist.objects.create(name="trip", user=self.guest)
+        wishlist.rooms.add(self.rooms[0], self.rooms[2])
+        wishlist.experiences.add(self.experience)
+        Wishlist.objects.create(name="empty", user=self.guest)
+
+    def request(self, user):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = user
+        return request
+
+    def assert_same(self, queryset, serializer_class, context=None):
+        self.assertTrue(fast.can_compile(serializer_class))
+        expected = serializer_class(queryset, many=True, context=context or {}).data
+        data = fast.list_data(queryset, serializer_class, context)
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+        return data
+
+    def test_same_output(self):
+        for user in (AnonymousUser(), self.guest, self.host):
+            context = {"request": self.request(user)}
+            data = self.assert_same(Room.objects.order_by("pk"), RoomListSerializer, context)
+            self.assert_same(Experience.objects.order_by("pk"), ExperienceListSerializer, context)
+            self.assert_same(Wishlist.objects.order_by("pk"), WishlistSerializer, context)
+        # 목록에는 대표 사진 (첫 사진) 과 사진 개수만
+        self.assertEqual(data[0]["cover_photo"]["url"], f"https://a.com/{self.rooms[0].pk}.jpg")
+        self.assertEqual(data[0]["photo_count"], 2)
+        self.assertIsNone(data[3]["cover_photo"])
+        self.assert_same(Review.objects.order_by("pk"), ReviewSerializer)
+        self.assert_same(Photo.objects.order_by("pk"), PhotoSerializer)
+        self.assert_same(Booking.objects.order_by("pk"), PublicBookingSerializer)
+
+    def test_query_count(self):
+        # 방 + 대표 사진은 JOIN
+        with self.assertNumQueries(1):
+            fast.list_data(Room.objects.all(), RoomListSerializer)
+        # 리뷰 + 작성자는 JOIN
+        with self.assertNumQueries(1):
+            fast.list_data(Review.objects.all(), ReviewSerializer)
+
+    def test_async_same_output(self):
+        context = {"request": self.request(self.guest)}
+        # async view 에서는 preload 에서 읽어둠 (이벤트 루프에서는 DB 를 못 읽음)
+        get_liked(context["request"])
+        for queryset, serializer_class in (
+            (Room.objects.order_by("pk"), RoomListSerializer),
+            (Experience.objects.order_by("pk"), ExperienceListSerializer),
+            (Wishlist.objects.order_by("pk"), WishlistSerializer),
+        ):
+            serializer = fast.FastSerializer(serializer_class, context)
+            rows = list(serializer.values(queryset))
+            self.assertEqual(
+                async_to_sync(serializer.aserialize)(rows),
+                fast.list_data(queryset, serializer_class, context),
+            )
+
+    def test_fallback(self):
+        self.assertFalse(fast.can_compile(WishlistDetailSerializer))
+        data = fast.list_data(Wishlist.objects.order_by("pk"), WishlistDetailSerializer)
+        self.assertEqual(data[0]["rooms"], [self.rooms[0].pk, self.rooms[2].pk])
+
+
+class TestAsyncViews(APITestCase):
+    def test_read_views_are_async(self):
+        for view in (Rooms, RoomDetail, ExperienceDetail, Categories, WishlistDetail):
+            self.assertTrue(asyncio.iscoroutinefunction(view.as_view()), view)
+
+    def test_middleware_chain_stays_async(self):
+        # 동기 전용 middleware 가 있으면 요청마다 스레드로 넘어감
+        self.assertNotIsInstance(ASGIHandler()._middleware_chain, SyncToAsync)
+
+    def test_sync_handlers_still_work(self):
+        user = User.objects.create(username="host")
+        room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=user,
+        )
+        self.client.force_authenticate(user)
+        response = self.client.put(f"/api/v1/rooms/{room.pk}", {"name": "Changed"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f"/api/v1/rooms/{room.pk}")
+        self.assertEqual(response.json()["name"], "Changed")
+
+
+class TestASGIHandler(APITestCase):
+    def test_streaming_body_is_read_off_the_event_loop(self):
+        loops = []
+
+        def parts():
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            yield "[1,"
+            yield "2]"
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(ASGIHandler().send_response)(
+            StreamingHttpResponse(parts(), content_type="application/json"), send
+        )
+        self.assertEqual(loops, [None])
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertEqual(b"".join(m.get("body", b"") for m in messages[1:]), b"[1,2]")
+
+    def test_lifespan_opens_and_closes_oauth_client(self):
+        events = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+        opened = []
+
+        async def receive():
+            message = next(events)
+            if message["type"] == "lifespan.shutdown":
+                opened.append(oauth._clients.get(asyncio.get_running_loop()))
+            return message
+
+        async def send(message):
+            sent.append(message["type"])
+
+        async def serve():
+            await ASGIHandler()({"type": "lifespan"}, receive, send)
+            return oauth._clients.get(asyncio.get_running_loop())
+
+        self.assertIsNone(async_to_sync(serve)())
+        self.assertEqual(sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"])
+        client, _ = opened[0]
+        self.assertTrue(client.is_closed)
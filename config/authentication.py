@@ -1,8 +1,14 @@
-from rest_framework.authentication import BaseAuthentication
+import time
+from django.conf import settings
+from rest_framework.authentication import (
+    BaseAuthentication,
+    SessionAuthentication,
+    TokenAuthentication,
+)
 from rest_framework.exceptions import AuthenticationFailed
+from common import metrics
 from users.models import User
-import jwt
-from django.conf import settings
+from users import tokens
 
 
 class TrustMeBroAuthentication(BaseAuthentication):
@@ -18,20 +24,59 @@ class TrustMeBroAuthentication(BaseAuthentication):
 
 
 class JWTAuthentication(BaseAuthentication):
+    """Jwt 헤더의 access token 으로 인증 (DB 조회 없음, users.tokens 참고)"""
+
     def authenticate(self, request):
         token = request.headers.get("Jwt")
         if not token:
             return None
-        decoded = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=["HS256"],
-        )
-        pk = decoded["pk"]
-        if not pk:
-            raise AuthenticationFailed("Invalid Token")
-        try:
-            user = User.objects.get(pk=pk)
-            return (user, None)
-        except User.DoesNotExist:
+        claims = tokens.decode(token, tokens.ACCESS)
+        user = tokens.user_from_claims(claims)
+        if not user.is_active:
             raise AuthenticationFailed("User not Found")
+        return (user, claims)
+
+
+class RoutedAuthentication(BaseAuthentication):
+    """
+    요청 모양을 보고 인증 방식을 하나만 골라서 실행함
+
+    Authorization: Token -> TokenAuthentication
+    Jwt 헤더 -> JWTAuthentication
+    Trust-me 헤더 -> TrustMeBroAuthentication
+    세션 쿠키 -> SessionAuthentication
+    아무것도 없으면 인증을 안 돌리고 바로 익명 유저.
+
+    정해진 유저는 DRF Request 가 request.user 에 (원래 django request 에도) 저장해두니까
+    serializer 에서 request.user 를 여러번 읽어도 다시 인증하지 않음.
+    방식별 횟수/시간은 common.metrics 에 auth.<방식> 으로 남김.
+    """
+
+    backends = {
+        "token": TokenAuthentication(),
+        "jwt": JWTAuthentication(),
+        "trust_me": TrustMeBroAuthentication(),
+        "session": SessionAuthentication(),
+    }
+
+    def get_backend_name(self, request):
+        if request.headers.get("Authorization", "").startswith("Token "):
+            return "token"
+        if "Jwt" in request.headers:
+            return "jwt"
+        if "Trust-me" in request.headers:
+            return "trust_me"
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return "session"
+        return None
+
+    def authenticate(self, request):
+        name = self.get_backend_name(request)
+        if name is None:
+            metrics.incr("auth.anonymous")
+            return None
+        started = time.perf_counter()
+        try:
+            return self.backends[name].authenticate(request)
+        finally:
+            metrics.observe(f"auth.{name}", time.perf_counter() - started)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
 from pathlib import Path
+from datetime import timedelta
 import os
 import environ
 import dj_database_url
@@ -61,6 +62,9 @@ CUSTOM_APPS = [
     "bookings.apps.BookingsConfig",
     "medias.apps.MediasConfig",
     "direct_messages.apps.DirectMessagesConfig",
+    "search.apps.SearchConfig",
+    "geo.apps.GeoConfig",
+    "currencies.apps.CurrenciesConfig",
 ]
 
 SYSTEM_APPS = [
@@ -76,7 +80,7 @@ INSTALLED_APPS = SYSTEM_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "common.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -127,6 +131,35 @@ else:
     }
 
 
+# Cache
+# REDIS_URL 이 있으면 Redis (render.yaml), 없으면 워커별 local-memory 캐시
+
+if env("REDIS_URL", default=None):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "airbnb-clone",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+
+# 공개 조회 API 응답 캐시 (common.cache)
+RESPONSE_CACHE_ALIAS = "default"
+# 워커별 local-memory 캐시는 다른 워커에서 바뀐 걸 못 버려서 워커가 하나일 때만 씀
+RESPONSE_CACHE_ENABLED = (
+    CACHES["default"]["BACKEND"] != "django.core.cache.backends.locmem.LocMemCache"
+    or env.int("WEB_CONCURRENCY", default=1) <= 1
+)
+RESPONSE_CACHE_TIMEOUT = 60 * 10
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -183,17 +216,54 @@ MEDIA_ROOT = "uploads"
 
 MEDIA_URL = "user-uploads/"
 
+# 사진 크기별 사본 (medias.variants): 이름 -> 가로 px (작은 것부터)
+# Cloudflare Images 사진은 주소의 variant 이름만 바꿔서 씀 (대시보드에 같은 이름으로 만들어둬야 함)
+# MEDIA_ROOT 에 있는 사진은 Pillow 로 PHOTO_VARIANT_WORKERS 개 스레드에서 만들어서 MEDIA_ROOT/variants 에 저장
+PHOTO_VARIANTS = {"thumbnail": 320, "medium": 768, "large": 1280}
+PHOTO_VARIANT_QUALITY = 85
+PHOTO_VARIANT_WORKERS = 2
+CLOUDFLARE_DELIVERY_HOST = "imagedelivery.net"
+
 PAGE_SIZE = 3
 
+# 방/체험 목록 (cursor 페이지네이션) 한 페이지 크기
+CATALOG_PAGE_SIZE = 24
+# 스트리밍 응답 (common.streaming) 에서 DB 에서 한번에 읽고 한번에 내보내는 row 수
+STREAM_CHUNK_SIZE = 500
+
+# 검색 facet 가격 구간 경계 ([0, 50000), [50000, 100000), ... [500000, ~))
+SEARCH_PRICE_BUCKETS = (0, 50000, 100000, 200000, 500000)
+
+# 가격 통화 (currencies.rates): Room.price, Experience.price 는 PRICE_CURRENCY 의 최소 단위 정수
+# 환율표는 EXCHANGE_RATES_FILE (JSON) 이 있으면 그 파일, 없으면 ExchangeRate 테이블에서 읽고 TTL (초) 마다 다시 읽음
+PRICE_CURRENCY = "won"
+EXCHANGE_RATES_FILE = env("EXCHANGE_RATES_FILE", default="")
+EXCHANGE_RATE_TTL = 60 * 10
+
+# 주소 -> 좌표 (geo.geocoders), 위치 검색 최대 반경 (km)
+GEOCODER = env("GEOCODER", default="geo.geocoders.StubGeocoder")
+GEO_MAX_RADIUS_KM = 50
+
+# 방 예약 달력 (bookings.occupancy): 이번달부터 몇달 뒤까지 RoomOccupancy 로 저장해둘지
+CALENDAR_MONTHS_AHEAD = 18
+
+# 유저별 위시리스트 방/체험 id 캐시 시간 (초), 0 이면 캐시 안함
+LIKED_CACHE_TIMEOUT = 60 * 5
+
 REST_FRAMEWORK = {
+    # 세션(쿠키), TrustMeBro(절대 하면안됨), 토큰, jwt 중에서 요청 헤더를 보고 하나만 실행
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.SessionAuthentication",  # default (세션, 쿠키)
-        "config.authentication.TrustMeBroAuthentication",  # 임의로 만들어서 가능(절대 하면안됨)
-        "rest_framework.authentication.TokenAuthentication",  # 토큰인증
-        "config.authentication.JWTAuthentication",  # jwt인증
+        "config.authentication.RoutedAuthentication",
     ],
 }
 
+# JWT (users.tokens)
+JWT_SECRET = env("JWT_SECRET", default=SECRET_KEY)
+JWT_ACCESS_LIFETIME = timedelta(minutes=15)
+JWT_REFRESH_LIFETIME = timedelta(days=14)
+# 서명 검증이 끝난 access token 을 워커마다 몇개까지 기억할지
+JWT_CLAIMS_CACHE_SIZE = 1024
+
 if DEBUG:
     CORS_ALLOWED_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
@@ -210,14 +280,58 @@ else:
 # 리액트 3000포트 서버에서 쿠키 요청을 받아도 된다는 뜻임.
 CORS_ALLOW_CREDENTIALS = True
 
+# cursor 페이지네이션의 다음/이전 페이지 주소를 프론트에서 읽을수 있게
+CORS_EXPOSE_HEADERS = ["Link"]
+
 GITHUB_SECRET = env("GITHUB_SECRET")
 
 NAVER_SECRET = env("NAVER_SECRET")
 
+# 소셜 로그인 (users.oauth): ASGI 서버 이벤트 루프마다 keep-alive 커넥션 풀 하나를 같이 씀
+# (lifespan 에서 열고 닫음, 그 밖에서는 로그인마다 잠깐 쓰는 클라이언트)
+OAUTH_TIMEOUT = 5  # 초, 연결/응답 각각
+# 루프당 동시 provider 요청 수, httpx(httpcore) 풀은 커넥션이 20개를 넘으면 관리 비용이 급하게 늘어남 (load_test_oauth)
+OAUTH_MAX_CONNECTIONS = 20
+OAUTH_PROVIDERS = {
+    "github": {
+        "client_id": "4ff505a15275ca6c50a6",
+        "secret": GITHUB_SECRET,
+        "token_url": "https://github.com/login/oauth/access_token",
+        "api_url": "https://api.github.com",
+    },
+    "kakao": {
+        "client_id": "53fc0ecca4b497fbc215cf23e1b300fd",
+        "redirect_uri": "http://127.0.0.1:3000/social/kakao",
+        "token_url": "https://kauth.kakao.com/oauth/token",
+        "api_url": "https://kapi.kakao.com",
+    },
+    "naver": {
+        "client_id": "fpoOdeasfK9LdgkuknhQ",
+        "secret": NAVER_SECRET,
+        "token_url": "https://nid.naver.com/oauth2.0/token",
+        "api_url": "https://openapi.naver.com",
+    },
+}
+
+# ASGI lifespan startup / shutdown 때 부를 coroutine 함수 (common.asgi)
+ASGI_LIFESPAN = {
+    "startup": ["users.oauth.open_client"],
+    "shutdown": ["users.oauth.close_client"],
+}
+
 CLOUDFLARE_ID = env("CF_ID")
 
 CLOUDFLARE_TOKEN = env("CF_TOKEN")
 
+# 사진 업로드 주소 풀 (medias.uploads)
+CLOUDFLARE_API_URL = "https://api.cloudflare.com/client/v4"
+CLOUDFLARE_TIMEOUT = 5  # 초, 연결/응답 각각
+CLOUDFLARE_MAX_CONNECTIONS = 10
+CLOUDFLARE_UPLOAD_POOL_SIZE = 20  # 채울때 목표 개수
+CLOUDFLARE_UPLOAD_POOL_LOW = 5  # 이 아래로 내려가면 채움
+CLOUDFLARE_UPLOAD_URL_TTL = 30 * 60  # 초, 업로드 주소 유효 시간 (Cloudflare 기본값과 같음)
+CLOUDFLARE_UPLOAD_URL_MARGIN = 5 * 60  # 초, 이것보다 적게 남은 주소는 안 내줌
+
 if not DEBUG:
     SESSION_COOKIE_DOMAIN = ".airbnbclonejb.shop"
     CSRF_COOKIE_DOMAIN = ".airbnbclonejb.shop"
@@ -20,6 +20,7 @@ from django.conf.urls.static import static
 from django.conf import settings
 
 from rooms import views as room_views
+from common import views as common_views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -29,4 +30,6 @@ urlpatterns = [
     path("api/v1/medias/", include("medias.urls")),
     path("api/v1/wishlists/", include("wishlists.urls")),
     path("api/v1/users/", include("users.urls")),
+    path("api/v1/search/", include("search.urls")),
+    path("api/v1/metrics", common_views.Metrics.as_view()),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import ExchangeRate
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_display = (
+        "currency",
+        "rate",
+        "updated_at",
+    )
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class CurrenciesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'currencies'
+
+    def ready(self):
+        from .rates import connect_signals
+
+        connect_signals()
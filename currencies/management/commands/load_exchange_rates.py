@@ -0,0 +1,25 @@
+import json
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from currencies.models import ExchangeRate
+from currencies.rates import EXPONENTS
+
+
+class Command(BaseCommand):
+    help = '환율 JSON 파일 ({"usd": "0.00075"}) 을 ExchangeRate 테이블에 넣습니다. (cron 등으로 주기적으로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+
+    def handle(self, *args, **options):
+        with open(options["path"]) as file:
+            rates = json.load(file)
+        unknown = [currency for currency in rates if currency not in EXPONENTS]
+        if unknown:
+            raise CommandError(f"Unknown currency: {unknown}")
+        for currency, rate in rates.items():
+            ExchangeRate.objects.update_or_create(
+                currency=currency,
+                defaults={"rate": Decimal(str(rate))},
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(rates)} exchange rates loaded"))
@@ -0,0 +1,17 @@
+from django.db import models
+from common.models import CommonModel
+from users.models import User
+
+
+class ExchangeRate(CommonModel):
+    """기준 통화 (settings.PRICE_CURRENCY) 1 단위가 currency 로 얼마인지"""
+
+    currency = models.CharField(
+        max_length=5,
+        choices=User.CurrencyChoices.choices,
+        unique=True,
+    )
+    rate = models.DecimalField(max_digits=20, decimal_places=10)
+
+    def __str__(self):
+        return f"{self.currency} {self.rate}"
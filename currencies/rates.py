@@ -0,0 +1,190 @@
+"""
+가격 통화 변환
+
+Room.price, Experience.price 는 기준 통화 (settings.PRICE_CURRENCY, 원) 의 최소 단위 정수임.
+응답에는 price 를 그대로 두고 보는 사람 통화로 바꾼 local_price (문자열) 와 currency 를 붙임.
+보는 사람 통화는 ?currency= > User.currency > 기준 통화 순서.
+
+환율표는 프로세스마다 한번 읽어서 메모리에 두고 settings.EXCHANGE_RATE_TTL 초가 지나면 다시 읽음 (get_table).
+settings.EXCHANGE_RATES_FILE 이 있으면 그 JSON 파일 ({"usd": "0.00075"}), 없으면 ExchangeRate 테이블.
+환율이 없는 통화는 기준 통화로 보여줌.
+
+목록은 페이지마다 환율을 한번만 찾아서 고정소수점 정수 연산으로 한번에 바꾸고,
+가격 필터 (min_price, max_price) 는 보는 사람 통화 값을 기준 통화로 바꿔서 price 인덱스를 그대로 씀.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from rest_framework.exceptions import ParseError
+from users.models import User
+from .models import ExchangeRate
+
+# 통화별 소수 자리수 (최소 단위)
+EXPONENTS = {
+    User.CurrencyChoices.WON: 0,
+    User.CurrencyChoices.USD: 2,
+}
+# 환율을 정수로 바꿀때 곱하는 값 (소수 9자리까지)
+SCALE = 10**9
+
+
+class RateTable:
+    def __init__(self, rates):
+        self.rates = {settings.PRICE_CURRENCY: Decimal(1), **rates}
+        self.loaded_at = time.monotonic()
+        # 환율 값이 바뀌면 달라지는 값 (ETag 에 넣음)
+        self.version = hashlib.md5(repr(sorted(self.rates.items())).encode()).hexdigest()[:12]
+
+    def is_stale(self):
+        return time.monotonic() - self.loaded_at > settings.EXCHANGE_RATE_TTL
+
+    def resolve(self, currency):
+        return currency if currency in self.rates else settings.PRICE_CURRENCY
+
+    def convert(self, prices, currency):
+        """기준 통화 가격 목록 -> currency 로 바꾼 문자열 목록 (반올림)"""
+        exponent = EXPONENTS[currency]
+        # 기준 통화 1 단위가 currency 최소 단위로 몇인지를 SCALE 배 한 정수
+        scaled = int(self.rates[currency] * 10**exponent * SCALE)
+        half = SCALE // 2
+        minor = [(price * scaled + half) // SCALE for price in prices]
+        if not exponent:
+            return [str(amount) for amount in minor]
+        unit = 10**exponent
+        return [f"{amount // unit}.{amount % unit:0{exponent}d}" for amount in minor]
+
+    def to_canonical(self, amount, currency, round_up):
+        """currency 금액 (Decimal) -> 기준 통화 최소 단위 정수"""
+        value = amount / self.rates[currency]
+        return math.ceil(value) if round_up else math.floor(value)
+
+
+def load_rates():
+    if settings.EXCHANGE_RATES_FILE:
+        with open(settings.EXCHANGE_RATES_FILE) as file:
+            rates = json.load(file)
+    else:
+        rates = dict(ExchangeRate.objects.values_list("currency", "rate"))
+    return {
+        currency: Decimal(str(rate))
+        for currency, rate in rates.items()
+        if currency in EXPONENTS and Decimal(str(rate)) > 0
+    }
+
+
+_table = None
+
+
+def in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def get_table():
+    """
+    async view (common.aio) 에서는 DB 를 못 읽으니까 이미 읽은 환율표를 그대로 씀.
+    그 요청의 preload 에서 viewer_currency 를 부를때 (스레드) 새로 읽어둠.
+    """
+    global _table
+    if _table is None or (_table.is_stale() and not in_event_loop()):
+        _table = RateTable(load_rates())
+    return _table
+
+
+def clear(**kwargs):
+    """ExchangeRate 가 바뀌면 이 프로세스의 환율표를 다시 읽게 함"""
+    if _table is not None:
+        _table.loaded_at = -math.inf
+
+
+def connect_signals():
+    post_save.connect(clear, sender=ExchangeRate, dispatch_uid="currencies.clear")
+    post_delete.connect(clear, sender=ExchangeRate, dispatch_uid="currencies.clear_delete")
+
+
+def viewer_currency(request):
+    if request is None:
+        return settings.PRICE_CURRENCY
+    currency = request.query_params.get("currency")
+    if currency:
+        if currency not in EXPONENTS:
+            raise ParseError(f"currency should be one of {', '.join(EXPONENTS)}")
+    elif request.user.is_authenticated and request.user.currency:
+        currency = request.user.currency
+    else:
+        return settings.PRICE_CURRENCY
+    return get_table().resolve(currency)
+
+
+def price_validator(request):
+    """ETag (common.mixins.get_validator_extra) 에 넣는 값: 보는 사람 통화와 그 환율"""
+    currency = viewer_currency(request)
+    if currency == settings.PRICE_CURRENCY:
+        return [currency]
+    return [currency, get_table().version]
+
+
+def localize(items, context, fields=("price",)):
+    """직렬화된 dict 목록에 local_price, currency 를 붙임 (페이지 전체를 한번에)"""
+    if not items:
+        return items
+    currency = viewer_currency((context or {}).get("request"))
+    for field in fields:
+        prices = [item[field] for item in items]
+        if currency == settings.PRICE_CURRENCY:
+            # 기준 통화면 환율표를 볼 필요가 없음
+            amounts = [str(price) for price in prices]
+        else:
+            amounts = get_table().convert(prices, currency)
+        for item, amount in zip(items, amounts):
+            item[f"local_{field}"] = amount
+    for item in items:
+        item["currency"] = currency
+    return items
+
+
+def parse_amount(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ParseError(f"{name} should be a number")
+    if not amount.is_finite():
+        raise ParseError(f"{name} should be a number")
+    return amount
+
+
+def price_range(params, currency):
+    """min_price, max_price (currency 기준) -> 기준 통화 (low, high), 없으면 None"""
+    low = parse_amount(params, "min_price")
+    high = parse_amount(params, "max_price")
+    if low is None and high is None:
+        return None, None
+    if currency == settings.PRICE_CURRENCY:
+        table = RateTable({})
+    else:
+        table = get_table()
+    return (
+        None if low is None else table.to_canonical(low, currency, round_up=True),
+        None if high is None else table.to_canonical(high, currency, round_up=False),
+    )
+
+
+def filter_price(queryset, params, currency):
+    low, high = price_range(params, currency)
+    if low is not None:
+        queryset = queryset.filter(price__gte=low)
+    if high is not None:
+        queryset = queryset.filter(price__lte=high)
+    return queryset
@@ -0,0 +1,30 @@
+from rest_framework.serializers import ListSerializer
+from .rates import localize
+
+
+class LocalPriceListSerializer(ListSerializer):
+    """목록은 다 만든 다음에 페이지 전체 가격을 한번에 바꿈"""
+
+    def to_representation(self, data):
+        items = super().to_representation(data)
+        return self.child.localize_page(items)
+
+
+class LocalPriceMixin:
+    """
+    price_fields 마다 보는 사람 통화로 바꾼 local_xxx 와 currency 를 붙임 (currencies.rates)
+
+    Meta.list_serializer_class = LocalPriceListSerializer 와 같이 씀.
+    common.fast 의 FastSerializer 도 페이지를 만든 다음 localize_page 를 부름.
+    """
+
+    price_fields = ("price",)
+
+    def localize_page(self, items):
+        return localize(items, self.context, self.price_fields)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if not isinstance(self.parent, LocalPriceListSerializer):
+            self.localize_page([data])
+        return data
@@ -0,0 +1,80 @@
+import io
+import json
+import tempfile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rooms.models import Room
+from users.models import User
+from . import rates
+from .models import ExchangeRate
+
+
+class TestCurrencies(APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        cache.clear()
+        rates.clear()
+        self.user = User.objects.create(username="owner")
+        for name, price in (("a", 10000), ("b", 13335), ("c", 50000)):
+            Room.objects.create(
+                name=name,
+                price=price,
+                rooms=1,
+                toilets=1,
+                description="d",
+                address="addr",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.user,
+            )
+        ExchangeRate.objects.create(currency="usd", rate="0.00075")
+
+    def tearDown(self):
+        rates.clear()
+
+    def test_list_in_viewer_currency(self):
+        rooms = self.client.get(self.URL).json()
+        self.assertEqual([room["local_price"] for room in rooms], ["10000", "13335", "50000"])
+        self.assertEqual(rooms[0]["currency"], "won")
+
+        self.user.currency = "usd"
+        self.user.save()
+        self.client.force_login(self.user)
+        rooms = self.client.get(self.URL).json()
+        self.assertEqual([room["price"] for room in rooms], [10000, 13335, 50000])
+        self.assertEqual([room["local_price"] for room in rooms], ["7.50", "10.00", "37.50"])
+        self.assertEqual(rooms[0]["currency"], "usd")
+
+        room = self.client.get(f"{self.URL}{rooms[0]['pk']}").json()
+        self.assertEqual((room["local_price"], room["currency"]), ("7.50", "usd"))
+
+    def test_price_filter_in_viewer_currency(self):
+        response = self.client.get(f"{self.URL}?currency=usd&min_price=8&max_price=37.5")
+        self.assertEqual([room["name"] for room in response.json()], ["b", "c"])
+        response = self.client.get(f"{self.URL}?min_price=10001")
+        self.assertEqual([room["name"] for room in response.json()], ["b", "c"])
+        response = self.client.get(f"{self.URL}?currency=eur")
+        self.assertEqual(response.status_code, 400)
+
+    def test_rate_table_is_cached(self):
+        rates.get_table()
+        with self.assertNumQueries(0):
+            rates.get_table()
+        ExchangeRate.objects.filter(currency="usd").update(rate="0.001")
+        self.assertEqual(rates.get_table().convert([10000], "usd"), ["7.50"])
+        with override_settings(EXCHANGE_RATE_TTL=-1):
+            self.assertEqual(rates.get_table().convert([10000], "usd"), ["10.00"])
+
+    def test_rates_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as file:
+            json.dump({"usd": "0.0008"}, file)
+            file.flush()
+            with override_settings(EXCHANGE_RATES_FILE=file.name):
+                rates.clear()
+                self.assertEqual(rates.get_table().convert([10000], "usd"), ["8.00"])
+            rates.clear()
+            call_command("load_exchange_rates", file.name, stdout=io.StringIO())
+        self.assertEqual(str(ExchangeRate.objects.get(currency="usd").rate), "0.0008000000")
+        self.assertEqual(rates.get_table().convert([10000], "usd"), ["8.00"])
@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiences', '0004_experience_rating_sum_experience_review_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['created_at', 'id'], name='experiences_created_9874c7_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1 on 2026-10-18 19:33
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiences', '0005_experience_experiences_created_9874c7_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['geohash'], name='experiences_geohash_9fb88c_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.1 on 2026-10-18 19:40
+
+import bookings.dates
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiences', '0006_experience_geohash_experience_latitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='timezone',
+            field=models.CharField(default='Asia/Seoul', max_length=50, validators=[bookings.dates.validate_timezone]),
+        ),
+    ]
@@ -1,5 +1,7 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from common.models import CommonModel
+from bookings.dates import validate_timezone
 
 
 # Create your models here.
@@ -18,8 +20,14 @@ class Experience(CommonModel):
         on_delete=models.CASCADE,
         related_name="experiences",
     )
-    price = models.PositiveIntegerField()
+    price = models.PositiveIntegerField()  # 기준 통화 (settings.PRICE_CURRENCY) 최소 단위
     address = models.CharField(max_length=250)
+    # 예약 시간을 이 시간대 기준으로 정함 (bookings.dates)
+    timezone = models.CharField(
+        max_length=50,
+        default="Asia/Seoul",
+        validators=[validate_timezone],
+    )
     start = models.TimeField()
     end = models.TimeField()
     description = models.TextField()
@@ -34,6 +42,32 @@ class Experience(CommonModel):
         on_delete=models.SET_NULL,
         related_name="experiences",
     )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    # 위도/경도로 geo.signals 에서 채움 (위치 검색용, geo.queries)
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False)
+    # 리뷰가 저장/삭제될때 reviews.signals 에서 갱신됨 (rebuild_ratings 커맨드로 재계산 가능)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    # 대표 사진 (첫 사진) 과 사진 개수, 사진이 저장/삭제될때 medias.signals 에서 갱신됨
+    # (rebuild_covers 커맨드로 재계산 가능). 목록은 사진 대신 이것만 보냄
+    cover_photo = models.ForeignKey(
+        "medias.Photo",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
+    photo_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
@@ -42,14 +76,18 @@ class Experience(CommonModel):
         return self.experiences.count()
 
     def rating(experience):
-        count = experience.reviews.count()
-        if count == 0:
+        if experience.review_count == 0:
             return "리뷰 없음"
         else:
-            total_count = 0
-            for review in experience.reviews.all().values("rating"):
-                total_count += review["rating"]
-            return round(total_count / count, 2)
+            return round(experience.rating_sum / experience.review_count, 2)
+
+    class Meta:
+        indexes = [
+            # cursor 페이지네이션 (created_at, pk)
+            models.Index(fields=["created_at", "id"]),
+            # geohash 셀 범위 검색
+            models.Index(fields=["geohash"]),
+        ]
 
 
 class Perk(CommonModel):
@@ -1,9 +1,10 @@
 from rest_framework.serializers import ModelSerializer, SerializerMethodField
 from .models import Experience, Perk
-from medias.serializers import PhotoSerializer, VideoSerializer
+from medias.serializers import PhotoSerializer, ThumbnailSerializer, VideoSerializer
 from users.serializers import TinyUserSerializer
 from categories.serializers import CategorySerializer
-from wishlists.models import Wishlist
+from wishlists.liked import is_liked
+from currencies.serializers import LocalPriceListSerializer, LocalPriceMixin
 
 
 class PerkSerializer(ModelSerializer):
@@ -12,14 +13,20 @@ class PerkSerializer(ModelSerializer):
         fields = "__all__"
 
 
-class ExperienceListSerializer(ModelSerializer):
+class ExperienceListSerializer(LocalPriceMixin, ModelSerializer):
     rating = SerializerMethodField()
     is_host = SerializerMethodField()
-    photos = PhotoSerializer(many=True, read_only=True)
+    is_liked = SerializerMethodField()
+    # 사진은 대표 사진의 작은 사본과 개수만 (전체 사진과 srcset 은 상세에서)
+    cover_photo = ThumbnailSerializer(read_only=True)
     videos = VideoSerializer(read_only=True)
 
+    # common.fast 에서 .values() 로 읽을때 get_xxx 에서 쓰는 컬럼
+    row_columns = ("host_id", "rating_sum", "review_count")
+
     class Meta:
         model = Experience
+        list_serializer_class = LocalPriceListSerializer
         fields = (
             "id",
             "name",
@@ -28,7 +35,9 @@ class ExperienceListSerializer(ModelSerializer):
             "price",
             "rating",
             "is_host",
-            "photos",
+            "is_liked",
+            "cover_photo",
+            "photo_count",
             "videos",
         )
 
@@ -37,10 +46,13 @@ class ExperienceListSerializer(ModelSerializer):
 
     def get_is_host(self, experience):
         request = self.context["request"]
-        return experience.host == request.user
+        return experience.host_id == request.user.pk
 
+    def get_is_liked(self, experience):
+        return is_liked(self.context, "experiences", experience.pk)
 
-class ExperienceDetailSerializer(ModelSerializer):
+
+class ExperienceDetailSerializer(LocalPriceMixin, ModelSerializer):
     host = TinyUserSerializer(read_only=True)
     perks = PerkSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
@@ -54,7 +66,14 @@ class ExperienceDetailSerializer(ModelSerializer):
 
     class Meta:
         model = Experience
-        fields = "__all__"
+        list_serializer_class = LocalPriceListSerializer
+        exclude = (
+            "rating_sum",
+            "review_count",
+            "geohash",
+            "cover_photo",
+            "photo_count",
+        )
 
     def get_rating(self, experience):
         return experience.rating()
@@ -64,7 +83,4 @@ class ExperienceDetailSerializer(ModelSerializer):
         return experience.host == request.user
 
     def get_is_liked(self, experience):
-        request = self.context["request"]
-        return Wishlist.objects.filter(
-            user=request.user, experiences__pk=experience.pk
-        ).exists()
+        return is_liked(self.context, "experiences", experience.pk)
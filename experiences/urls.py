@@ -1,8 +1,19 @@
 from django.urls import path
+from geo.views import Nearby, WithinBox
+from .models import Experience
+from .serializers import ExperienceListSerializer
 from . import views
 
 urlpatterns = [
     path("", views.Experiences.as_view()),
+    path(
+        "nearby",
+        Nearby.as_view(model=Experience, serializer_class=ExperienceListSerializer),
+    ),
+    path(
+        "bbox",
+        WithinBox.as_view(model=Experience, serializer_class=ExperienceListSerializer),
+    ),
     path("<int:pk>/", views.ExperienceDetail.as_view()),
     path("<int:pk>/reviews", views.ExperienceReviews.as_view()),
     path("<int:pk>/perks", views.ExperiencePerks.as_view()),
@@ -1,3 +1,4 @@
+import asyncio
 from django.db import transaction
 from django.conf import settings
 from django.utils import timezone
@@ -12,29 +13,47 @@ from .serializers import (
     ExperienceDetailSerializer,
 )
 from .models import Perk, Experience
+from medias.models import Photo
+from common.pagination import CursorPagination
+from common.cache import cache_response
+from common.mixins import ConditionalGetMixin
+from common.m2m import get_related, assign_related
+from common.streaming import stream_response, wants_stream
+from common.fast import apaginated_response, list_data
+from common.aio import AsyncAPIView, aget_object, alist, set_prefetched
+from currencies.rates import price_validator
+from wishlists.liked import get_liked
+from rooms.views import ViewerMixin
 from bookings.models import Booking
 from categories.models import Category
 from reviews.serializers import ReviewSerializer
+from medias import variants
 from medias.serializers import PhotoSerializer, VideoSerializer
 from bookings.serializers import (
     PublicBookingSerializer,
     CreateExperienceBookingSerializer,
     UpdateExperienceBookingSerializer,
 )
-from datetime import datetime
 
 
-class Experiences(APIView):
+class Experiences(ViewerMixin, AsyncAPIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-    def get(self, request):
-        all_experiences = Experience.objects.all()
-        serializer = ExperienceListSerializer(
+    async def get(self, request):
+        all_experiences = Experience.objects.select_related("cover_photo")
+        if wants_stream(request):
+            return stream_response(
+                all_experiences.order_by("created_at", "pk"),
+                ExperienceListSerializer,
+                {"request": request},
+            )
+        return await apaginated_response(
+            CursorPagination(page_size=settings.CATALOG_PAGE_SIZE),
+            request,
             all_experiences,
-            many=True,
-            context={"request": request},
+            ExperienceListSerializer,
+            {"request": request},
         )
-        return Response(serializer.data)
 
     def post(self, request):
         serializer = ExperienceDetailSerializer(data=request.data)
@@ -62,18 +81,13 @@ class Experiences(APIView):
             #         return Response(ExperienceDetailSerializer(new_experience).data)
             # except Exception:
             #     raise ParseError("Perk Not Found!")
+            perks = get_related(Perk, request.data.get("perks"), "Perk")
             with transaction.atomic():
                 new_experience = serializer.save(
                     host=request.user,
                     category=category,
                 )
-                perks = request.data.get("perks")
-                for perk_pk in perks:
-                    try:
-                        perk = Perk.objects.get(pk=perk_pk)
-                    except Perk.DoesNotExist:
-                        raise ParseError("Perk not found")
-                    new_experience.perks.add(perk)
+                assign_related(new_experience.perks, perks)
 
                 return Response(
                     ExperienceDetailSerializer(
@@ -85,8 +99,26 @@ class Experiences(APIView):
             return Response(serializer.errors)
 
 
-class ExperienceDetail(APIView):
+class ExperienceDetail(ViewerMixin, ConditionalGetMixin, AsyncAPIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
+    validator_model = Experience
+    # host, reviews__user: 응답에 들어가는 프로필 (User.updated_at)
+    validator_relations = (
+        "category",
+        "perks",
+        "photos",
+        "videos",
+        "reviews",
+        "host",
+        "reviews__user",
+    )
+
+    def get_validator_extra(self, request, pk):
+        return [
+            request.user.pk,
+            pk in get_liked(request)["experiences"],
+            *price_validator(request),
+        ]
 
     def get_object(self, pk):
         try:
@@ -95,8 +127,17 @@ class ExperienceDetail(APIView):
             raise NotFound
         return experience
 
-    def get(self, request, pk):
-        experience = self.get_object(pk)
+    async def get(self, request, pk):
+        # 체험 (host, category, videos 는 JOIN), perks, 사진을 같이 기다림
+        experience, perks, photos = await asyncio.gather(
+            aget_object(
+                Experience.objects.select_related("host", "category", "videos"),
+                pk=pk,
+            ),
+            alist(Perk.objects.filter(experiences=pk)),
+            alist(Photo.objects.filter(experience=pk)),
+        )
+        set_prefetched(experience, perks=perks, photos=photos)
         serializer = ExperienceDetailSerializer(
             experience, context={"request": request}
         )
@@ -120,6 +161,7 @@ class ExperienceDetail(APIView):
                         raise ParseError("Category kind should be 'experiences'")
                 except Category.DoesNotExist:
                     raise ParseError("Category not found")
+            perks = get_related(Perk, request.data.get("perks"), "Perk")
             with transaction.atomic():
                 if category_pk:
                     updated_experience = serializer.save(
@@ -128,12 +170,8 @@ class ExperienceDetail(APIView):
                 else:
                     updated_experience = serializer.save()
 
-                perks = request.data.get("perks")
                 if perks:
-                    updated_experience.perks.clear()
-                    for perk_pk in perks:
-                        perk = Perk.objects.get(pk=perk_pk)
-                        updated_experience.perks.add(perk)
+                    assign_related(updated_experience.perks, perks, replace=True)
                 return Response(
                     ExperienceDetailSerializer(
                         updated_experience,
@@ -151,50 +189,27 @@ class ExperienceDetail(APIView):
         return Response(status=HTTP_204_NO_CONTENT)
 
 
-class ExperiencePerks(APIView):
-    def get_object(self, pk):
-        try:
-            experience = Experience.objects.get(pk=pk)
-        except Experience.DoesNotExist:
-            raise NotFound
-        return experience
-
-    def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-        experience = self.get_object(pk)
-        serializer = PerkSerializer(experience.perks.all()[start:end], many=True)
-        return Response(serializer.data)
+class ExperiencePerks(AsyncAPIView):
+    @cache_response("perks")
+    async def get(self, request, pk):
+        experience = await aget_object(Experience.objects.all(), pk=pk)
+        return await apaginated_response(
+            CursorPagination(),
+            request,
+            experience.perks.all(),
+            PerkSerializer,
+        )
 
 
-class ExperienceReviews(APIView):
-    def get_object(self, pk):
-        try:
-            experience = Experience.objects.get(pk=pk)
-        except Experience.DoesNotExist:
-            raise NotFound
-        return experience
-
-    def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-        experience = self.get_object(pk)
-        serializer = ReviewSerializer(experience.reviews.all()[start:end], many=True)
-        return Response(serializer.data)
+class ExperienceReviews(AsyncAPIView):
+    async def get(self, request, pk):
+        experience = await aget_object(Experience.objects.all(), pk=pk)
+        return await apaginated_response(
+            CursorPagination(),
+            request,
+            experience.reviews.select_related("user"),
+            ReviewSerializer,
+        )
 
 
 class ExperiencePhotos(APIView):
@@ -212,7 +227,11 @@ class ExperiencePhotos(APIView):
             raise PermissionDenied
         serializer = PhotoSerializer(data=request.data)
         if serializer.is_valid():
-            photo = serializer.save(experience=experience)
+            # 크기별 사본을 기록하거나 만들어서 같이 저장 (medias.variants)
+            photo = serializer.save(
+                experience=experience,
+                variants=variants.make(serializer.validated_data["file"]),
+            )
             serializer = PhotoSerializer(photo)
             return Response(serializer.data)
         else:
@@ -252,21 +271,20 @@ class ExperienceBookings(APIView):
 
     def get(self, request, pk):
         experience = self.get_object(pk)
-        now = timezone.localtime(timezone.now())
+        # 시작 시간은 시간대가 있는 값이라 서버/체험 시간대와 상관없이 지금과 바로 비교됨
         bookings = Booking.objects.filter(
             experience=experience,
             kind=Booking.BookingKindChoices.EXPERIENCE,
-            experience_time_start__gt=now,
-        )
-        serializer = PublicBookingSerializer(
-            bookings,
-            many=True,
-        )
-        return Response(serializer.data)
+            experience_time_start__gt=timezone.now(),
+        ).order_by("experience_time_start")
+        return Response(list_data(bookings, PublicBookingSerializer))
 
     def post(self, request, pk):
         experience = self.get_object(pk)
-        serializer = CreateExperienceBookingSerializer(data=request.data)
+        serializer = CreateExperienceBookingSerializer(
+            data=request.data,
+            context={"experience": experience},
+        )
         if serializer.is_valid():
             new_booking = serializer.save(
                 user=request.user,
@@ -304,6 +322,7 @@ class ExperienceBookingDetail(APIView):
         serializer = UpdateExperienceBookingSerializer(
             booking,
             data=request.data,
+            context={"experience": experience},
             # partial=True,
         )
         if serializer.is_valid():
@@ -322,6 +341,7 @@ class ExperienceBookingDetail(APIView):
 
 
 class Perks(APIView):
+    @cache_response("perks")
     def get(self, request):
         all_perks = Perk.objects.all()
         serializer = PerkSerializer(all_perks, many=True)
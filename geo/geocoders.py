@@ -0,0 +1,45 @@
+"""
+주소 -> (위도, 경도)
+
+settings.GEOCODER 에 적힌 클래스를 씀. geocode() 가 못 찾으면 None.
+외부 서비스 (카카오/구글 등) 를 붙일때는 같은 모양의 클래스를 만들어서 GEOCODER 만 바꾸면 됨.
+"""
+
+import hashlib
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class StubGeocoder:
+    """
+    네트워크 없이 쓰는 로컬 geocoder
+
+    아는 도시면 도시 중심에서 주소 문자열로 정해지는 만큼 (최대 약 5km) 옮긴 좌표를 돌려줌.
+    같은 주소는 항상 같은 좌표라서 테스트/개발용 데이터에 쓸수 있음.
+    """
+
+    CITIES = {
+        "서울": (37.5665, 126.9780),
+        "부산": (35.1796, 129.0756),
+        "인천": (37.4563, 126.7052),
+        "대구": (35.8714, 128.6014),
+        "대전": (36.3504, 127.3845),
+        "광주": (35.1595, 126.8526),
+        "울산": (35.5384, 129.3114),
+        "제주": (33.4996, 126.5312),
+        "강릉": (37.7519, 128.8761),
+    }
+    SPREAD = 0.045  # 도
+
+    def geocode(self, address, city="", country=""):
+        center = self.CITIES.get((city or "").strip())
+        if center is None:
+            return None
+        digest = hashlib.md5(f"{country}|{city}|{address}".encode()).digest()
+        lat_offset = (digest[0] / 255 - 0.5) * 2 * self.SPREAD
+        lng_offset = (digest[1] / 255 - 0.5) * 2 * self.SPREAD
+        return round(center[0] + lat_offset, 6), round(center[1] + lng_offset, 6)
+
+
+def get_geocoder():
+    return import_string(settings.GEOCODER)()
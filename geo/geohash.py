@@ -0,0 +1,98 @@
+"""
+geohash 인코딩과 영역을 덮는 셀 목록
+
+geohash 는 앞글자가 같을수록 가까운 위치라서, 셀 하나 = geohash 문자열 범위 [셀, 셀 + "{") 임.
+PostGIS 없이 일반 B-tree 인덱스의 범위 검색으로 근처 후보를 좁힐수 있음.
+"""
+
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# BASE32 의 어떤 글자보다 큰 글자 (범위 끝)
+AFTER = "{"
+PRECISION = 9  # 약 5m
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            target, bounds = longitude, lng_range
+        else:
+            target, bounds = latitude, lat_range
+        middle = (bounds[0] + bounds[1]) / 2
+        if target >= middle:
+            value = value * 2 + 1
+            bounds[0] = middle
+        else:
+            value = value * 2
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """(위도 높이, 경도 너비) 도 단위"""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180 / 2**lat_bits, 360 / 2**lng_bits
+
+
+def cover(south, west, north, east, max_cells=32):
+    """
+    [south, north] x [west, east] 상자를 덮는 geohash 셀들
+
+    셀이 max_cells 개 이하가 되는 가장 작은 셀 크기를 고름.
+    """
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor(north / height) - math.floor(south / height) + 1
+        columns = math.floor(east / width) - math.floor(west / width) + 1
+        if rows * columns <= max_cells or precision == 1:
+            break
+    cells = set()
+    for row in range(rows):
+        latitude = min(south + row * height, north)
+        for column in range(columns):
+            longitude = min(west + column * width, east)
+            cells.add(encode(latitude, longitude, precision))
+    # 가장자리가 마지막 칸 중간에 걸리는 경우
+    for latitude in (south, north):
+        for longitude in (west, east):
+            cells.add(encode(latitude, longitude, precision))
+    return sorted(cells)
+
+
+def radius_box(latitude, longitude, radius_km):
+    """중심에서 radius_km 안쪽을 모두 포함하는 (south, west, north, east)"""
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos = max(math.cos(math.radians(latitude)), 0.01)
+    lng_delta = min(radius_km / (KM_PER_DEGREE * cos), 180)
+    return (
+        max(latitude - lat_delta, -90),
+        max(longitude - lng_delta, -180),
+        min(latitude + lat_delta, 90),
+        min(longitude + lng_delta, 180),
+    )
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """두 지점 사이 거리 (km)"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from common.cache import invalidate
+from experiences.models import Experience
+from geo.geocoders import get_geocoder
+from geo.signals import set_geohash
+from rooms.models import Room
+
+MODELS = {"rooms": Room, "experiences": Experience}
+
+
+class Command(BaseCommand):
+    help = "좌표가 없는 방/체험의 주소를 geocoder (settings.GEOCODER) 로 좌표로 바꿔서 채웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=MODELS, help="기본은 둘다")
+        parser.add_argument("--force", action="store_true", help="좌표가 있어도 다시 계산")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        geocoder = get_geocoder()
+        batch_size = options["batch_size"]
+        for name, model in MODELS.items():
+            if options["model"] and options["model"] != name:
+                continue
+            queryset = model.objects.order_by("pk").only(
+                "pk", "address", "city", "country", "latitude", "longitude", "geohash"
+            )
+            if not options["force"]:
+                queryset = queryset.filter(latitude__isnull=True)
+            updated = missed = 0
+            batch = []
+            for instance in queryset.iterator(chunk_size=batch_size):
+                location = geocoder.geocode(instance.address, instance.city, instance.country)
+                if location is None:
+                    missed += 1
+                    continue
+                instance.latitude, instance.longitude = location
+                set_geohash(instance)
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    updated += self.save(model, batch)
+                    batch = []
+            updated += self.save(model, batch)
+            if updated:
+                invalidate("rooms")
+            self.stdout.write(
+                self.style.SUCCESS(f"{name}: {updated} geocoded, {missed} not found")
+            )
+
+    def save(self, model, batch):
+        # bulk_update 는 signal 을 안 보내서 geohash 는 위에서 직접 채움
+        model.objects.bulk_update(batch, ["latitude", "longitude", "geohash"])
+        return len(batch)
@@ -0,0 +1,51 @@
+"""
+위치 검색 queryset
+
+geohash 셀 범위로 인덱스에서 후보를 좁히고, 위도/경도로 정확하게 자른 다음
+equirectangular 근사 거리 (사칙연산만 써서 SQLite 에서도 됨) 로 정렬함.
+반경 수십 km 안에서는 haversine 과 거의 같음. 날짜변경선(경도 ±180) 을 넘는 검색은 지원 안함.
+"""
+
+import math
+from django.db.models import ExpressionWrapper, F, FloatField, Q
+from .geohash import AFTER, KM_PER_DEGREE, cover, radius_box
+
+
+def in_cells(cells):
+    condition = Q()
+    for cell in cells:
+        condition |= Q(geohash__gte=cell, geohash__lt=cell + AFTER)
+    return condition
+
+
+def within_box(queryset, south, west, north, east):
+    return queryset.filter(
+        in_cells(cover(south, west, north, east)),
+        latitude__gte=south,
+        latitude__lte=north,
+        longitude__gte=west,
+        longitude__lte=east,
+    )
+
+
+def with_distance(queryset, latitude, longitude):
+    """(latitude, longitude) 까지 거리의 제곱을 distance_sq (도^2) 로 붙임"""
+    cos = math.cos(math.radians(latitude))
+    dy = F("latitude") - latitude
+    dx = (F("longitude") - longitude) * cos
+    return queryset.annotate(
+        distance_sq=ExpressionWrapper(dy * dy + dx * dx, output_field=FloatField())
+    )
+
+
+def nearby(queryset, latitude, longitude, radius_km):
+    queryset = with_distance(
+        within_box(queryset, *radius_box(latitude, longitude, radius_km)),
+        latitude,
+        longitude,
+    )
+    return queryset.filter(distance_sq__lte=(radius_km / KM_PER_DEGREE) ** 2)
+
+
+def distance_km(distance_sq):
+    return round(math.sqrt(distance_sq) * KM_PER_DEGREE, 3)
@@ -0,0 +1,18 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from experiences.models import Experience
+from rooms.models import Room
+from .geohash import encode
+
+
+def set_geohash(instance):
+    if instance.latitude is None or instance.longitude is None:
+        instance.geohash = ""
+    else:
+        instance.geohash = encode(instance.latitude, instance.longitude)
+
+
+@receiver(pre_save, sender=Room)
+@receiver(pre_save, sender=Experience)
+def update_geohash(sender, instance, **kwargs):
+    set_geohash(instance)
@@ -0,0 +1,129 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APITestCase
+from experiences.models import Experience
+from rooms.models import Room
+from users.models import User
+from . import geohash
+from .queries import nearby
+
+SEOUL_CITY_HALL = (37.5663, 126.9779)
+
+
+class TestGeohash(APITestCase):
+    def test_encode(self):
+        self.assertEqual(geohash.encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(geohash.encode(*SEOUL_CITY_HALL, 5), "wydm9")
+
+    def test_cover_contains_box(self):
+        box = (37.50, 126.90, 37.60, 127.05)
+        cells = geohash.cover(*box)
+        self.assertLessEqual(len(cells), 32)
+        for latitude in (37.50, 37.55, 37.60):
+            for longitude in (126.90, 126.97, 127.05):
+                code = geohash.encode(latitude, longitude)
+                self.assertTrue(any(code.startswith(cell) for cell in cells))
+
+    def test_haversine(self):
+        busan = (35.1796, 129.0756)
+        self.assertAlmostEqual(geohash.haversine(*SEOUL_CITY_HALL, *busan), 325, delta=3)
+
+
+class TestNearby(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="host")
+        # 시청에서 북쪽으로 약 1km, 3km, 8km
+        self.rooms = [
+            self.create_room(f"{km}km", SEOUL_CITY_HALL[0] + km / 111.32, SEOUL_CITY_HALL[1])
+            for km in (3, 1, 8)
+        ]
+        self.create_room("no location", None, None)
+
+    def create_room(self, name, latitude, longitude):
+        return Room.objects.create(
+            name=name,
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=self.user,
+            latitude=latitude,
+            longitude=longitude,
+        )
+
+    def test_nearby_sorted_by_distance(self):
+        response = self.client.get(
+            "/api/v1/rooms/nearby",
+            {"lat": SEOUL_CITY_HALL[0], "lng": SEOUL_CITY_HALL[1], "radius": 5},
+        )
+        self.assertEqual(response.status_code, 200)
+        rooms = response.json()
+        self.assertEqual([room["name"] for room in rooms], ["1km", "3km"])
+        self.assertAlmostEqual(rooms[0]["distance"], 1, places=2)
+
+    def test_bbox(self):
+        response = self.client.get(
+            "/api/v1/rooms/bbox",
+            {"south": 37.55, "north": 37.65, "west": 126.9, "east": 127.0},
+        )
+        self.assertEqual(
+            [room["name"] for room in response.json()],
+            ["3km", "1km", "8km"],
+        )
+
+    def test_geohash_follows_location(self):
+        room = self.rooms[0]
+        self.assertEqual(room.geohash, geohash.encode(room.latitude, room.longitude))
+        room.latitude = None
+        room.save()
+        self.assertEqual(room.geohash, "")
+
+    def test_invalid_params(self):
+        response = self.client.get("/api/v1/rooms/nearby", {"lat": "north", "lng": 1})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/v1/rooms/nearby", {"lat": 1, "lng": 1, "radius": 500})
+        self.assertEqual(response.status_code, 400)
+
+    def test_uses_geohash_index(self):
+        queryset = nearby(Room.objects.all(), *SEOUL_CITY_HALL, 5)
+        if connection.vendor == "sqlite":
+            self.assertIn("rooms_room_geohash", queryset.explain())
+
+
+class TestBackfill(APITestCase):
+    def test_backfill_with_stub_geocoder(self):
+        user = User.objects.create(username="host")
+        room = Room.objects.create(
+            name="room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="세종대로 110",
+            city="서울",
+            owner=user,
+        )
+        unknown = Experience.objects.create(
+            name="tour",
+            host=user,
+            price=1,
+            address="somewhere",
+            city="Atlantis",
+            start="09:00",
+            end="10:00",
+            description="desc",
+        )
+        call_command("backfill_geo", stdout=StringIO())
+        room.refresh_from_db()
+        unknown.refresh_from_db()
+        self.assertAlmostEqual(room.latitude, 37.5665, delta=0.05)
+        self.assertEqual(room.geohash, geohash.encode(room.latitude, room.longitude))
+        self.assertIsNone(unknown.latitude)
+
+        response = self.client.get(
+            "/api/v1/rooms/nearby",
+            {"lat": room.latitude, "lng": room.longitude, "radius": 1},
+        )
+        self.assertEqual([item["pk"] for item in response.json()], [room.pk])
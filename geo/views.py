@@ -0,0 +1,77 @@
+import math
+from django.conf import settings
+from rest_framework.views import APIView
+from rest_framework.exceptions import ParseError
+from common.fast import FastSerializer
+from common.pagination import CursorPagination
+from .queries import distance_km, nearby, with_distance, within_box
+
+
+def parse_coordinate(request, name, limit, default=None):
+    value = request.query_params.get(name)
+    if value is None and default is not None:
+        return default
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ParseError(f"{name} should be a number")
+    if not math.isfinite(value) or abs(value) > limit:
+        raise ParseError(f"{name} should be between -{limit} and {limit}")
+    return value
+
+
+class GeoList(APIView):
+    """
+    위치 검색 목록 (거리순 cursor 페이지, 항목마다 distance km 추가)
+
+    urls 에서 as_view(model=..., serializer_class=...) 로 방/체험에 씀.
+    """
+
+    model = None
+    serializer_class = None
+
+    def get_page(self, request, queryset):
+        fast = FastSerializer(self.serializer_class, {"request": request})
+        paginator = CursorPagination(
+            ordering=("distance_sq", "pk"),
+            page_size=settings.CATALOG_PAGE_SIZE,
+        )
+        page = paginator.paginate_queryset(
+            fast.values(queryset, "distance_sq", "pk"),
+            request,
+        )
+        data = fast.serialize(page)
+        for item, row in zip(data, page):
+            item["distance"] = distance_km(row["distance_sq"])
+        return paginator.get_paginated_response(data)
+
+
+class Nearby(GeoList):
+    """?lat=&lng=&radius=(km, 기본 5) 안쪽"""
+
+    def get(self, request):
+        latitude = parse_coordinate(request, "lat", 90)
+        longitude = parse_coordinate(request, "lng", 180)
+        radius = parse_coordinate(request, "radius", settings.GEO_MAX_RADIUS_KM, 5.0)
+        if radius <= 0:
+            raise ParseError("radius should be positive")
+        return self.get_page(
+            request,
+            nearby(self.model.objects.all(), latitude, longitude, radius),
+        )
+
+
+class WithinBox(GeoList):
+    """?south=&west=&north=&east= 안쪽 (지도 화면), lat/lng 가 없으면 가운데부터 거리순"""
+
+    def get(self, request):
+        south = parse_coordinate(request, "south", 90)
+        north = parse_coordinate(request, "north", 90)
+        west = parse_coordinate(request, "west", 180)
+        east = parse_coordinate(request, "east", 180)
+        if south > north or west > east:
+            raise ParseError("south/west should be smaller than north/east")
+        latitude = parse_coordinate(request, "lat", 90, (south + north) / 2)
+        longitude = parse_coordinate(request, "lng", 180, (west + east) / 2)
+        queryset = within_box(self.model.objects.all(), south, west, north, east)
+        return self.get_page(request, with_distance(queryset, latitude, longitude))
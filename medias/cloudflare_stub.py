@@ -0,0 +1,125 @@
+"""
+테스트 / 부하 테스트용 로컬 Cloudflare Images stub 서버
+
+direct_upload API 만 흉내냄. 토큰이 맞으면 일회용 업로드 주소를 주고 delay 초 만큼 늦게 응답함.
+fail 이 True 면 Cloudflare 처럼 success: false 로 응답함.
+
+    with StubCloudflareServer(delay=0.1) as server:
+        with override_settings(**server.settings()):
+            ...
+"""
+
+import json
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ACCOUNT_ID = "stub-account"
+TOKEN = "stub-token"
+
+
+class Handler(BaseHTTPRequestHandler):
+    # keep-alive (Content-Length 를 항상 보냄)
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_form(self):
+        """multipart/form-data 본문 -> {이름: 값}"""
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        content_type = self.headers.get("Content-Type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return {}
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        return {
+            part.get_param("name", header="content-disposition"): part.get_content()
+            for part in message.iter_parts()
+        }
+
+    def do_POST(self):
+        server = self.server
+        form = self.read_form()
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.expiries.append(form.get("expiry"))
+        try:
+            time.sleep(server.delay)
+            if self.path != f"/client/v4/accounts/{ACCOUNT_ID}/images/v2/direct_upload":
+                self.send_json({"success": False, "errors": [{"code": 7003}]}, 404)
+            elif self.headers.get("Authorization") != f"Bearer {TOKEN}":
+                self.send_json({"success": False, "errors": [{"code": 10000}]}, 401)
+            elif server.fail:
+                self.send_json(
+                    {"result": None, "success": False, "errors": [{"code": 5400}], "messages": []}
+                )
+            else:
+                image_id = str(uuid.uuid4())
+                self.send_json(
+                    {
+                        "result": {
+                            "id": image_id,
+                            "uploadURL": f"{server.url}/upload/{image_id}",
+                        },
+                        "success": True,
+                        "errors": [],
+                        "messages": [],
+                    }
+                )
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+class StubCloudflareServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, delay=0.0, fail=False):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.delay = delay
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # 받은 expiry 값 (요청 순서)
+        self.expiries = []
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def settings(self):
+        """override_settings 에 넘길 Cloudflare 설정"""
+        return {
+            "CLOUDFLARE_API_URL": f"{self.url}/client/v4",
+            "CLOUDFLARE_ID": ACCOUNT_ID,
+            "CLOUDFLARE_TOKEN": TOKEN,
+        }
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
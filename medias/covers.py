@@ -0,0 +1,49 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from rooms.models import Room
+from experiences.models import Experience
+from .models import Photo
+
+# Photo 의 FK 이름 -> 대표 사진 (cover_photo), photo_count 를 저장하는 모델
+COVERED_MODELS = {
+    "room": Room,
+    "experience": Experience,
+}
+
+
+def cover_columns(field):
+    """대표 사진 (Photo.Meta.ordering 의 첫 사진) 과 사진 개수를 계산하는 서브쿼리 (UPDATE 에 씀)"""
+    photos = Photo.objects.filter(**{field: OuterRef("pk")})
+    return {
+        "cover_photo": Subquery(photos.values("pk")[:1]),
+        "photo_count": Coalesce(
+            Subquery(
+                photos.order_by()
+                .values(field)
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            Value(0),
+            output_field=IntegerField(),
+        ),
+    }
+
+
+def refresh_cover(field, pk):
+    """사진 테이블에서 한 방/체험의 cover_photo, photo_count 를 다시 계산해서 저장"""
+    if pk is None:
+        return
+    COVERED_MODELS[field].objects.filter(pk=pk).update(**cover_columns(field))
+
+
+def rebuild_covers(field=None, pks=None):
+    """방/체험의 대표 사진 컬럼을 모델당 UPDATE 한번으로 다시 계산 (pks: 그 방/체험만)"""
+    updated = {}
+    for name, model in COVERED_MODELS.items():
+        if field and field != name:
+            continue
+        queryset = model.objects.all()
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks)
+        updated[model._meta.label] = queryset.update(**cover_columns(name))
+    return updated
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from common.cache import invalidate
+from medias import variants
+from medias.models import Photo
+
+
+class Command(BaseCommand):
+    help = (
+        "크기별 사본 (settings.PHOTO_VARIANTS) 이 없는 사진의 variants 를 채웁니다. "
+        "Cloudflare Images 주소는 기록만 하고 MEDIA_ROOT 의 사진은 스레드 풀에서 만듬."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="variants 가 있어도 다시 만듬")
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        queryset = Photo.objects.order_by("pk").only("pk", "file", "variants", "updated_at")
+        if not options["force"]:
+            queryset = queryset.filter(variants={})
+        updated = skipped = 0
+        batch = []
+        for photo in queryset.iterator(chunk_size=options["batch_size"]):
+            batch.append((photo, variants.submit(photo.file)))
+            if len(batch) >= options["batch_size"]:
+                done = self.save(batch)
+                updated += done
+                skipped += len(batch) - done
+                batch = []
+        done = self.save(batch)
+        updated += done
+        skipped += len(batch) - done
+        if updated:
+            invalidate("rooms")
+        self.stdout.write(
+            self.style.SUCCESS(f"{updated} photos updated, {skipped} without variants")
+        )
+
+    def save(self, batch):
+        # 한 batch 의 사진은 풀에서 같이 만들어지고 여기서 끝나기를 기다림
+        photos = []
+        now = timezone.now()
+        for photo, future in batch:
+            photo.variants = future.result()
+            if photo.variants:
+                photo.updated_at = now
+                photos.append(photo)
+        # bulk_update 는 auto_now 를 안 채워서 ETag (common.mixins) 가 바뀌도록 직접 넣음
+        Photo.objects.bulk_update(photos, ["variants", "updated_at"])
+        return len(photos)
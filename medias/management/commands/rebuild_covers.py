@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from common.cache import invalidate
+from medias.covers import rebuild_covers
+
+
+class Command(BaseCommand):
+    help = "medias.Photo 테이블에서 Room/Experience 의 cover_photo, photo_count 를 다시 계산합니다. (bulk import 후에 실행)"
+
+    def handle(self, *args, **options):
+        for label, count in rebuild_covers().items():
+            self.stdout.write(self.style.SUCCESS(f"{label}: {count} rows updated"))
+        invalidate("rooms")
@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 20:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medias', '0006_photo_variants'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='photo',
+            options={'ordering': ('pk',)},
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.1 on 2026-10-18 20:23
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def backfill_covers(apps, schema_editor):
+    Photo = apps.get_model('medias', 'Photo')
+    for field, label in (('room', 'rooms.Room'), ('experience', 'experiences.Experience')):
+        model = apps.get_model(label)
+        # 첫 사진 = pk 가 제일 작은 사진 (Photo.Meta.ordering)
+        stats = (
+            Photo.objects.filter(**{f'{field}__isnull': False})
+            .order_by()
+            .values(field)
+            .annotate(cover=Min('pk'), count=Count('pk'))
+        )
+        for row in stats:
+            model.objects.filter(pk=row[field]).update(
+                cover_photo=row['cover'],
+                photo_count=row['count'],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medias', '0007_photo_ordering'),
+        ('rooms', '0011_room_cover_photo'),
+        ('experiences', '0008_experience_cover_photo'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_covers, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,8 @@ class Photo(CommonModel):
     description = models.CharField(
         max_length=140,
     )
+    # 크기별 사본 {"thumbnail": {"url": ..., "width": 320}, ...} (medias.variants)
+    variants = models.JSONField(default=dict, blank=True)
     room = models.ForeignKey(
         "rooms.Room",
         on_delete=models.CASCADE,
@@ -26,6 +28,10 @@ class Photo(CommonModel):
     def __str__(self):
         return f"Photo File"
 
+    class Meta:
+        # 올린 순서, 첫 사진이 방/체험의 대표 사진 (medias.covers)
+        ordering = ("pk",)
+
 
 class Video(CommonModel):
     file = models.URLField()
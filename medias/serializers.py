@@ -1,16 +1,49 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
 from .models import Photo, Video
+from .variants import srcset, variant_url
 
 
 class PhotoSerializer(ModelSerializer):
+    srcset = SerializerMethodField()
+
+    # common.fast 에서 .values() 로 읽을때 get_xxx 에서 쓰는 컬럼
+    row_columns = ("variants",)
+
     class Meta:
         model = Photo
         fields = (
             "pk",
             "file",
             "description",
+            "srcset",
+        )
+
+    def get_srcset(self, photo):
+        return srcset(photo.variants)
+
+
+class ThumbnailSerializer(ModelSerializer):
+    """
+    목록용: 대표 사진 (cover_photo) 의 thumbnail 주소
+
+    사본이 없는 사진 (외부 주소, 만들기 전) 은 원본 주소
+    """
+
+    url = SerializerMethodField()
+
+    row_columns = ("file", "variants")
+
+    class Meta:
+        model = Photo
+        fields = (
+            "pk",
+            "url",
+            "description",
         )
 
+    def get_url(self, photo):
+        return variant_url(photo.variants, "thumbnail") or photo.file
+
 
 class VideoSerializer(ModelSerializer):
     class Meta:
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .covers import COVERED_MODELS, refresh_cover
+from .models import Photo
+
+
+@receiver(pre_save, sender=Photo)
+def remember_covered_objects(sender, instance, **kwargs):
+    # 사진의 방/체험이 바뀌면 (admin 등) 예전 대상도 다시 계산해야함
+    instance._previous_targets = {}
+    if instance.pk:
+        instance._previous_targets = (
+            Photo.objects.filter(pk=instance.pk)
+            .values(*[f"{field}_id" for field in COVERED_MODELS])
+            .first()
+            or {}
+        )
+
+
+@receiver(post_save, sender=Photo)
+def update_cover_on_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_targets", {})
+    for field in COVERED_MODELS:
+        pk = getattr(instance, f"{field}_id")
+        refresh_cover(field, pk)
+        if previous.get(f"{field}_id") not in (None, pk):
+            refresh_cover(field, previous[f"{field}_id"])
+
+
+@receiver(post_delete, sender=Photo)
+def update_cover_on_delete(sender, instance, **kwargs):
+    for field in COVERED_MODELS:
+        refresh_cover(field, getattr(instance, f"{field}_id"))
@@ -1,3 +1,272 @@
-from django.test import TestCase
+import io
+import tempfile
+import time
+from pathlib import Path
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APITestCase
+from common import metrics
+from experiences.models import Experience
+from rooms.models import Room
+from users.models import User
+from . import uploads, variants
+from .cloudflare_stub import StubCloudflareServer
+from .models import Photo
 
-# Create your tests here.
+URL = "/api/v1/medias/photos/get-url"
+
+
+class TestGetUploadURL(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StubCloudflareServer(delay=0.01).__enter__()
+        cls.settings = override_settings(
+            CLOUDFLARE_UPLOAD_POOL_SIZE=4,
+            CLOUDFLARE_UPLOAD_POOL_LOW=2,
+            **cls.server.settings(),
+        )
+        cls.settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        cls.server.__exit__()
+        super().tearDownClass()
+
+    def setUp(self):
+        uploads.reset()
+        metrics.reset()
+        self.server.fail = False
+        self.server.requests = 0
+        self.server.expiries = []
+
+    def tearDown(self):
+        uploads.reset()
+
+    def wait_for_depth(self, depth):
+        pool = uploads.get_pool()
+        for _ in range(200):
+            if len(pool.urls) == depth:
+                return pool
+            time.sleep(0.01)
+        self.fail(f"pool depth {len(pool.urls)} != {depth}")
+
+    def test_first_request_mints_and_fills_pool(self):
+        response = self.client.post(URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["uploadURL"].startswith(f"{self.server.url}/upload/"))
+        self.assertEqual(metrics.snapshot()["counters"]["uploads.pool.miss"], 1)
+
+        self.wait_for_depth(4)
+        self.assertEqual(self.server.requests, 5)
+        # expiry 는 Cloudflare 형식 (UTC) 으로 보냄
+        self.assertRegex(self.server.expiries[0], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ$")
+
+    def test_serves_from_pool(self):
+        uploads.get_pool().start()
+        self.wait_for_depth(4)
+        ids = {self.client.post(URL).json()["id"] for _ in range(2)}
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(self.server.requests, 4)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["counters"]["uploads.pool.hit"], 2)
+        self.assertNotIn("uploads.pool.miss", snapshot["counters"])
+        self.assertEqual(snapshot["gauges"]["uploads.pool.depth"], 2)
+        self.assertEqual(snapshot["timers"]["uploads.pool.refill"]["count"], 1)
+
+    def test_refills_below_low_water(self):
+        uploads.get_pool().start()
+        self.wait_for_depth(4)
+        for _ in range(3):
+            self.client.post(URL)
+        self.wait_for_depth(4)
+        self.assertEqual(self.server.requests, 7)
+        self.assertEqual(metrics.snapshot()["timers"]["uploads.pool.refill"]["count"], 2)
+
+    def test_skips_expiring_urls(self):
+        pool = uploads.get_pool()
+        pool.start()
+        self.wait_for_depth(4)
+        # 업로드할 시간 (CLOUDFLARE_UPLOAD_URL_MARGIN) 이 안 남은 주소
+        pool.urls.appendleft((time.time() + 60, {"id": "old", "uploadURL": "old"}))
+        response = self.client.post(URL)
+        self.assertNotEqual(response.json()["id"], "old")
+        self.assertEqual(metrics.snapshot()["counters"]["uploads.pool.expired"], 1)
+
+    def test_cloudflare_error(self):
+        self.server.fail = True
+        response = self.client.post(URL)
+        self.assertEqual(response.status_code, 502)
+        self.server.fail = False
+        self.assertEqual(self.client.post(URL).status_code, 200)
+
+    def test_cloudflare_down(self):
+        with override_settings(CLOUDFLARE_API_URL="http://127.0.0.1:1/client/v4"):
+            response = self.client.post(URL)
+        self.assertEqual(response.status_code, 502)
+
+
+class TestPhotoVariants(APITestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings.enable()
+        metrics.reset()
+        self.user = User.objects.create(username="host")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=self.user,
+        )
+
+    def tearDown(self):
+        self.settings.disable()
+        self.media.cleanup()
+
+    def upload(self, name, size=(2000, 1000), format="JPEG"):
+        path = Path(self.media.name) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.new("RGB", size, "red").save(path, format=format)
+        return f"http://localhost:8000/user-uploads/{name}"
+
+    def test_local_photo(self):
+        url = self.upload("rooms/a b.jpg")
+        result = variants.make(url)
+        self.assertEqual(list(result), ["thumbnail", "medium", "large"])
+        self.assertEqual(
+            result["thumbnail"],
+            {"url": "http://localhost:8000/user-uploads/variants/thumbnail/rooms/a%20b.jpg", "width": 320},
+        )
+        with Image.open(Path(self.media.name) / "variants/thumbnail/rooms/a b.jpg") as image:
+            self.assertEqual((image.size, image.format), ((320, 160), "JPEG"))
+        self.assertEqual(variants.srcset(result).count("w, "), 2)
+        self.assertEqual(metrics.snapshot()["timers"]["photos.variants"]["count"], 1)
+
+    def test_small_photo_is_not_enlarged(self):
+        url = self.upload("small.png", size=(500, 300), format="PNG")
+        result = variants.make(url)
+        self.assertEqual(result["medium"], {"url": url, "width": 500})
+        self.assertEqual(result["large"], result["medium"])
+        self.assertEqual(
+            variants.srcset(result),
+            f"http://localhost:8000/user-uploads/variants/thumbnail/small.png 320w, {url} 500w",
+        )
+
+    def test_cloudflare_photo(self):
+        result = variants.make("https://imagedelivery.net/hash/image-id/public")
+        self.assertEqual(result["large"]["url"], "https://imagedelivery.net/hash/image-id/large")
+        self.assertEqual(variants.make("https://example.com/a.jpg"), {})
+
+    def test_bad_files(self):
+        (Path(self.media.name) / "broken.jpg").write_bytes(b"not an image")
+        self.assertEqual(variants.make("http://localhost:8000/user-uploads/broken.jpg"), {})
+        self.assertEqual(metrics.snapshot()["counters"]["photos.variants.failed"], 1)
+        self.assertIsNone(variants.local_path("http://localhost:8000/user-uploads/../manage.py"))
+        self.assertIsNone(variants.local_path("http://localhost:8000/user-uploads/missing.jpg"))
+
+    def test_upload_and_list(self):
+        self.client.force_login(self.user)
+        url = self.upload("room.jpg")
+        response = self.client.post(
+            f"/api/v1/rooms/{self.room.pk}/photos", {"file": url, "description": "d"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/variants/large/room.jpg 1280w", response.json()["srcset"])
+
+        room = self.client.get(f"/api/v1/rooms/{self.room.pk}").json()
+        self.assertEqual(room["photos"][0]["srcset"], response.json()["srcset"])
+        cover = self.client.get("/api/v1/rooms/").json()[0]["cover_photo"]
+        self.assertEqual(
+            cover["url"], "http://localhost:8000/user-uploads/variants/thumbnail/room.jpg"
+        )
+
+    def test_backfill_command(self):
+        url = self.upload("old.jpg")
+        photo = Photo.objects.create(file=url, description="old", room=self.room)
+        Photo.objects.create(file="https://example.com/a.jpg", description="ext", room=self.room)
+        out = io.StringIO()
+        call_command("make_photo_variants", stdout=out)
+        photo.refresh_from_db()
+        self.assertEqual(photo.variants["thumbnail"]["width"], 320)
+        self.assertIn("1 photos updated, 1 without variants", out.getvalue())
+
+
+class TestCoverPhoto(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="host")
+        self.rooms = [
+            Room.objects.create(
+                name=f"Room {i}",
+                price=1,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="addr",
+                owner=self.user,
+            )
+            for i in range(2)
+        ]
+
+    def add_photo(self, name, room=None, **kwargs):
+        return Photo.objects.create(
+            file=f"https://a.com/{name}.jpg", description=name, room=room or self.rooms[0], **kwargs
+        )
+
+    def test_first_photo_is_cover(self):
+        first = self.add_photo("first")
+        second = self.add_photo("second")
+        room = Room.objects.get(pk=self.rooms[0].pk)
+        self.assertEqual((room.cover_photo, room.photo_count), (first, 2))
+
+        first.delete()
+        room.refresh_from_db()
+        self.assertEqual((room.cover_photo, room.photo_count), (second, 1))
+
+        # 다른 방으로 옮기면 두 방 다 다시 계산
+        second.room = self.rooms[1]
+        second.save()
+        room.refresh_from_db()
+        self.assertEqual((room.cover_photo, room.photo_count), (None, 0))
+        self.assertEqual(Room.objects.get(pk=self.rooms[1].pk).cover_photo, second)
+
+    def test_experience_cover(self):
+        experience = Experience.objects.create(
+            name="Tour",
+            host=self.user,
+            price=5,
+            address="addr",
+            start="09:00",
+            end="12:00",
+            description="desc",
+        )
+        photo = Photo.objects.create(file="https://a.com/e.jpg", description="e", experience=experience)
+        experience.refresh_from_db()
+        self.assertEqual((experience.cover_photo, experience.photo_count), (photo, 1))
+        data = self.client.get("/api/v1/experiences/").json()[0]
+        self.assertEqual((data["cover_photo"]["pk"], data["photo_count"]), (photo.pk, 1))
+
+    def test_list_reads_only_cover(self):
+        for i in range(20):
+            self.add_photo(f"p{i}")
+        # 방 목록 1번, 사진 테이블은 JOIN 으로 대표 사진만
+        with self.assertNumQueries(1):
+            rooms = self.client.get("/api/v1/rooms/").json()
+        data = {room["pk"]: room for room in rooms}[self.rooms[0].pk]
+        self.assertEqual(data["photo_count"], 20)
+        self.assertEqual(data["cover_photo"]["url"], "https://a.com/p0.jpg")
+        self.assertNotIn("photos", data)
+
+    def test_rebuild_covers_command(self):
+        photos = Photo.objects.bulk_create(
+            [Photo(file="https://a.com/b.jpg", description="b", room=self.rooms[1])]
+        )
+        self.assertEqual(Room.objects.get(pk=self.rooms[1].pk).photo_count, 0)
+        call_command("rebuild_covers", stdout=io.StringIO())
+        room = Room.objects.get(pk=self.rooms[1].pk)
+        self.assertEqual((room.cover_photo_id, room.photo_count), (photos[0].pk, 1))
@@ -0,0 +1,198 @@
+"""
+Cloudflare Images 일회용 업로드 주소 풀
+
+GetUploadURL 이 요청마다 direct_upload API 를 부르지 않고 미리 받아둔 주소를 하나 꺼내서 돌려줌 (deque, O(1)).
+주소마다 만료 시간 (settings.CLOUDFLARE_UPLOAD_URL_TTL) 을 같이 보관하고
+클라이언트가 올릴 시간 (CLOUDFLARE_UPLOAD_URL_MARGIN) 이 안 남은 주소는 버림.
+
+남은 개수가 CLOUDFLARE_UPLOAD_POOL_LOW 아래로 내려가거나 주소가 만료되어 가면
+백그라운드 스레드가 CLOUDFLARE_UPLOAD_POOL_SIZE 까지 동시에 받아서 채움.
+스레드는 자기 이벤트 루프와 httpx.AsyncClient (keep-alive, timeout) 를 가지고 있음.
+풀이 비었으면 그 자리에서 하나 받아옴 (uploads.pool.miss).
+
+워커 프로세스마다 풀이 따로 있고 첫 요청때 스레드를 시작함.
+metrics: uploads.pool.depth (게이지), uploads.pool.refill / uploads.mint (타이머),
+uploads.pool.hit / miss / expired / mint_failed (카운터)
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+import httpx
+from django.conf import settings
+from common import metrics
+
+# 채우다 실패하면 다시 시도하기 전에 쉬는 시간 (초)
+RETRY_DELAY = 5
+
+
+class UploadError(Exception):
+    pass
+
+
+def read_result(response):
+    if response.status_code >= 400:
+        raise UploadError(f"direct_upload: {response.status_code}")
+    try:
+        data = response.json()
+    except ValueError:
+        raise UploadError("direct_upload: invalid json")
+    if not isinstance(data, dict) or not data.get("success"):
+        raise UploadError("direct_upload: not successful")
+    result = data.get("result") or {}
+    if not result.get("uploadURL"):
+        raise UploadError("direct_upload: no uploadURL")
+    return result
+
+
+class UploadURLPool:
+    def __init__(self):
+        # (만료 시각 time.time(), {"id": ..., "uploadURL": ...}) - 받은 순서 = 만료 순서
+        self.urls = deque()
+        self.lock = threading.Lock()
+        self.loop = None
+
+    def start(self):
+        with self.lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            self.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.CLOUDFLARE_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.CLOUDFLARE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.CLOUDFLARE_MAX_CONNECTIONS,
+                ),
+            )
+            self.slots = asyncio.Semaphore(settings.CLOUDFLARE_MAX_CONNECTIONS)
+            self.wakeup = asyncio.Event()
+            self.thread = threading.Thread(
+                target=loop.run_forever, name="upload-url-pool", daemon=True
+            )
+            self.thread.start()
+            self.keeper = asyncio.run_coroutine_threadsafe(self.keep_filled(), loop)
+            self.loop = loop
+
+    def close(self):
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        self.keeper.cancel()
+        asyncio.run_coroutine_threadsafe(self.client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self.thread.join()
+        loop.close()
+        self.urls.clear()
+
+    def take(self):
+        """업로드 주소 하나 ({"id", "uploadURL"}), 풀이 비었으면 바로 받아옴"""
+        self.start()
+        deadline = time.time() + settings.CLOUDFLARE_UPLOAD_URL_MARGIN
+        result = None
+        while result is None:
+            try:
+                expires_at, upload = self.urls.popleft()
+            except IndexError:
+                break
+            if expires_at > deadline:
+                result = upload
+            else:
+                metrics.incr("uploads.pool.expired")
+        depth = len(self.urls)
+        metrics.gauge("uploads.pool.depth", depth)
+        if depth < settings.CLOUDFLARE_UPLOAD_POOL_LOW:
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+        if result is not None:
+            metrics.incr("uploads.pool.hit")
+            return result
+        metrics.incr("uploads.pool.miss")
+        return asyncio.run_coroutine_threadsafe(self.mint(), self.loop).result()[1]
+
+    async def mint(self):
+        expires_at = time.time() + settings.CLOUDFLARE_UPLOAD_URL_TTL
+        expiry = datetime.fromtimestamp(int(expires_at), timezone.utc)
+        started = time.perf_counter()
+        async with self.slots:
+            response = await self.client.post(
+                f"{settings.CLOUDFLARE_API_URL}/accounts/{settings.CLOUDFLARE_ID}/images/v2/direct_upload",
+                headers={"Authorization": f"Bearer {settings.CLOUDFLARE_TOKEN}"},
+                # Cloudflare 는 multipart form 만 받음
+                files={"expiry": (None, expiry.strftime("%Y-%m-%dT%H:%M:%SZ"))},
+            )
+        metrics.observe("uploads.mint", time.perf_counter() - started)
+        return expires_at, read_result(response)
+
+    async def refill(self):
+        """목표 개수까지 동시에 받아서 채움, 실패한 개수를 돌려줌"""
+        missing = settings.CLOUDFLARE_UPLOAD_POOL_SIZE - len(self.urls)
+        if missing <= 0:
+            return 0
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.mint() for _ in range(missing)), return_exceptions=True
+        )
+        failed = 0
+        for result in results:
+            if isinstance(result, Exception):
+                failed += 1
+                metrics.incr("uploads.pool.mint_failed")
+            else:
+                self.urls.append(result)
+        metrics.observe("uploads.pool.refill", time.perf_counter() - started)
+        metrics.gauge("uploads.pool.depth", len(self.urls))
+        return failed
+
+    def drop_expired(self):
+        deadline = time.time() + settings.CLOUDFLARE_UPLOAD_URL_MARGIN
+        while self.urls and self.urls[0][0] <= deadline:
+            try:
+                self.urls.popleft()
+            except IndexError:
+                break
+            metrics.incr("uploads.pool.expired")
+
+    async def keep_filled(self):
+        """take() 가 깨우거나 제일 오래된 주소가 만료되어 갈때 채움"""
+        while True:
+            # 채우는 동안 take() 가 깨우면 바로 한번 더 확인하도록 먼저 지움
+            self.wakeup.clear()
+            self.drop_expired()
+            failed = 0
+            if len(self.urls) < settings.CLOUDFLARE_UPLOAD_POOL_LOW:
+                failed = await self.refill()
+            if failed:
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            timeout = None
+            if self.urls:
+                timeout = max(
+                    self.urls[0][0] - settings.CLOUDFLARE_UPLOAD_URL_MARGIN - time.time(), 0
+                )
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = UploadURLPool()
+        return _pool
+
+
+def reset():
+    """풀을 닫고 버림 (테스트, 설정이 바뀌었을때)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,144 @@
+"""
+사진 크기별 사본 (settings.PHOTO_VARIANTS: thumbnail / medium / large)
+
+Photo.variants = {"thumbnail": {"url": ..., "width": 320}, ...}
+목록은 첫 사진의 thumbnail 만, 상세는 srcset 으로 보내서 클라이언트가 화면에 맞는 크기를 받게 함.
+
+- Cloudflare Images 주소 (https://imagedelivery.net/<hash>/<id>/<variant>) 는 variant 이름만 바꿔서 기록함
+- MEDIA_ROOT 에 있는 사진은 Pillow 로 줄여서 MEDIA_ROOT/variants/<이름>/ 에 저장함.
+  Pillow 는 디코딩/리사이즈/인코딩 동안 GIL 을 놓아서 스레드 풀 (PHOTO_VARIANT_WORKERS) 에서 돌림.
+  요청이 몇개가 오든 프로세스당 동시에 돌아가는 리사이즈는 풀 크기만큼.
+- 나머지 (외부 주소) 는 기록할 게 없어서 {} (serializer 가 원본 주소를 씀)
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+from django.conf import settings
+from PIL import Image, ImageOps
+from common import metrics
+
+
+def media_prefix():
+    # MEDIA_URL = "user-uploads/" -> "/user-uploads/"
+    return "/" + settings.MEDIA_URL.strip("/") + "/"
+
+
+def record(url):
+    """주소만 보고 만들 수 있는 variants (Cloudflare Images), 아니면 {}"""
+    parts = urlsplit(url)
+    segments = parts.path.split("/")
+    if parts.netloc != settings.CLOUDFLARE_DELIVERY_HOST or len(segments) != 4:
+        return {}
+    variants = {}
+    for name, width in settings.PHOTO_VARIANTS.items():
+        path = "/".join([*segments[:3], name])
+        variants[name] = {"url": urlunsplit(parts._replace(path=path)), "width": width}
+    return variants
+
+
+def local_path(url):
+    """MEDIA_ROOT 안의 파일이면 그 경로, 아니면 None"""
+    path = urlsplit(url).path
+    prefix = media_prefix()
+    if not path.startswith(prefix):
+        return None
+    root = Path(settings.MEDIA_ROOT).resolve()
+    file = (root / unquote(path[len(prefix):])).resolve()
+    # ../ 로 MEDIA_ROOT 밖을 가리키는 주소는 무시
+    if root not in file.parents or not file.is_file():
+        return None
+    return file
+
+
+def render(url, path):
+    """MEDIA_ROOT 의 사진 하나로 크기별 사본을 만듬 (풀 스레드에서 돌아감)"""
+    started = time.perf_counter()
+    root = Path(settings.MEDIA_ROOT).resolve()
+    relative = path.relative_to(root).as_posix()
+    parts = urlsplit(url)
+    widest = max(settings.PHOTO_VARIANTS.values())
+    try:
+        with Image.open(path) as image:
+            format = image.format
+            # JPEG 은 디코딩할때부터 줄여서 읽음 (가장 큰 사본보다는 크게)
+            image.draft(None, (widest, widest))
+            image = ImageOps.exif_transpose(image)
+        if image.mode == "P":
+            image = image.convert("RGBA")
+        variants = {}
+        current = image
+        # 큰 것부터 만들고 그걸 다시 줄임
+        for name, width in sorted(settings.PHOTO_VARIANTS.items(), key=lambda item: -item[1]):
+            if image.width <= width:
+                # 원본보다 크게 만들지 않음
+                variants[name] = {"url": url, "width": image.width}
+                continue
+            current = current.resize(
+                (width, max(round(current.height * width / current.width), 1)),
+                Image.Resampling.LANCZOS,
+            )
+            target = root / "variants" / name / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            current.save(
+                target, format=format, quality=settings.PHOTO_VARIANT_QUALITY, optimize=True
+            )
+            variant_path = f"{media_prefix()}variants/{name}/{quote(relative)}"
+            variants[name] = {
+                "url": urlunsplit(parts._replace(path=variant_path)),
+                "width": width,
+            }
+    except (OSError, ValueError, Image.DecompressionBombError):
+        metrics.incr("photos.variants.failed")
+        return {}
+    metrics.observe("photos.variants", time.perf_counter() - started)
+    return {name: variants[name] for name in settings.PHOTO_VARIANTS}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PHOTO_VARIANT_WORKERS,
+                thread_name_prefix="photo-variants",
+            )
+        return _executor
+
+
+def submit(url):
+    """사진 주소 -> variants 를 돌려줄 Future (로컬 파일만 풀에서 만들고 나머지는 바로 끝남)"""
+    path = local_path(url)
+    if path is not None:
+        return get_executor().submit(render, url, path)
+    future = Future()
+    future.set_result(record(url))
+    return future
+
+
+def make(url):
+    """새로 올린 사진의 variants (Photo.variants 에 저장할 값)"""
+    return submit(url).result()
+
+
+def variant_url(variants, name):
+    variant = (variants or {}).get(name)
+    return variant["url"] if variant else None
+
+
+def srcset(variants):
+    """<img srcset> 값, 원본보다 크게 못 만든 사본 (같은 주소) 은 한번만"""
+    seen = set()
+    candidates = []
+    for variant in sorted((variants or {}).values(), key=lambda variant: variant["width"]):
+        if variant["url"] in seen:
+            continue
+        seen.add(variant["url"])
+        candidates.append(f"{variant['url']} {variant['width']}w")
+    return ", ".join(candidates) or None
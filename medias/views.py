@@ -1,12 +1,11 @@
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
-from rest_framework.status import HTTP_204_NO_CONTENT
+from rest_framework.status import HTTP_204_NO_CONTENT, HTTP_502_BAD_GATEWAY
 from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.response import Response
 from .models import Photo
-from django.conf import settings
-import requests
-import json
+from .uploads import UploadError, get_pool
+import httpx
 
 
 class PhotoDetail(APIView):
@@ -45,13 +44,11 @@ class PhotoDetail(APIView):
 
 class GetUploadURL(APIView):
     def post(self, request):
-        url = f"https://api.cloudflare.com/client/v4/accounts/{settings.CLOUDFLARE_ID}/images/v2/direct_upload"
-        one_time_url = requests.post(
-            url,
-            headers={
-                "Authorization": f"Bearer {settings.CLOUDFLARE_TOKEN}",
-            },
-        )
-        one_time_url = one_time_url.json()
-        result = one_time_url.get("result")
+        # 미리 받아둔 주소를 꺼냄 (medias.uploads)
+        try:
+            result = get_pool().take()
+        except (UploadError, httpx.HTTPError):
+            return Response(
+                {"detail": "Could not get an upload URL."}, status=HTTP_502_BAD_GATEWAY
+            )
         return Response(result)
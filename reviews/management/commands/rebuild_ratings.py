@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = "reviews.Review 테이블에서 Room/Experience 의 rating_sum, review_count 를 다시 계산합니다. (bulk import 후에 실행)"
+
+    def handle(self, *args, **options):
+        for label, count in rebuild_ratings().items():
+            self.stdout.write(self.style.SUCCESS(f"{label}: {count} rows updated"))
@@ -0,0 +1,34 @@
+# Generated by Django 4.1 on 2026-10-18 19:09
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    for field, label in (('room', 'rooms.Room'), ('experience', 'experiences.Experience')):
+        model = apps.get_model(label)
+        stats = (
+            Review.objects.filter(**{f'{field}__isnull': False})
+            .order_by()
+            .values(field)
+            .annotate(total=Sum('rating'), count=Count('pk'))
+        )
+        for row in stats:
+            model.objects.filter(pk=row[field]).update(
+                rating_sum=row['total'],
+                review_count=row['count'],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_alter_review_experience_alter_review_room_and_more'),
+        ('rooms', '0006_room_rating_sum_room_review_count'),
+        ('experiences', '0004_experience_rating_sum_experience_review_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1 on 2026-10-18 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_backfill_ratings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['room', 'created_at', 'id'], name='reviews_rev_room_id_4879a8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['experience', 'created_at', 'id'], name='reviews_rev_experie_daa90e_idx'),
+        ),
+    ]
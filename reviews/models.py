@@ -32,3 +32,10 @@ class Review(CommonModel):
 
     def __str__(self):
         return f"{self.user} / {self.rating}⭐️"
+
+    class Meta:
+        indexes = [
+            # 방/체험별 리뷰 cursor 페이지네이션
+            models.Index(fields=["room", "created_at", "id"]),
+            models.Index(fields=["experience", "created_at", "id"]),
+        ]
@@ -0,0 +1,49 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from rooms.models import Room
+from experiences.models import Experience
+from .models import Review
+
+# Review 의 FK 이름 -> 평점을 저장하는 모델
+RATED_MODELS = {
+    "room": Room,
+    "experience": Experience,
+}
+
+
+def refresh_rating(field, pk):
+    """리뷰 테이블에서 한 방/체험의 rating_sum, review_count 를 다시 계산해서 저장"""
+    if pk is None:
+        return
+    stats = Review.objects.filter(**{field: pk}).aggregate(
+        total=Sum("rating"),
+        count=Count("pk"),
+    )
+    RATED_MODELS[field].objects.filter(pk=pk).update(
+        rating_sum=stats["total"] or 0,
+        review_count=stats["count"],
+    )
+
+
+def rebuild_ratings():
+    """모든 방/체험의 평점 컬럼을 모델당 UPDATE 한번으로 다시 계산"""
+    updated = {}
+    for field, model in RATED_MODELS.items():
+        reviews = (
+            Review.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+        )
+        updated[model._meta.label] = model.objects.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum("rating")).values("total")),
+                Value(0),
+                output_field=IntegerField(),
+            ),
+            review_count=Coalesce(
+                Subquery(reviews.annotate(count=Count("pk")).values("count")),
+                Value(0),
+                output_field=IntegerField(),
+            ),
+        )
+    return updated
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .models import Review
+from .ratings import RATED_MODELS, refresh_rating
+
+
+@receiver(pre_save, sender=Review)
+def remember_rated_objects(sender, instance, **kwargs):
+    # 리뷰의 방/체험이 바뀌면 (admin 등) 예전 대상도 다시 계산해야함
+    instance._previous_targets = {}
+    if instance.pk:
+        instance._previous_targets = (
+            Review.objects.filter(pk=instance.pk)
+            .values(*[f"{field}_id" for field in RATED_MODELS])
+            .first()
+            or {}
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_targets", {})
+    for field in RATED_MODELS:
+        pk = getattr(instance, f"{field}_id")
+        refresh_rating(field, pk)
+        if previous.get(f"{field}_id") not in (None, pk):
+            refresh_rating(field, previous[f"{field}_id"])
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    for field in RATED_MODELS:
+        refresh_rating(field, getattr(instance, f"{field}_id"))
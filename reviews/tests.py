@@ -1,3 +1,72 @@
-from django.test import TestCase
+import io
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rooms.models import Room
+from users.models import User
+from .models import Review
 
-# Create your tests here.
+
+class TestRoomRating(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=self.user,
+        )
+
+    def create_review(self, rating):
+        return Review.objects.create(
+            user=self.user,
+            room=self.room,
+            payload="good",
+            rating=rating,
+        )
+
+    def test_rating_follows_reviews(self):
+        self.assertEqual(self.room.rating(), "리뷰 없음")
+
+        self.create_review(5)
+        review = self.create_review(2)
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.review_count, 2)
+        self.assertEqual(self.room.rating(), 3.5)
+
+        review.rating = 4
+        review.save()
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.rating(), 4.5)
+
+        review.delete()
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.review_count, 1)
+        self.assertEqual(self.room.rating(), 5)
+
+    def test_rebuild_ratings(self):
+        Review.objects.bulk_create(
+            [
+                Review(user=self.user, room=self.room, payload="bulk", rating=rating)
+                for rating in (1, 2, 3)
+            ]
+        )
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.review_count, 0)
+
+        call_command("rebuild_ratings", stdout=io.StringIO())
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.review_count, 3)
+        self.assertEqual(self.room.rating(), 2)
+
+    def test_list_has_no_review_queries(self):
+        self.create_review(4)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/rooms/")
+        for query in queries:
+            self.assertNotIn("reviews_review", query["sql"])
+        self.assertEqual(response.json()[0]["rating"], 4)
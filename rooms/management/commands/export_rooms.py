@@ -0,0 +1,40 @@
+import sys
+import time
+from django.core.management.base import BaseCommand
+from rooms.models import Room
+from rooms.transfer import CHUNK_SIZE, FORMATS, export_rows, guess_format, write_lines
+
+
+class Command(BaseCommand):
+    help = "방들을 CSV / JSONL 로 내보냅니다. (import_rooms 와 같은 형식)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="- 면 stdout")
+        parser.add_argument("--owner", help="이 username 의 방만")
+        parser.add_argument("--format", choices=FORMATS, help="기본은 파일 확장자")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        format = options["format"] or guess_format(options["path"]) or "jsonl"
+        rooms = Room.objects.all()
+        if options["owner"]:
+            rooms = rooms.filter(owner__username=options["owner"])
+        started = time.perf_counter()
+        count = 0
+        output = (
+            sys.stdout
+            if options["path"] == "-"
+            else open(options["path"], "w", encoding="utf-8", newline="")
+        )
+        try:
+            for line in write_lines(export_rows(rooms, options["chunk_size"]), format):
+                output.write(line)
+                count += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        if format == "csv":
+            count -= 1  # 헤더
+        seconds = time.perf_counter() - started
+        rate = round(count / seconds) if seconds else 0
+        self.stderr.write(f"{count} rooms exported in {seconds:.3f}s ({rate} rows/s)")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from users.models import User
+from rooms.transfer import CHUNK_SIZE, FORMATS, guess_format, import_rooms
+
+
+class Command(BaseCommand):
+    help = "CSV / JSONL 파일의 방들을 한번에 등록합니다. (bulk_create, chunk 마다 트랜잭션)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--owner", required=True, help="방 주인 username")
+        parser.add_argument("--format", choices=FORMATS, help="기본은 파일 확장자")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError("owner not found")
+        format = options["format"] or guess_format(options["path"])
+        if format is None:
+            raise CommandError("file should be .csv or .jsonl (or use --format)")
+        with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+            report = import_rooms(lines, format, owner, options["chunk_size"])
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['created']} rooms imported in {report['seconds']}s "
+                f"({report['rows_per_second']} rows/s), {len(report['errors'])} errors"
+            )
+        )
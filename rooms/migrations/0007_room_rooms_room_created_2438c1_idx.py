@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0006_room_rating_sum_room_review_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['created_at', 'id'], name='rooms_room_created_2438c1_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.1 on 2026-10-18 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0008_room_geohash_room_latitude_room_longitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['city', 'price'], name='rooms_room_city_136688_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['country', 'city'], name='rooms_room_country_f8c974_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['kind', 'price'], name='rooms_room_kind_c24ede_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['price', 'id'], name='rooms_room_price_db2449_idx'),
+        ),
+    ]
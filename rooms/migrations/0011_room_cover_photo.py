@@ -0,0 +1,25 @@
+# Generated by Django 4.1 on 2026-10-18 20:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medias', '0007_photo_ordering'),
+        ('rooms', '0010_room_timezone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='cover_photo',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='medias.photo'),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='photo_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1 on 2026-10-18 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0011_room_cover_photo'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='room',
+            name='rooms_room_country_f8c974_idx',
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['city', 'created_at'], name='rooms_room_city_2afcd0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['country', 'price'], name='rooms_room_country_68e621_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['country', 'created_at'], name='rooms_room_country_27ceed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['kind', 'created_at'], name='rooms_room_kind_ebd2b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['category', 'price'], name='rooms_room_categor_7616bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['category', 'created_at'], name='rooms_room_categor_054014_idx'),
+        ),
+    ]
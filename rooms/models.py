@@ -1,5 +1,7 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from common.models import CommonModel
+from bookings.dates import validate_timezone
 
 
 # Create your models here.
@@ -20,7 +22,7 @@ class Room(CommonModel):
         max_length=80,
         default="서울",
     )
-    price = models.PositiveIntegerField()
+    price = models.PositiveIntegerField()  # 기준 통화 (settings.PRICE_CURRENCY) 최소 단위
     rooms = models.PositiveIntegerField()
     toilets = models.PositiveIntegerField()
     description = models.TextField()
@@ -35,6 +37,12 @@ class Room(CommonModel):
         on_delete=models.CASCADE,
         related_name="rooms",
     )
+    # 예약 날짜를 이 시간대 기준으로 정함 (bookings.dates)
+    timezone = models.CharField(
+        max_length=50,
+        default="Asia/Seoul",
+        validators=[validate_timezone],
+    )
 
     amenities = models.ManyToManyField(
         "rooms.Amenity",
@@ -47,6 +55,32 @@ class Room(CommonModel):
         on_delete=models.SET_NULL,
         related_name="rooms",
     )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    # 위도/경도로 geo.signals 에서 채움 (위치 검색용, geo.queries)
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False)
+    # 리뷰가 저장/삭제될때 reviews.signals 에서 갱신됨 (rebuild_ratings 커맨드로 재계산 가능)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    # 대표 사진 (첫 사진) 과 사진 개수, 사진이 저장/삭제될때 medias.signals 에서 갱신됨
+    # (rebuild_covers 커맨드로 재계산 가능). 목록은 사진 대신 이것만 보냄
+    cover_photo = models.ForeignKey(
+        "medias.Photo",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
+    photo_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
@@ -55,14 +89,30 @@ class Room(CommonModel):
         return self.amenities.count()
 
     def rating(room):
-        count = room.reviews.count()
-        if count == 0:
+        if room.review_count == 0:
             return "리뷰 없음"
         else:
-            total_count = 0
-            for review in room.reviews.all().values("rating"):
-                total_count += review["rating"]
-            return round(total_count / count, 2)
+            return round(room.rating_sum / room.review_count, 2)
+
+    class Meta:
+        indexes = [
+            # cursor 페이지네이션 (created_at, pk)
+            models.Index(fields=["created_at", "id"]),
+            # geohash 셀 범위 검색
+            models.Index(fields=["geohash"]),
+            # 목록 필터 / 정렬 (rooms.filters)
+            # 같다(=) 로 거르는 필드마다 정렬 두개 (created_at, price) 를 이어붙임
+            # pet_friendly, min_rooms, min_toilets 는 걸러지는게 적어서 정렬 인덱스를 따라 읽는게 나음
+            models.Index(fields=["city", "price"]),
+            models.Index(fields=["city", "created_at"]),
+            models.Index(fields=["country", "price"]),
+            models.Index(fields=["country", "created_at"]),
+            models.Index(fields=["kind", "price"]),
+            models.Index(fields=["kind", "created_at"]),
+            models.Index(fields=["category", "price"]),
+            models.Index(fields=["category", "created_at"]),
+            models.Index(fields=["price", "id"]),
+        ]
 
 
 class Amenity(CommonModel):
@@ -3,8 +3,9 @@ from .models import Amenity, Room
 from users.serializers import TinyUserSerializer
 from categories.serializers import CategorySerializer
 from reviews.serializers import ReviewSerializer
-from medias.serializers import PhotoSerializer
-from wishlists.models import Wishlist
+from medias.serializers import PhotoSerializer, ThumbnailSerializer
+from wishlists.liked import is_liked
+from currencies.serializers import LocalPriceListSerializer, LocalPriceMixin
 
 
 class AmenitySerializer(ModelSerializer):
@@ -17,13 +18,19 @@ class AmenitySerializer(ModelSerializer):
         )
 
 
-class RoomListSerializer(ModelSerializer):
+class RoomListSerializer(LocalPriceMixin, ModelSerializer):
     rating = SerializerMethodField()
     is_owner = SerializerMethodField()
-    photos = PhotoSerializer(many=True, read_only=True)
+    is_liked = SerializerMethodField()
+    # 사진은 대표 사진의 작은 사본과 개수만 (전체 사진과 srcset 은 상세에서)
+    cover_photo = ThumbnailSerializer(read_only=True)
+
+    # common.fast 에서 .values() 로 읽을때 get_xxx 에서 쓰는 컬럼
+    row_columns = ("owner_id", "rating_sum", "review_count")
 
     class Meta:
         model = Room
+        list_serializer_class = LocalPriceListSerializer
 
         fields = (
             "pk",
@@ -33,7 +40,9 @@ class RoomListSerializer(ModelSerializer):
             "price",
             "rating",
             "is_owner",
-            "photos",
+            "is_liked",
+            "cover_photo",
+            "photo_count",
         )
         # depth = 0  # 0(default): rest 프레임워크에 관계 필드들은 기본적으로 id만 보여줌, 1: 관계 필드의 모든 필드, 데이터 보여줌
 
@@ -44,12 +53,16 @@ class RoomListSerializer(ModelSerializer):
     def get_is_owner(self, room):
         request = self.context.get("request")
         if request:
-            return room.owner == request.user
+            # room.owner 를 쓰면 방마다 유저를 불러오니까 id 로 비교
+            return room.owner_id == request.user.pk
         else:
             return False
 
+    def get_is_liked(self, room):
+        return is_liked(self.context, "rooms", room.pk)
+
 
-class RoomDetailSerializer(ModelSerializer):
+class RoomDetailSerializer(LocalPriceMixin, ModelSerializer):
 
     owner = TinyUserSerializer(read_only=True)
     amenities = AmenitySerializer(read_only=True, many=True)
@@ -62,6 +75,7 @@ class RoomDetailSerializer(ModelSerializer):
 
     class Meta:
         model = Room
+        list_serializer_class = LocalPriceListSerializer
         fields = (
             "pk",
             "owner",
@@ -83,6 +97,9 @@ class RoomDetailSerializer(ModelSerializer):
             "address",
             "pet_friendly",
             "kind",
+            "timezone",
+            "latitude",
+            "longitude",
         )
         # depth = 1
 
@@ -93,16 +110,11 @@ class RoomDetailSerializer(ModelSerializer):
     def get_is_owner(self, room):
         request = self.context.get("request")
         if request:
-            return room.owner == request.user
+            # room.owner 를 쓰면 방마다 유저를 불러오니까 id 로 비교
+            return room.owner_id == request.user.pk
         else:
             return False
 
     def get_is_liked(self, room):
-        request = self.context.get("request")
-        if request:
-            # 로그인 안한 사람들은 인증에서 제외해줘야 에러 안뜸 그치?
-            if request.user.is_authenticated:
-                return Wishlist.objects.filter(
-                    user=request.user, rooms__pk=room.pk
-                ).exists()
-        return False
+        # 로그인 안한 사람은 get_liked 에서 빈 set 이 나옴
+        return is_liked(self.context, "rooms", room.pk)
@@ -1,6 +1,19 @@
+import json
+import re
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APITestCase
+from common.pagination import CursorPagination
 from . import models
+from .filters import SORTS, filter_rooms, get_ordering
 from users.models import User
+from categories.models import Category
+from medias.models import Photo
 
 
 class TestAmenities(APITestCase):
@@ -10,6 +23,7 @@ class TestAmenities(APITestCase):
 
     # 다른 함수가 실행하기 전에 실행함.
     def setUp(self):
+        cache.clear()
 
         models.Amenity.objects.create(
             name=self.NAME,
@@ -98,3 +112,409 @@ class TestRooms(APITestCase):
         self.client.force_login(self.user)
         response = self.client.post("/api/v1/rooms/")
         print(response.json())
+
+
+class TestRoomAmenityAssignment(APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.user = User.objects.create(username="host")
+        self.client.force_login(self.user)
+        self.category = Category.objects.create(
+            name="rooms", kind=Category.CategoryKindChoices.ROOMS
+        )
+        self.amenities = models.Amenity.objects.bulk_create(
+            [models.Amenity(name=f"amenity {i}") for i in range(40)]
+        )
+
+    def room_data(self, amenities):
+        return {
+            "name": "room",
+            "country": "한국",
+            "city": "서울",
+            "price": 10,
+            "rooms": 1,
+            "toilets": 1,
+            "description": "room",
+            "address": "address",
+            "kind": models.Room.RoomKindChoices.ENTIRE_PLACE,
+            "category": self.category.pk,
+            "amenities": amenities,
+        }
+
+    def create_queries(self, amenities):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.URL, self.room_data(amenities), format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        room = models.Room.objects.get(pk=response.json()["pk"])
+        self.assertEqual(room.amenities.count(), len(amenities))
+        return len(queries)
+
+    def test_constant_queries(self):
+        self.create_queries([])  # 첫 요청에만 있는 쿼리 (세션 등) 빼고 비교
+        one = self.create_queries([self.amenities[0].pk])
+        many = self.create_queries([amenity.pk for amenity in self.amenities])
+        self.assertEqual(one, many)
+
+    def test_missing_amenities(self):
+        response = self.client.post(
+            self.URL, self.room_data([self.amenities[0].pk, 9998, 9999]), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("[9998, 9999]", response.json()["detail"])
+        self.assertFalse(models.Room.objects.exists())
+
+    def test_put_replaces_amenities(self):
+        room = models.Room.objects.create(
+            **{
+                key: value
+                for key, value in self.room_data([]).items()
+                if key not in ("category", "amenities")
+            },
+            owner=self.user,
+        )
+        room.amenities.set(self.amenities[:3])
+        response = self.client.put(
+            f"{self.URL}{room.pk}",
+            {"amenities": [amenity.pk for amenity in self.amenities[2:5]]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(room.amenities.values_list("pk", flat=True)),
+            [amenity.pk for amenity in self.amenities[2:5]],
+        )
+
+
+class TestRoomsQueryCount(APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="owner")
+
+    def create_rooms(self, count):
+        rooms = models.Room.objects.bulk_create(
+            [
+                models.Room(
+                    name=f"Room {i}",
+                    price=100,
+                    rooms=1,
+                    toilets=1,
+                    description="desc",
+                    address="addr",
+                    kind=models.Room.RoomKindChoices.ENTIRE_PLACE,
+                    owner=self.user,
+                )
+                for i in range(count)
+            ]
+        )
+        Photo.objects.bulk_create(
+            [
+                Photo(file="https://example.com/photo.jpg", description="photo", room=room)
+                for room in rooms
+            ]
+        )
+
+    def assert_list_queries(self, count):
+        self.create_rooms(count)
+        # 방 목록 1번 (대표 사진은 JOIN)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), min(count, settings.CATALOG_PAGE_SIZE))
+
+    def test_list_1_room(self):
+        self.assert_list_queries(1)
+
+    def test_list_10_rooms(self):
+        self.assert_list_queries(10)
+
+    def test_list_1000_rooms(self):
+        self.assert_list_queries(1000)
+
+    def test_is_owner_without_owner_query(self):
+        self.create_rooms(10)
+        self.client.force_login(self.user)
+        # 세션 1번 + 유저 1번 + 방 목록 1번 + 위시리스트 1번
+        with self.assertNumQueries(4):
+            response = self.client.get(self.URL)
+        self.assertTrue(all(room["is_owner"] for room in response.json()))
+
+    def test_cursor_pages(self):
+        self.create_rooms(settings.CATALOG_PAGE_SIZE * 2 + 5)
+        expected = list(models.Room.objects.order_by("created_at", "pk").values_list("pk", flat=True))
+
+        seen = []
+        url = self.URL
+        while url:
+            response = self.client.get(url)
+            seen += [room["pk"] for room in response.json()]
+            url = self.get_link(response, "next")
+            prev_url = self.get_link(response, "prev")
+        self.assertEqual(seen, expected)
+
+        # 마지막 페이지에서 이전 페이지로
+        response = self.client.get(prev_url)
+        self.assertEqual(
+            [room["pk"] for room in response.json()],
+            expected[settings.CATALOG_PAGE_SIZE : settings.CATALOG_PAGE_SIZE * 2],
+        )
+        self.assertIsNone(self.get_link(self.client.get(self.URL), "prev"))
+
+    def test_legacy_page_param(self):
+        size = settings.CATALOG_PAGE_SIZE
+        self.create_rooms(size * 2 + 5)
+        expected = list(models.Room.objects.order_by("created_at", "pk").values_list("pk", flat=True))
+        response = self.client.get(self.URL, {"page": 2})
+        self.assertEqual([room["pk"] for room in response.json()], expected[size : size * 2])
+        # 다음 페이지부터는 cursor 로 이어감
+        next_url = self.get_link(response, "next")
+        self.assertNotIn("page=", next_url)
+        response = self.client.get(next_url)
+        self.assertEqual([room["pk"] for room in response.json()], expected[size * 2 :])
+        self.assertIsNotNone(self.get_link(self.client.get(self.URL, {"page": 2}), "prev"))
+        for page in ("0", "two"):
+            self.assertEqual(self.client.get(self.URL, {"page": page}).status_code, 400)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.URL, {"cursor": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(STREAM_CHUNK_SIZE=10)
+    def test_stream(self):
+        self.create_rooms(30)
+        page = self.client.get(self.URL).json()
+        response = self.client.get(self.URL, {"stream": ""})
+        self.assertTrue(response.streaming)
+        # 방 쿼리 하나를 10개씩 읽음 (대표 사진은 JOIN)
+        with self.assertNumQueries(1):
+            rooms = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(rooms), 30)
+        self.assertEqual(rooms[: len(page)], page)
+
+    def get_link(self, response, rel):
+        match = re.search(f'<([^>]+)>; rel="{rel}"', response.get("Link", ""))
+        return match.group(1) if match else None
+
+
+class TestRoomTransfer(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="manager")
+        self.client.force_login(self.user)
+        self.category = Category.objects.create(
+            name="rooms", kind=Category.CategoryKindChoices.ROOMS
+        )
+        self.wifi = models.Amenity.objects.create(name="wifi")
+        self.tv = models.Amenity.objects.create(name="tv")
+
+    def upload(self, name, content):
+        return self.client.post(
+            "/api/v1/rooms/import",
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        )
+
+    def test_import_csv(self):
+        content = (
+            "name,price,rooms,toilets,description,address,kind,category,amenities,photos\n"
+            f"a,10,1,1,d,addr,entire_place,{self.category.pk},{self.wifi.pk}|{self.tv.pk},"
+            "https://a.com/1.jpg|https://a.com/2.jpg\n"
+            "b,x,1,1,d,addr,entire_place,,9999,\n"
+            "c,20,2,1,d,addr,private_room,,,\n"
+        )
+        response = self.upload("rooms.csv", content)
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual(report["created"], 2)
+        self.assertEqual([error["line"] for error in report["errors"]], [3])
+        self.assertEqual(set(report["errors"][0]["errors"]), {"price", "amenities"})
+
+        room = models.Room.objects.get(name="a")
+        self.assertEqual(room.owner, self.user)
+        self.assertEqual(room.category, self.category)
+        self.assertEqual(room.city, "서울")
+        self.assertEqual(room.amenities.count(), 2)
+        self.assertEqual(room.photos.count(), 2)
+        self.assertEqual(room.photo_count, 2)
+        self.assertEqual(room.cover_photo.file, "https://a.com/1.jpg")
+
+    def test_import_excel_csv(self):
+        content = (
+            "\ufeffname,price,rooms,toilets,description,address,kind\r\n"
+            'a,10,1,1,"two\r\nlines",addr,entire_place\r\n'
+            "b,20,1,1,d,addr,entire_place\r\n"
+        )
+        report = self.upload("rooms.csv", content).json()
+        self.assertEqual((report["created"], report["errors"]), (2, []))
+        self.assertEqual(models.Room.objects.get(name="a").description, "two\r\nlines")
+
+    def test_export_round_trip(self):
+        content = "".join(
+            json.dumps(
+                {
+                    "name": f"room {i}",
+                    "price": i,
+                    "rooms": 1,
+                    "toilets": 1,
+                    "description": "d",
+                    "address": "addr",
+                    "kind": "shared_room",
+                    "amenities": [self.wifi.pk],
+                    "photos": [f"https://a.com/{i}.jpg"],
+                }
+            )
+            + "\n"
+            for i in range(5)
+        )
+        self.assertEqual(self.upload("rooms.jsonl", content).json()["created"], 5)
+
+        response = self.client.get("/api/v1/rooms/export?type=jsonl")
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual([row["name"] for row in rows], [f"room {i}" for i in range(5)])
+        self.assertEqual(rows[0]["amenities"], [self.wifi.pk])
+        self.assertEqual(rows[4]["photos"], ["https://a.com/4.jpg"])
+
+        response = self.client.get("/api/v1/rooms/export?type=csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(self.upload("again.csv", "\n".join(lines)).json()["created"], 5)
+        self.assertEqual(models.Room.objects.count(), 10)
+
+    def test_import_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.upload("rooms.csv", "name\n").status_code, 403)
+
+
+class TestRoomFilters(APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="owner")
+        self.wifi = models.Amenity.objects.create(name="wifi")
+        self.tv = models.Amenity.objects.create(name="tv")
+        self.rooms = {}
+        for name, city, price, rooms, pet_friendly, kind in (
+            ("a", "서울", 300, 1, True, "entire_place"),
+            ("b", "부산", 100, 2, False, "private_room"),
+            ("c", "서울", 200, 3, False, "private_room"),
+        ):
+            self.rooms[name] = models.Room.objects.create(
+                name=name,
+                city=city,
+                price=price,
+                rooms=rooms,
+                toilets=1,
+                description="d",
+                address="addr",
+                pet_friendly=pet_friendly,
+                kind=kind,
+                owner=self.user,
+            )
+        self.rooms["a"].amenities.add(self.wifi, self.tv)
+        self.rooms["c"].amenities.add(self.wifi)
+
+    def names(self, query):
+        response = self.client.get(f"{self.URL}?{query}")
+        self.assertEqual(response.status_code, 200)
+        return [room["name"] for room in response.json()]
+
+    def test_filters(self):
+        self.assertEqual(self.names("city=서울"), ["a", "c"])
+        self.assertEqual(self.names("kind=private_room&min_price=150"), ["c"])
+        self.assertEqual(self.names("max_price=200&min_rooms=2"), ["b", "c"])
+        self.assertEqual(self.names("pet_friendly=true"), ["a"])
+        self.assertEqual(
+            self.names(f"amenities={self.wifi.pk},{self.tv.pk}"), ["a"]
+        )
+        self.assertEqual(self.names("min_toilets=2"), [])
+
+    def test_sort(self):
+        self.assertEqual(self.names("sort=price"), ["b", "c", "a"])
+        self.assertEqual(self.names("sort=-price&city=서울"), ["a", "c"])
+        self.assertEqual(self.names("sort=-created_at"), ["c", "b", "a"])
+
+    @override_settings(CATALOG_PAGE_SIZE=2)
+    def test_sort_pages(self):
+        response = self.client.get(f"{self.URL}?sort=price")
+        self.assertEqual([room["name"] for room in response.json()], ["b", "c"])
+        next_url = re.search(r'<([^>]+)>; rel="next"', response["Link"]).group(1)
+        self.assertIn("sort=price", next_url)
+        response = self.client.get(next_url)
+        self.assertEqual([room["name"] for room in response.json()], ["a"])
+
+    def test_invalid_params(self):
+        for query in ("sort=name", "min_rooms=x", "kind=castle", "amenities=a"):
+            response = self.client.get(f"{self.URL}?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+
+class TestRoomFilterPlans(APITestCase):
+    """필터 x 정렬 (+ 다음 페이지 cursor) 쿼리가 rooms_room 을 인덱스 없이 전부 읽지 않는지 (SQLite EXPLAIN QUERY PLAN)"""
+
+    FILTERS = (
+        {},
+        {"city": "서울"},
+        {"country": "한국"},
+        {"kind": "entire_place"},
+        {"category": "1"},
+        {"category": "1,2"},
+        {"amenities": "1,2"},
+        {"pet_friendly": "true"},
+        {"min_rooms": "2"},
+        {"min_toilets": "2"},
+        {"min_price": "10", "max_price": "100"},
+    )
+    # 여러 값 / 범위로 거른 뒤 다른 컬럼으로 정렬하면 거른 행만 정렬함 (TEMP B-TREE)
+    SORTED_AFTER_FILTER = ("category=1,2", "amenities", "min_price")
+    POSITION = {"created_at": timezone.now(), "price": 10, "pk": 1}
+
+    def plan(self, params, cursor):
+        ordering = get_ordering(params)
+        rooms = filter_rooms(models.Room.objects.all(), params).order_by(*ordering)
+        if cursor:
+            position = [self.POSITION[field.lstrip("-")] for field in ordering]
+            rooms = rooms.filter(CursorPagination(ordering).keyset(ordering, position))
+        return rooms[: settings.PAGE_SIZE + 1].explain()
+
+    def test_every_filter_and_sort(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite query plan")
+        for filters in self.FILTERS:
+            for sort in SORTS:
+                for cursor in (False, True):
+                    params = {**filters, "sort": sort}
+                    plan = self.plan(params, cursor)
+                    label = f"{params} cursor={cursor}: {plan}"
+                    self.assertNotRegex(plan, r"SCAN rooms_room(?!_)(?! USING)", label)
+                    self.assertRegex(plan, r"rooms_room\w* USING (COVERING )?INDEX", label)
+                    query = "&".join(f"{key}={value}" for key, value in filters.items())
+                    if any(name in query for name in self.SORTED_AFTER_FILTER):
+                        continue
+                    self.assertNotIn("TEMP B-TREE", plan, label)
+                    if cursor:
+                        # cursor 위치부터 인덱스를 읽음 (처음부터 읽고 버리지 않음)
+                        column = SORTS[sort][0].lstrip("-")
+                        self.assertRegex(plan, rf"{column}[<>]", label)
+
+    def test_equality_filters_use_their_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite query plan")
+        for field, value in (
+            ("city", "서울"),
+            ("country", "한국"),
+            ("kind", "entire_place"),
+            ("category", "1"),
+        ):
+            for sort in SORTS:
+                plan = self.plan({field: value, "sort": sort}, False)
+                self.assertRegex(
+                    plan, rf"SEARCH rooms_room USING INDEX rooms_room_{field[:7]}\w*_idx", sort
+                )
@@ -0,0 +1,249 @@
+"""
+방 대량 import / export (CSV, JSONL)
+
+한 줄이 방 하나. amenities 는 편의시설 id 목록, photos 는 사진 URL 목록이고
+CSV 에서는 "|" 로 구분함 (예: amenities=1|2|3).
+
+import 는 카테고리/편의시설을 미리 한번씩만 읽어두고 chunk_size 줄마다
+트랜잭션 하나로 Room, 편의시설 through 테이블, Photo 를 bulk_create 함.
+bulk_create 는 signal 을 안 보내서 검색 인덱스도 직접 넣고, 끝나고 나서 응답 캐시를 직접 버림.
+export 는 .iterator() 로 chunk 씩 읽어서 한 줄씩 흘려보냄.
+"""
+
+import csv
+import json
+import time
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from categories.models import Category
+from common import metrics
+from common.cache import invalidate
+from medias.covers import rebuild_covers
+from medias.models import Photo
+from geo.signals import set_geohash
+from search.index import bulk_index
+from .models import Amenity, Room
+from .serializers import RoomDetailSerializer
+
+FIELDS = (
+    "name",
+    "country",
+    "city",
+    "price",
+    "rooms",
+    "toilets",
+    "description",
+    "address",
+    "pet_friendly",
+    "kind",
+    "latitude",
+    "longitude",
+    "category",
+    "amenities",
+    "photos",
+)
+LIST_FIELDS = ("amenities", "photos")
+LIST_SEPARATOR = "|"
+FORMATS = ("csv", "jsonl")
+CHUNK_SIZE = 500
+
+
+def guess_format(filename):
+    for format in FORMATS:
+        if filename.endswith(f".{format}"):
+            return format
+    return None
+
+
+def read_rows(lines, format):
+    """
+    텍스트 줄들을 dict 로 바꿔서 (줄 번호, dict) 로 하나씩 돌려줌
+
+    CSV 는 첫 줄이 헤더임.
+    """
+    if format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # 빈 칸은 모델 기본값을 쓰게 뺌
+            row = {key: value for key, value in row.items() if value != ""}
+            for field in LIST_FIELDS:
+                value = row.get(field) or ""
+                row[field] = [item for item in value.split(LIST_SEPARATOR) if item]
+            yield reader.line_num, row
+    else:
+        for line_num, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_num, row
+
+
+class RoomImporter:
+    def __init__(self, owner, chunk_size=CHUNK_SIZE):
+        self.owner = owner
+        self.chunk_size = chunk_size
+        # 줄마다 조회하지 않게 미리 읽어둠
+        self.categories = Category.objects.filter(
+            kind=Category.CategoryKindChoices.ROOMS
+        ).in_bulk()
+        self.amenities = set(Amenity.objects.values_list("pk", flat=True))
+        # serializer 필드는 만드는게 비싸서 하나를 만들어 두고 줄마다 run_validation 만 함
+        self.serializer = RoomDetailSerializer()
+        self.created = 0
+        self.errors = []
+
+    def clean(self, line_num, row):
+        """(Room, 편의시설 id 목록, 사진 URL 목록), 잘못된 줄이면 None"""
+        if not isinstance(row, dict):
+            self.errors.append({"line": line_num, "errors": "Invalid row"})
+            return None
+        try:
+            validated_data = self.serializer.run_validation(row)
+            errors = {}
+        except ValidationError as error:
+            errors = dict(error.detail)
+
+        category = None
+        if row.get("category") not in (None, ""):
+            try:
+                category = self.categories.get(int(row["category"]))
+            except (TypeError, ValueError):
+                pass
+            if category is None:
+                errors["category"] = ["Category not found"]
+
+        amenities = row.get("amenities") or []
+        photos = row.get("photos") or []
+        try:
+            amenities = list(dict.fromkeys(int(pk) for pk in amenities))
+            missing = [pk for pk in amenities if pk not in self.amenities]
+            if missing:
+                errors["amenities"] = [f"Amenity not found: {missing}"]
+        except (TypeError, ValueError):
+            errors["amenities"] = ["Should be a list of ids"]
+        if not isinstance(photos, list) or not all(
+            isinstance(url, str) and url for url in photos
+        ):
+            errors["photos"] = ["Should be a list of urls"]
+
+        if errors:
+            self.errors.append({"line": line_num, "errors": errors})
+            return None
+        room = Room(**validated_data, owner=self.owner, category=category)
+        set_geohash(room)
+        return room, amenities, photos
+
+    def save(self, chunk):
+        with transaction.atomic():
+            rooms = Room.objects.bulk_create([room for room, _, _ in chunk])
+            Room.amenities.through.objects.bulk_create(
+                [
+                    Room.amenities.through(room_id=room.pk, amenity_id=amenity_pk)
+                    for room, (_, amenities, _) in zip(rooms, chunk)
+                    for amenity_pk in amenities
+                ]
+            )
+            Photo.objects.bulk_create(
+                [
+                    Photo(room_id=room.pk, file=url, description="")
+                    for room, (_, _, photos) in zip(rooms, chunk)
+                    for url in photos
+                ]
+            )
+            # bulk_create 는 signal 을 안 보내서 대표 사진/사진 개수를 직접 계산
+            rebuild_covers("room", [room.pk for room in rooms])
+            bulk_index(rooms)
+        self.created += len(rooms)
+
+    def run(self, rows):
+        started = time.perf_counter()
+        chunk = []
+        for line_num, row in rows:
+            cleaned = self.clean(line_num, row)
+            if cleaned is None:
+                continue
+            chunk.append(cleaned)
+            if len(chunk) >= self.chunk_size:
+                self.save(chunk)
+                chunk = []
+        if chunk:
+            self.save(chunk)
+        if self.created:
+            invalidate("rooms")
+        seconds = time.perf_counter() - started
+        metrics.observe("rooms.import", seconds)
+        metrics.incr("rooms.import.rows", self.created)
+        return {
+            "created": self.created,
+            "errors": self.errors,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(self.created / seconds) if seconds else 0,
+        }
+
+
+def import_rooms(lines, format, owner, chunk_size=CHUNK_SIZE):
+    return RoomImporter(owner, chunk_size).run(read_rows(lines, format))
+
+
+def export_rows(rooms, chunk_size=CHUNK_SIZE):
+    """
+    방을 import 와 같은 모양의 dict 로 하나씩 돌려줌
+
+    chunk 마다 편의시설, 사진을 한번씩 모아서 읽으니까 방 개수와 상관없이 chunk 당 쿼리 3번.
+    """
+    values = ("pk",) + tuple(field for field in FIELDS if field not in LIST_FIELDS)
+    chunk = []
+    for row in rooms.order_by("pk").values(*values).iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield from export_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield from export_chunk(chunk)
+
+
+def export_chunk(chunk):
+    pks = [row["pk"] for row in chunk]
+    amenities = {pk: [] for pk in pks}
+    for room_id, amenity_id in (
+        Room.amenities.through.objects.filter(room_id__in=pks)
+        .order_by("pk")
+        .values_list("room_id", "amenity_id")
+    ):
+        amenities[room_id].append(amenity_id)
+    photos = {pk: [] for pk in pks}
+    for room_id, url in (
+        Photo.objects.filter(room_id__in=pks)
+        .order_by("pk")
+        .values_list("room_id", "file")
+    ):
+        photos[room_id].append(url)
+    for row in chunk:
+        pk = row.pop("pk")
+        row["amenities"] = amenities[pk]
+        row["photos"] = photos[pk]
+        yield row
+
+
+class Echo:
+    """csv.writer 가 쓴 줄을 그대로 돌려주는 가짜 파일"""
+
+    def write(self, value):
+        return value
+
+
+def write_lines(rows, format):
+    """export_rows 결과를 CSV/JSONL 텍스트 줄로"""
+    if format == "csv":
+        writer = csv.writer(Echo())
+        yield writer.writerow(FIELDS)
+        for row in rows:
+            for field in LIST_FIELDS:
+                row[field] = LIST_SEPARATOR.join(str(item) for item in row[field])
+            yield writer.writerow([row[field] for field in FIELDS])
+    else:
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + "\n"
@@ -1,14 +1,23 @@
 from django.urls import path
+from geo.views import Nearby, WithinBox
+from .models import Room
+from .serializers import RoomListSerializer
 from . import views
 
 urlpatterns = [
     path("", views.Rooms.as_view()),
+    path("available", views.AvailableRooms.as_view()),
+    path("nearby", Nearby.as_view(model=Room, serializer_class=RoomListSerializer)),
+    path("bbox", WithinBox.as_view(model=Room, serializer_class=RoomListSerializer)),
+    path("import", views.RoomImport.as_view()),
+    path("export", views.RoomExport.as_view()),
     path("<int:pk>", views.RoomDetail.as_view()),
     path("<int:pk>/reviews", views.RoomReviews.as_view()),
     path("<int:pk>/amenities", views.RoomAmenities.as_view()),
     path("<int:pk>/photos", views.RoomPhotos.as_view()),
     path("<int:pk>/bookings", views.RoomBookings.as_view()),
     path("<int:pk>/bookings/check", views.RoomBookingCheck.as_view()),
+    path("<int:pk>/calendar", views.RoomCalendar.as_view()),
     path("amenities/", views.Amenities.as_view()),
     path("amenities/<int:pk>", views.AmenityDetail.as_view()),
     path("sentry-debug/", views.trigger_error),
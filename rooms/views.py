@@ -1,29 +1,53 @@
+import io
+import asyncio
 from django.conf import settings
-from django.utils import timezone
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from django.db import transaction
 from rest_framework.response import Response
 from rest_framework.exceptions import (
     NotFound,
-    NotAuthenticated,
     ParseError,
     PermissionDenied,
 )
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.status import HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST, HTTP_200_OK
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.status import (
+    HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_304_NOT_MODIFIED,
+)
+from django.utils.http import parse_etags, quote_etag
 from .models import Room, Amenity
+from common.pagination import CursorPagination
+from common.cache import cache_response
+from common.mixins import ConditionalGetMixin
+from common.m2m import get_related, assign_related
+from common.streaming import stream_response, wants_stream
+from common.fast import apaginated_response, paginated_response
+from common.aio import AsyncAPIView, aget_object, alist, set_prefetched
+from wishlists.liked import get_liked
 from categories.models import Category
 from .serializers import AmenitySerializer, RoomListSerializer, RoomDetailSerializer
 from reviews.serializers import ReviewSerializer
+from medias.models import Photo
+from medias import variants
 from medias.serializers import PhotoSerializer
 from bookings.models import Booking
 from bookings.serializers import PublicBookingSerializer, CreateRoomBookingSerializer
-import time
-from datetime import datetime, timezone, timedelta
-from django.utils import timezone as dj_timezone
+from bookings.availability import available_rooms, is_room_available
+from bookings.occupancy import get_month
+from currencies.rates import price_validator, viewer_currency
+from bookings.dates import get_zone, local_today
+from .filters import filter_rooms, get_ordering
+from .transfer import FORMATS, export_rows, guess_format, import_rooms, write_lines
+import calendar
+from datetime import date
 
 
 class Amenities(APIView):
+    @cache_response("amenities")
     def get(self, request):
         all_amenities = Amenity.objects.all()
         serializer = AmenitySerializer(all_amenities, many=True)
@@ -68,16 +92,60 @@ class AmenityDetail(APIView):
         return Response(status=HTTP_204_NO_CONTENT)
 
 
-class Rooms(APIView):
+def with_cover_photo(rooms):
+    # 목록은 사진 대신 대표 사진만 JOIN 해서 같이 읽음: 방 개수와 상관없이 쿼리 1번 (rating 은 방 컬럼)
+    return rooms.select_related("cover_photo")
+
+
+class ViewerMixin:
+    """is_liked, local_price 가 쓰는 요청 단위 값을 인증과 같은 스레드에서 미리 읽어둠 (common.aio)"""
+
+    def preload(self, request, *args, **kwargs):
+        get_liked(request)
+        viewer_currency(request)
+
+
+def parse_stay(request):
+    try:
+        check_in = date.fromisoformat(request.query_params.get("check_in"))
+        check_out = date.fromisoformat(request.query_params.get("check_out"))
+    except (TypeError, ValueError):
+        raise ParseError("check_in, check_out should be YYYY-MM-DD")
+    if check_out <= check_in:
+        raise ParseError("check_out should be after check_in")
+    return check_in, check_out
+
+
+class Rooms(ViewerMixin, AsyncAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
-    def get(self, request):
-        all_rooms = Room.objects.all()
-        serializer = RoomListSerializer(
-            all_rooms, many=True, context={"request": request}
+    @cache_response("rooms", anonymous_only=True)
+    async def get(self, request):
+        """필터/정렬은 rooms.filters 참고"""
+        ordering = get_ordering(request.query_params)
+        all_rooms = with_cover_photo(
+            filter_rooms(
+                Room.objects.all(), request.query_params, viewer_currency(request)
+            )
+        )
+        if wants_stream(request):
+            return stream_response(
+                all_rooms.order_by(*ordering),
+                RoomListSerializer,
+                {"request": request},
+            )
+        paginator = CursorPagination(
+            ordering=ordering,
+            page_size=settings.CATALOG_PAGE_SIZE,
+        )
+        return await apaginated_response(
+            paginator,
+            request,
+            all_rooms,
+            RoomListSerializer,
+            {"request": request},
         )
-        return Response(serializer.data)
 
     def post(self, request):
         serializer = RoomDetailSerializer(data=request.data)
@@ -110,18 +178,15 @@ class Rooms(APIView):
             #         )
             # except Exception:
             #     raise ParseError("Amenity not found")
+            amenities = get_related(
+                Amenity, request.data.get("amenities"), "Amenity"
+            )
             with transaction.atomic():
                 new_room = serializer.save(
                     owner=request.user,
                     category=category,
                 )
-                amenities = request.data.get("amenities")
-                for amenity_pk in amenities:
-                    try:
-                        amenity = Amenity.objects.get(pk=amenity_pk)
-                    except Amenity.DoesNotExist:
-                        raise ParseError("Amenity Not found!!")
-                    new_room.amenities.add(amenity)
+                assign_related(new_room.amenities, amenities)
 
                 return Response(
                     RoomDetailSerializer(
@@ -135,9 +200,19 @@ class Rooms(APIView):
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
 
 
-class RoomDetail(APIView):
+class RoomDetail(ViewerMixin, ConditionalGetMixin, AsyncAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
+    validator_model = Room
+    # owner, reviews__user: 응답에 들어가는 프로필 (User.updated_at)
+    validator_relations = ("category", "amenities", "photos", "reviews", "owner", "reviews__user")
+
+    def get_validator_extra(self, request, pk):
+        return [
+            request.user.pk,
+            pk in get_liked(request)["rooms"],
+            *price_validator(request),
+        ]
 
     def get_object(self, pk):
         try:
@@ -146,8 +221,15 @@ class RoomDetail(APIView):
             raise NotFound
         return room
 
-    def get(self, request, pk):
-        room = self.get_object(pk)
+    @cache_response("rooms", anonymous_only=True)
+    async def get(self, request, pk):
+        # 방 (owner, category 는 JOIN, rating 은 방 컬럼), 편의시설, 사진을 같이 기다림
+        room, amenities, photos = await asyncio.gather(
+            aget_object(Room.objects.select_related("owner", "category"), pk=pk),
+            alist(Amenity.objects.filter(rooms=pk)),
+            alist(Photo.objects.filter(room=pk)),
+        )
+        set_prefetched(room, amenities=amenities, photos=photos)
         serializer = RoomDetailSerializer(room, context={"request": request})
         return Response(serializer.data)
 
@@ -174,6 +256,9 @@ class RoomDetail(APIView):
                 except Category.DoesNotExist:
                     raise ParseError("Category not found")
 
+            amenities = get_related(
+                Amenity, request.data.get("amenities"), "Amenity"
+            )
             with transaction.atomic():
                 if category_pk:
                     updated_room = serializer.save(
@@ -182,12 +267,8 @@ class RoomDetail(APIView):
                 else:
                     updated_room = serializer.save()
 
-                amenities = request.data.get("amenities")
                 if amenities:
-                    updated_room.amenities.clear()
-                    for amenity_pk in amenities:
-                        amenity = Amenity.objects.get(pk=amenity_pk)
-                        updated_room.amenities.add(amenity)
+                    assign_related(updated_room.amenities, amenities, replace=True)
                 return Response(
                     RoomDetailSerializer(
                         updated_room,
@@ -206,7 +287,7 @@ class RoomDetail(APIView):
         return Response(status=HTTP_200_OK)
 
 
-class RoomReviews(APIView):
+class RoomReviews(AsyncAPIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -217,18 +298,14 @@ class RoomReviews(APIView):
             raise NotFound
         return room
 
-    def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-        room = self.get_object(pk)
-        serializer = ReviewSerializer(room.reviews.all()[start:end], many=True)
-        return Response(serializer.data)
+    async def get(self, request, pk):
+        room = await aget_object(Room.objects.all(), pk=pk)
+        return await apaginated_response(
+            CursorPagination(),
+            request,
+            room.reviews.select_related("user"),
+            ReviewSerializer,
+        )
 
     def post(self, request, pk):
         serialzer = ReviewSerializer(data=request.data)
@@ -241,28 +318,16 @@ class RoomReviews(APIView):
             return Response(serialzer.data)
 
 
-class RoomAmenities(APIView):
-
-    def get_object(self, pk):
-        try:
-            room = Room.objects.get(pk=pk)
-        except Room.DoesNotExist:
-            raise NotFound
-        return room
+class RoomAmenities(AsyncAPIView):
 
-    def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
-        room = self.get_object(pk)
-        serializer = AmenitySerializer(room.amenities.all()[start:end], many=True)
-        return Response(serializer.data)
+    async def get(self, request, pk):
+        room = await aget_object(Room.objects.all(), pk=pk)
+        return await apaginated_response(
+            CursorPagination(),
+            request,
+            room.amenities.all(),
+            AmenitySerializer,
+        )
 
 
 class RoomPhotos(APIView):
@@ -281,7 +346,10 @@ class RoomPhotos(APIView):
             raise PermissionDenied
         serializer = PhotoSerializer(data=request.data)
         if serializer.is_valid():
-            photo = serializer.save(room=room)
+            # 크기별 사본을 기록하거나 만들어서 같이 저장 (medias.variants)
+            photo = serializer.save(
+                room=room, variants=variants.make(serializer.validated_data["file"])
+            )
             serializer = PhotoSerializer(photo)
             return Response(serializer.data)
         else:
@@ -299,43 +367,18 @@ class RoomBookings(APIView):
 
     def get(self, request, pk):
         room = self.get_object(pk)
-        now = dj_timezone.localtime(dj_timezone.now()).date()
+        now = local_today(get_zone(room.timezone))
 
         bookings = Booking.objects.filter(
             room=room,
             kind=Booking.BookingKindChoices.ROOM,
             check_in__gt=now,
-        )
-        serializer = PublicBookingSerializer(
-            bookings,
-            many=True,
-        )
-        return Response(serializer.data)
+        ).order_by("check_in")
+        return stream_response(bookings, PublicBookingSerializer)
 
     def post(self, request, pk):
         room = self.get_object(pk)
-        if ("T" and "Z") in request.data.get("check_in") and (
-            "T" and "Z"
-        ) in request.data.get("check_out"):
-            # Parse the UTC timestamp
-            utc_time_1 = datetime.strptime(
-                request.data["check_in"], "%Y-%m-%dT%H:%M:%S.%fZ"
-            )
-            utc_time_2 = datetime.strptime(
-                request.data["check_out"], "%Y-%m-%dT%H:%M:%S.%fZ"
-            )
-
-            # Define the KST timezone as UTC+9
-            kst = timezone(timedelta(hours=9))
-
-            # Convert the parsed time to KST
-            request.data["check_in"] = (
-                utc_time_1.replace(tzinfo=timezone.utc).astimezone(kst).date()
-            )
-            request.data["check_out"] = (
-                utc_time_2.replace(tzinfo=timezone.utc).astimezone(kst).date()
-            )
-
+        # 2030-05-10T15:00:00.000Z 같은 시간도 방 시간대 날짜로 바꿔줌 (bookings.dates)
         serializer = CreateRoomBookingSerializer(
             data=request.data,
             context={"room": room},
@@ -366,16 +409,107 @@ class RoomBookingCheck(APIView):
 
     def get(self, request, pk):
         room = self.get_object(pk)
-        check_in = request.query_params.get("check_in")
-        check_out = request.query_params.get("check_out")
-        if Booking.objects.filter(
-            room=room,
-            check_in__lte=check_out,
-            check_out__gte=check_in,
-        ).exists():
-            return Response({"ok": False})
-        else:
-            return Response({"ok": True})
+        check_in, check_out = parse_stay(request)
+        return Response({"ok": is_room_available(room, check_in, check_out)})
+
+
+class RoomCalendar(APIView):
+    """
+    한달치 예약 현황 (?month=YYYY-MM)
+
+    nights 의 n번째 비트가 1이면 (n+1)일 밤이 예약됨.
+    ETag 로 바뀐게 없으면 304 를 돌려줌.
+    """
+
+    def get_object(self, pk):
+        try:
+            return Room.objects.get(pk=pk)
+        except Room.DoesNotExist:
+            raise NotFound
+
+    def get(self, request, pk):
+        room = self.get_object(pk)
+        try:
+            year, month = map(int, request.query_params.get("month", "").split("-"))
+            occupancy = get_month(room.pk, year, month)
+        except (ValueError, OverflowError):
+            raise ParseError("month should be YYYY-MM")
+
+        etag = quote_etag(f"{pk}-{occupancy.month:%Y-%m}-{occupancy.nights:x}")
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            {
+                "month": f"{occupancy.month:%Y-%m}",
+                "days": calendar.monthrange(year, month)[1],
+                "nights": occupancy.nights,
+            },
+            headers=headers,
+        )
+
+
+class AvailableRooms(APIView):
+    """check_in ~ check_out 동안 예약 가능한 방 목록 (필터/정렬은 Rooms.get 과 같음, rooms.filters)"""
+
+    def get(self, request):
+        check_in, check_out = parse_stay(request)
+        rooms = filter_rooms(
+            Room.objects.all(), request.query_params, viewer_currency(request)
+        )
+        rooms = with_cover_photo(available_rooms(check_in, check_out, rooms))
+        return paginated_response(
+            CursorPagination(
+                ordering=get_ordering(request.query_params),
+                page_size=settings.CATALOG_PAGE_SIZE,
+            ),
+            request,
+            rooms,
+            RoomListSerializer,
+            {"request": request},
+        )
+
+
+class RoomImport(APIView):
+    """
+    내 방을 CSV / JSONL 파일로 한번에 등록 (multipart "file", 확장자로 형식 구분)
+
+    잘못된 줄은 건너뛰고 줄 번호와 에러를 같이 돌려줌.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        file = request.FILES.get("file")
+        if file is None:
+            raise ParseError("file is required")
+        format = guess_format(file.name)
+        if format is None:
+            raise ParseError("file should be .csv or .jsonl")
+        # 엑셀에서 저장한 CSV (BOM, \r\n, 칸 안의 줄바꿈) 도 csv 모듈이 직접 처리하게 newline=""
+        lines = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        report = import_rooms(lines, format, request.user)
+        if not report["created"]:
+            return Response(report, status=HTTP_400_BAD_REQUEST)
+        return Response(report, status=HTTP_201_CREATED)
+
+
+class RoomExport(APIView):
+    """내 방 목록을 ?type=csv | jsonl 로 내려받기 (한 줄씩 스트리밍)"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        format = request.query_params.get("type", "csv")
+        if format not in FORMATS:
+            raise ParseError("type should be csv or jsonl")
+        rows = export_rows(Room.objects.filter(owner=request.user))
+        response = StreamingHttpResponse(
+            write_lines(rows, format),
+            content_type="text/csv" if format == "csv" else "application/x-ndjson",
+        )
+        response["Content-Disposition"] = f'attachment; filename="rooms.{format}"'
+        return response
 
 
 def trigger_error(request):
@@ -0,0 +1,15 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = (
+        "title",
+        "kind",
+        "object_id",
+        "updated_at",
+    )
+
+    list_filter = ("kind",)
+    search_fields = ("title",)
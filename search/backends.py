@@ -0,0 +1,100 @@
+"""
+DB 별 전문 검색 쿼리
+
+search(queryset, terms) 는 검색어에 맞는 방/체험만 남기고,
+rank(queryset, terms) 는 관련도 점수를 rank 로 붙임 (클수록 관련 있음).
+검색어는 단어(\\w+) 들로 잘라서 모든 단어가 (앞부분이라도) 들어있는 것만 찾음.
+"""
+
+import re
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from .index import BODY_FIELDS, get_kind
+
+MAX_TERMS = 8
+
+
+def tokenize(query):
+    return re.findall(r"\w+", query or "")[:MAX_TERMS]
+
+
+class SQLiteBackend:
+    """FTS5 가상 테이블 search_fts (bm25 는 작을수록 관련 있어서 부호를 바꿈)"""
+
+    def match(self, terms):
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, terms):
+        return queryset.filter(
+            pk__in=RawSQL(
+                "SELECT object_id FROM search_fts WHERE search_fts MATCH %s AND kind = %s",
+                (self.match(terms), get_kind(queryset.model)),
+            )
+        )
+
+    def rank(self, queryset, terms):
+        table = queryset.model._meta.db_table
+        return queryset.annotate(
+            rank=RawSQL(
+                "SELECT -bm25(search_fts, 10.0, 1.0) FROM search_fts "
+                "WHERE search_fts MATCH %s AND kind = %s "
+                f'AND object_id = "{table}"."id"',
+                (self.match(terms), get_kind(queryset.model)),
+                output_field=FloatField(),
+            )
+        )
+
+
+class PostgreSQLBackend:
+    """search_searchdocument.vector (tsvector, GIN)"""
+
+    def match(self, terms):
+        return " & ".join(f"{term}:*" for term in terms)
+
+    def search(self, queryset, terms):
+        return queryset.filter(
+            pk__in=RawSQL(
+                "SELECT object_id FROM search_searchdocument "
+                "WHERE kind = %s AND vector @@ to_tsquery('simple', %s)",
+                (get_kind(queryset.model), self.match(terms)),
+            )
+        )
+
+    def rank(self, queryset, terms):
+        table = queryset.model._meta.db_table
+        # cursor 값이 그대로 비교되게 float8 로
+        return queryset.annotate(
+            rank=RawSQL(
+                "SELECT ts_rank(vector, to_tsquery('simple', %s))::float8 "
+                "FROM search_searchdocument "
+                f'WHERE kind = %s AND object_id = "{table}"."id"',
+                (self.match(terms), get_kind(queryset.model)),
+                output_field=FloatField(),
+            )
+        )
+
+
+class LikeBackend:
+    """전문 검색 인덱스가 없는 DB 용 (icontains, 순위 없음)"""
+
+    def search(self, queryset, terms):
+        for term in terms:
+            condition = Q(name__icontains=term)
+            for field in BODY_FIELDS:
+                condition |= Q(**{f"{field}__icontains": term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def rank(self, queryset, terms):
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "postgresql": PostgreSQLBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, LikeBackend)()
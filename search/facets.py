@@ -0,0 +1,66 @@
+"""
+검색 결과의 facet 개수
+
+모두 검색 결과 queryset 을 서브쿼리로 쓰는 GROUP BY / 집계 쿼리라서 결과 수와 상관없이 facet 당 쿼리 한번.
+"""
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+
+def counts(queryset, field, label=None):
+    values = (field, label) if label else (field,)
+    rows = (
+        queryset.filter(**{f"{field}__isnull": False})
+        .values(*values)
+        .annotate(count=Count("pk"))
+        .order_by("-count", field)
+    )
+    return [
+        {
+            "value": row[field],
+            **({"name": row[label]} if label else {}),
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def price_buckets(queryset):
+    """SEARCH_PRICE_BUCKETS 경계로 나눈 [min, max) 구간별 개수, 마지막 구간은 max 없음"""
+    bounds = list(settings.SEARCH_PRICE_BUCKETS)
+    buckets = [
+        (low, bounds[i + 1] if i + 1 < len(bounds) else None)
+        for i, low in enumerate(bounds)
+    ]
+    aggregates = {}
+    for i, (low, high) in enumerate(buckets):
+        condition = Q(price__gte=low)
+        if high is not None:
+            condition &= Q(price__lt=high)
+        aggregates[f"bucket_{i}"] = Count("pk", filter=condition)
+    row = queryset.order_by().aggregate(**aggregates)
+    return [
+        {"min": low, "max": high, "count": row[f"bucket_{i}"]}
+        for i, (low, high) in enumerate(buckets)
+    ]
+
+
+def room_facets(rooms):
+    rooms = rooms.order_by()
+    return {
+        "kind": counts(rooms, "kind"),
+        "category": counts(rooms, "category", "category__name"),
+        "pet_friendly": counts(rooms, "pet_friendly"),
+        "amenities": counts(rooms, "amenities", "amenities__name"),
+        "price": price_buckets(rooms),
+    }
+
+
+def experience_facets(experiences):
+    experiences = experiences.order_by()
+    return {
+        "category": counts(experiences, "category", "category__name"),
+        "perks": counts(experiences, "perks", "perks__name"),
+        "price": price_buckets(experiences),
+    }
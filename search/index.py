@@ -0,0 +1,51 @@
+"""
+방/체험 -> SearchDocument
+
+제목은 name, 본문은 description, city, country, address.
+"""
+
+from .models import SearchDocument
+
+BODY_FIELDS = ("description", "city", "country", "address")
+
+
+def get_kind(instance):
+    return instance._meta.app_label
+
+
+def document(instance):
+    return SearchDocument(
+        kind=get_kind(instance),
+        object_id=instance.pk,
+        title=instance.name,
+        body="\n".join(str(getattr(instance, field) or "") for field in BODY_FIELDS),
+    )
+
+
+def index(instance):
+    new = document(instance)
+    SearchDocument.objects.update_or_create(
+        kind=new.kind,
+        object_id=new.object_id,
+        defaults={"title": new.title, "body": new.body},
+    )
+
+
+def unindex(instance):
+    SearchDocument.objects.filter(
+        kind=get_kind(instance),
+        object_id=instance.pk,
+    ).delete()
+
+
+def bulk_index(instances, batch_size=1000):
+    """bulk_create 처럼 signal 없이 만든 방/체험들을 한번에 (다시) 색인"""
+    documents = [document(instance) for instance in instances]
+    if not documents:
+        return 0
+    SearchDocument.objects.filter(
+        kind=documents[0].kind,
+        object_id__in=[document.object_id for document in documents],
+    ).delete()
+    SearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+    return len(documents)
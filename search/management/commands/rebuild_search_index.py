@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from experiences.models import Experience
+from rooms.models import Room
+from search.index import bulk_index
+from search.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = "방/체험 검색 인덱스를 처음부터 다시 만듭니다. (bulk_create 등 signal 없이 바뀐 데이터가 있을때)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        SearchDocument.objects.all().delete()
+        for model in (Room, Experience):
+            count = 0
+            chunk = []
+            for instance in model.objects.order_by("pk").iterator(chunk_size=chunk_size):
+                chunk.append(instance)
+                if len(chunk) >= chunk_size:
+                    count += bulk_index(chunk)
+                    chunk = []
+            count += bulk_index(chunk)
+            self.stdout.write(
+                self.style.SUCCESS(f"{count} {model._meta.verbose_name_plural} indexed")
+            )
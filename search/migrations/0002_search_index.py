@@ -0,0 +1,74 @@
+# Generated by Django 4.1 on 2026-10-18 19:31
+
+from django.db import migrations
+
+# DB 마다 다른 전문 검색 인덱스
+# SQLite: FTS5 가상 테이블, search_searchdocument 가 바뀌면 trigger 로 같이 바뀜
+SQLITE_FORWARD = [
+    '''
+    CREATE VIRTUAL TABLE search_fts USING fts5(
+        title, body, kind UNINDEXED, object_id UNINDEXED, tokenize = 'unicode61'
+    )
+    ''',
+    '''
+    CREATE TRIGGER search_fts_insert AFTER INSERT ON search_searchdocument BEGIN
+        INSERT INTO search_fts (rowid, title, body, kind, object_id)
+        VALUES (new.id, new.title, new.body, new.kind, new.object_id);
+    END
+    ''',
+    '''
+    CREATE TRIGGER search_fts_update AFTER UPDATE ON search_searchdocument BEGIN
+        UPDATE search_fts
+        SET title = new.title, body = new.body, kind = new.kind, object_id = new.object_id
+        WHERE rowid = new.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER search_fts_delete AFTER DELETE ON search_searchdocument BEGIN
+        DELETE FROM search_fts WHERE rowid = old.id;
+    END
+    ''',
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS search_fts_insert',
+    'DROP TRIGGER IF EXISTS search_fts_update',
+    'DROP TRIGGER IF EXISTS search_fts_delete',
+    'DROP TABLE IF EXISTS search_fts',
+]
+# PostgreSQL: 제목(A) 본문(B) 가중치를 준 generated tsvector 컬럼 + GIN 인덱스
+POSTGRESQL_FORWARD = [
+    '''
+    ALTER TABLE search_searchdocument ADD COLUMN vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A') ||
+        setweight(to_tsvector('simple', body), 'B')
+    ) STORED
+    ''',
+    'CREATE INDEX search_document_vector ON search_searchdocument USING gin (vector)',
+]
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS search_document_vector',
+    'ALTER TABLE search_searchdocument DROP COLUMN IF EXISTS vector',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.1 on 2026-10-18 19:40
+
+from django.db import migrations
+
+BODY_FIELDS = ('description', 'city', 'country', 'address')
+
+
+def backfill_documents(apps, schema_editor):
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    for kind, label in (('rooms', 'rooms.Room'), ('experiences', 'experiences.Experience')):
+        model = apps.get_model(label)
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(
+                    kind=kind,
+                    object_id=instance.pk,
+                    title=instance.name,
+                    body='\n'.join(str(getattr(instance, field) or '') for field in BODY_FIELDS),
+                )
+                for instance in model.objects.iterator(chunk_size=1000)
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_search_index'),
+        ('rooms', '0007_room_rooms_room_created_2438c1_idx'),
+        ('experiences', '0005_experience_experiences_created_9874c7_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+from django.db import models
+from common.models import CommonModel
+
+
+class SearchDocument(CommonModel):
+    """
+    방/체험 하나의 검색용 텍스트
+
+    search.signals 에서 방/체험이 저장될때마다 갱신됨 (rebuild_search_index 커맨드로 전체 재생성).
+    실제 검색 인덱스는 DB 마다 다름 (0002 migration)
+    - SQLite: FTS5 가상 테이블 search_fts (trigger 로 이 테이블과 같이 바뀜)
+    - PostgreSQL: 이 테이블의 generated tsvector 컬럼 + GIN 인덱스
+    """
+
+    class KindChoices(models.TextChoices):
+        ROOMS = "rooms", "Rooms"
+        EXPERIENCES = "experiences", "Experiences"
+
+    kind = models.CharField(
+        max_length=20,
+        choices=KindChoices.choices,
+    )
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=250)
+    body = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"],
+                name="search_document_unique_object",
+            ),
+        ]
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from experiences.models import Experience
+from rooms.models import Room
+from . import index
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_save, sender=Experience)
+def index_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index.index(instance)
+
+
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=Experience)
+def unindex_on_delete(sender, instance, **kwargs):
+    index.unindex(instance)
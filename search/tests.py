@@ -0,0 +1,137 @@
+from rest_framework.test import APITestCase
+from categories.models import Category
+from experiences.models import Experience
+from rooms.models import Amenity, Room
+from users.models import User
+from .models import SearchDocument
+
+
+class TestSearch(APITestCase):
+    URL = "/api/v1/search/"
+
+    def setUp(self):
+        self.user = User.objects.create(username="host")
+        self.beach = Category.objects.create(
+            name="Beach", kind=Category.CategoryKindChoices.ROOMS
+        )
+        self.wifi = Amenity.objects.create(name="wifi")
+        self.pool = Room.objects.create(
+            name="Ocean view pool villa",
+            price=150000,
+            rooms=3,
+            toilets=2,
+            description="Private pool next to the beach",
+            address="Haeundae",
+            city="부산",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            category=self.beach,
+            owner=self.user,
+        )
+        self.pool.amenities.add(self.wifi)
+        self.studio = Room.objects.create(
+            name="Cozy studio",
+            price=40000,
+            rooms=1,
+            toilets=1,
+            description="Small room with an ocean glimpse",
+            address="Gangnam",
+            kind=Room.RoomKindChoices.PRIVATE_ROOM,
+            pet_friendly=False,
+            owner=self.user,
+        )
+        Room.objects.create(
+            name="Mountain cabin",
+            price=90000,
+            rooms=2,
+            toilets=1,
+            description="Quiet forest",
+            address="Pyeongchang",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_ranked_results(self):
+        data = self.search(q="ocean")
+        # 제목에 있는게 본문에만 있는 것보다 앞
+        self.assertEqual(
+            [room["pk"] for room in data["results"]],
+            [self.pool.pk, self.studio.pk],
+        )
+        self.assertEqual(data["results"][0]["name"], "Ocean view pool villa")
+        # 앞부분만 맞아도 찾고, 모든 단어가 있어야 함
+        self.assertEqual(len(self.search(q="oce poo")["results"]), 1)
+        self.assertEqual(len(self.search(q="부산")["results"]), 1)
+        self.assertEqual(self.search(q='"ocean" -')["results"][0]["pk"], self.pool.pk)
+
+    def test_facets(self):
+        facets = self.search(q="ocean")["facets"]
+        self.assertEqual(
+            facets["kind"],
+            [
+                {"value": "entire_place", "count": 1},
+                {"value": "private_room", "count": 1},
+            ],
+        )
+        self.assertEqual(
+            facets["category"],
+            [{"value": self.beach.pk, "name": "Beach", "count": 1}],
+        )
+        self.assertEqual(
+            facets["amenities"],
+            [{"value": self.wifi.pk, "name": "wifi", "count": 1}],
+        )
+        self.assertEqual(
+            [bucket["count"] for bucket in facets["price"]],
+            [1, 0, 1, 0, 0],
+        )
+        data = self.search(q="ocean", pet_friendly="false")
+        self.assertEqual([room["pk"] for room in data["results"]], [self.studio.pk])
+
+    def test_incremental_index(self):
+        self.pool.name = "Sunset villa"
+        self.pool.save()
+        self.assertEqual(len(self.search(q="sunset")["results"]), 1)
+        self.pool.delete()
+        self.assertEqual(self.search(q="sunset")["results"], [])
+        self.assertFalse(SearchDocument.objects.filter(object_id=self.pool.pk, kind="rooms").exists())
+
+    def test_cursor_pages(self):
+        for i in range(30):
+            Room.objects.create(
+                name=f"ocean room {i}",
+                price=1,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="addr",
+                owner=self.user,
+            )
+        seen = []
+        response = self.client.get(self.URL, {"q": "ocean"})
+        while True:
+            seen += [room["pk"] for room in response.json()["results"]]
+            match = response.get("Link", "")
+            if 'rel="next"' not in match:
+                break
+            response = self.client.get(match.split(">")[0][1:])
+        self.assertEqual(len(seen), 32)
+        self.assertEqual(len(set(seen)), 32)
+
+    def test_experiences(self):
+        Experience.objects.create(
+            name="Ocean kayak tour",
+            host=self.user,
+            price=30000,
+            address="Jeju",
+            start="09:00",
+            end="12:00",
+            description="Paddle",
+        )
+        data = self.search(q="kayak", type="experiences")
+        self.assertEqual(data["results"][0]["name"], "Ocean kayak tour")
+        self.assertEqual(data["facets"]["price"][0]["count"], 1)
@@ -0,0 +1,81 @@
+from django.conf import settings
+from rest_framework.views import APIView
+from rest_framework.exceptions import ParseError
+from common.fast import FastSerializer
+from common.pagination import CursorPagination
+from currencies.rates import filter_price, viewer_currency
+from experiences.models import Experience
+from experiences.serializers import ExperienceListSerializer
+from rooms.filters import filter_rooms, parse_ids
+from rooms.models import Room
+from rooms.serializers import RoomListSerializer
+from .backends import get_backend, tokenize
+from .facets import experience_facets, room_facets
+
+
+def filter_experiences(experiences, params, currency=None):
+    if params.get("category"):
+        experiences = experiences.filter(
+            category__in=parse_ids(params["category"], "category")
+        )
+    for perk_pk in parse_ids(params.get("perks", ""), "perks"):
+        experiences = experiences.filter(perks=perk_pk)
+    return filter_price(experiences, params, currency or settings.PRICE_CURRENCY)
+
+
+SEARCH_TYPES = {
+    "rooms": (Room, filter_rooms, room_facets, RoomListSerializer),
+    "experiences": (
+        Experience,
+        filter_experiences,
+        experience_facets,
+        ExperienceListSerializer,
+    ),
+}
+
+
+class Search(APIView):
+    """
+    방/체험 검색
+
+    ?q=검색어&type=rooms|experiences 와 필터 (rooms: rooms.filters 의 필터 /
+    experiences: category, perks, min_price, max_price)
+    결과는 관련도 순 cursor 페이지 (Link 헤더) 이고, facets 는 필터까지 적용한 전체 결과의 개수.
+    facets 의 가격 구간은 기준 통화 (settings.PRICE_CURRENCY) 임.
+    q 가 없으면 필터만 적용하고 최신순.
+    """
+
+    def get(self, request):
+        search_type = request.query_params.get("type", "rooms")
+        if search_type not in SEARCH_TYPES:
+            raise ParseError("type should be rooms or experiences")
+        model, filter_objects, get_facets, serializer_class = SEARCH_TYPES[search_type]
+
+        objects = filter_objects(
+            model.objects.all(), request.query_params, viewer_currency(request)
+        )
+        terms = tokenize(request.query_params.get("q"))
+        if terms:
+            backend = get_backend()
+            objects = backend.search(objects, terms)
+            ranked = backend.rank(objects, terms)
+            ordering = ("-rank", "pk")
+        else:
+            ranked = objects
+            ordering = ("-created_at", "-pk")
+
+        fast = FastSerializer(serializer_class, {"request": request})
+        paginator = CursorPagination(
+            ordering=ordering,
+            page_size=settings.CATALOG_PAGE_SIZE,
+        )
+        page = paginator.paginate_queryset(
+            fast.values(ranked, *[field.lstrip("-") for field in ordering]),
+            request,
+        )
+        return paginator.get_paginated_response(
+            {
+                "results": fast.serialize(page),
+                "facets": get_facets(objects),
+            }
+        )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from .models import RevokedToken, User
 
 
 # Register your models here.
@@ -55,3 +55,12 @@ class CustomUserAdmin(UserAdmin):
         "name",
         "is_host",
     )
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = (
+        "jti",
+        "expires_at",
+        "created_at",
+    )
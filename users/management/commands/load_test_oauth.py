@@ -0,0 +1,79 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from users.oauth import GitHub, close_client, open_client
+from users.oauth_stub import StubOAuthServer
+
+
+def legacy_github_login(server, code):
+    """예전 GithubLogin.post 방식: requests 로 순서대로 3번, 커넥션 재사용/timeout 없음"""
+    token = requests.post(
+        f"{server.url}/github/token",
+        data={"code": code},
+        headers={"Accept": "application/json"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    requests.get(f"{server.url}/github/api/user", headers=headers).json()
+    requests.get(f"{server.url}/github/api/user/emails", headers=headers).json()
+
+
+class Command(BaseCommand):
+    help = "로컬 stub OAuth 서버로 GitHub 로그인 provider 요청을 몰아서 보내고 워커 점유 시간을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=200)
+        parser.add_argument("--delay", type=float, default=0.05, help="stub 서버 응답 지연 (초)")
+        parser.add_argument("--workers", type=int, default=4, help="sync 워커 수 (WEB_CONCURRENCY)")
+
+    def handle(self, *args, **options):
+        logins, workers = options["logins"], options["workers"]
+        with StubOAuthServer(delay=options["delay"]) as server:
+            with override_settings(OAUTH_PROVIDERS=server.providers()):
+                self.stdout.write(
+                    f"{'flow':<22} {'wall (s)':>9} {'logins/s':>9} "
+                    f"{'worker busy (s)':>16} {'per login (ms)':>15}"
+                )
+                self.report("sync requests", logins, *self.run_sync(server, logins, workers))
+                self.report("async httpx (1 loop)", logins, *self.run_async(logins))
+
+    def run_sync(self, server, logins, workers):
+        """sync 워커는 provider 응답을 기다리는 동안에도 요청 하나에 묶여 있음"""
+        busy = []
+
+        def login(i):
+            started = time.perf_counter()
+            legacy_github_login(server, f"sync{i}")
+            busy.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(login, range(logins)))
+        return time.perf_counter() - started, sum(busy)
+
+    def run_async(self, logins):
+        """이벤트 루프 하나가 전부 처리, 워커가 실제로 일한 시간은 루프 스레드의 CPU 시간"""
+
+        async def main():
+            provider = GitHub()
+            # ASGI 워커처럼 루프 하나에서 공용 커넥션 풀을 씀
+            await open_client()
+            try:
+                await asyncio.gather(
+                    *(provider.authenticate({"code": f"async{i}"}) for i in range(logins))
+                )
+            finally:
+                await close_client()
+
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        asyncio.run(main())
+        return time.perf_counter() - started, time.thread_time() - cpu_started
+
+    def report(self, name, logins, wall, busy):
+        self.stdout.write(
+            f"{name:<22} {wall:>9.2f} {logins / wall:>9.1f} "
+            f"{busy:>16.2f} {busy / logins * 1000:>15.1f}"
+        )
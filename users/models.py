@@ -49,3 +49,16 @@ class User(AbstractUser):
         blank=True,
         null=True,
     )
+    # 방/체험 상세, 리뷰에 들어가는 프로필이 바뀌면 ETag 도 바뀌도록 (common.mixins)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class RevokedToken(models.Model):
+    """로그아웃 등으로 더 이상 쓸수 없는 refresh token (users.tokens)"""
+
+    jti = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,230 @@
+"""
+소셜 로그인 (GitHub, Kakao, Naver) 비동기 provider
+
+ASGI (uvicorn 워커) 에서 provider 응답을 기다리는 동안 워커를 붙잡지 않도록 전부 await 로 요청함.
+ASGI lifespan (common.asgi, settings.ASGI_LIFESPAN) 이 서버 이벤트 루프에 httpx.AsyncClient 하나를 열어두고
+(keep-alive 커넥션 풀, open_client) 종료할때 닫음 (close_client).
+그 밖의 루프 (WSGI / 테스트의 async_to_sync 는 요청마다 새 루프) 에서는 로그인 한번 동안만 쓰는 클라이언트를
+async with 로 열고 닫아서 루프가 끝난 뒤에 커넥션이 남지 않음 (session).
+연결/응답 시간 제한은 settings.OAUTH_TIMEOUT.
+provider 주소와 client id 는 settings.OAUTH_PROVIDERS 에 있어서 테스트/부하 테스트에서는
+로컬 stub 서버 (users.oauth_stub) 로 바꿔서 씀.
+"""
+
+import asyncio
+import contextvars
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+import httpx
+from django.conf import settings
+
+# open_client 로 열어둔 루프별 (공용 클라이언트, 동시 요청 제한)
+_clients = weakref.WeakKeyDictionary()
+# 지금 로그인 (session) 이 쓰는 (클라이언트, 동시 요청 제한)
+_session = contextvars.ContextVar("oauth_session", default=None)
+
+
+class OAuthError(Exception):
+    pass
+
+
+def new_client():
+    """
+    (클라이언트, 동시 요청 제한)
+
+    커넥션 수보다 많은 요청이 httpx 풀에서 기다리면 풀이 요청마다 대기열 전체를 다시 훑어서
+    (요청 수 x 커넥션 수) CPU 를 쓰니까, 커넥션 수 만큼만 풀에 넣고 나머지는 semaphore 에서 기다림.
+    """
+    client = httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.OAUTH_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.OAUTH_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OAUTH_MAX_CONNECTIONS,
+        ),
+        headers={"Accept": "application/json"},
+    )
+    return client, asyncio.Semaphore(settings.OAUTH_MAX_CONNECTIONS)
+
+
+async def open_client():
+    """지금 이벤트 루프에 공용 클라이언트를 열어둠 (ASGI lifespan startup, 부하 테스트)"""
+    loop = asyncio.get_running_loop()
+    if loop not in _clients:
+        _clients[loop] = new_client()
+
+
+async def close_client():
+    """open_client 로 연 클라이언트를 닫음 (ASGI lifespan shutdown)"""
+    pooled = _clients.pop(asyncio.get_running_loop(), None)
+    if pooled is not None:
+        await pooled[0].aclose()
+
+
+@asynccontextmanager
+async def session():
+    """
+    로그인 한번 동안 쓸 (클라이언트, 동시 요청 제한)
+
+    루프에 열어둔 공용 클라이언트가 있으면 그걸 쓰고, 없으면 새로 열었다가 끝나면 닫음.
+    안에서 부르는 request 는 asyncio.gather 로 나눠도 같은 클라이언트를 씀 (contextvar).
+    """
+    pooled = _session.get()
+    if pooled is not None:
+        yield pooled
+        return
+    pooled = _clients.get(asyncio.get_running_loop())
+    if pooled is not None:
+        token = _session.set(pooled)
+        try:
+            yield pooled
+        finally:
+            _session.reset(token)
+        return
+    pooled = new_client()
+    async with pooled[0]:
+        token = _session.set(pooled)
+        try:
+            yield pooled
+        finally:
+            _session.reset(token)
+
+
+async def request(method, url, **kwargs):
+    async with session() as (client, slots):
+        async with slots:
+            return await client.request(method, url, **kwargs)
+
+
+def read_json(response):
+    if response.status_code >= 400:
+        raise OAuthError(f"{response.request.url.path}: {response.status_code}")
+    try:
+        return response.json()
+    except ValueError:
+        raise OAuthError(f"{response.request.url.path}: invalid json")
+
+
+class Provider(ABC):
+    """
+    fetch_token(data) 로 access token 을 받고 fetch_profile(token) 으로 유저 정보를 받음
+
+    profile 은 User 를 찾을 lookup ({"email": ...} 등) 과 새로 만들때 쓸 필드들.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.config = settings.OAUTH_PROVIDERS[self.name]
+
+    @abstractmethod
+    def token_params(self, data):
+        """token_url 에 보낼 값"""
+
+    async def fetch_token(self, data):
+        response = await request(
+            "POST", self.config["token_url"], data=self.token_params(data)
+        )
+        token = read_json(response).get("access_token")
+        if not token:
+            raise OAuthError(f"{self.name}: no access token")
+        return token
+
+    async def get(self, path, token):
+        response = await request(
+            "GET",
+            f"{self.config['api_url']}{path}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return read_json(response)
+
+    @abstractmethod
+    async def fetch_profile(self, token):
+        """{"lookup": {...}, User 필드들...}"""
+
+    async def authenticate(self, data):
+        async with session():
+            token = await self.fetch_token(data)
+            return await self.fetch_profile(token)
+
+
+class GitHub(Provider):
+    name = "github"
+
+    def token_params(self, data):
+        return {
+            "code": data.get("code"),
+            "client_id": self.config["client_id"],
+            "client_secret": self.config["secret"],
+        }
+
+    async def fetch_profile(self, token):
+        # 깃허브 이메일은 private 이라서 따로 요청 url 이 있음 (프로필과 동시에 요청)
+        user_data, emails = await asyncio.gather(
+            self.get("/user", token),
+            self.get("/user/emails", token),
+        )
+        if not isinstance(emails, list) or not emails:
+            raise OAuthError("github: no email")
+        primary = next((email for email in emails if email.get("primary")), emails[0])
+        return {
+            "lookup": {"email": primary["email"]},
+            "username": user_data.get("login"),
+            "email": primary["email"],
+            "name": user_data.get("name") or "No Name",
+            "avatar": user_data.get("avatar_url") or "",
+        }
+
+
+class Kakao(Provider):
+    name = "kakao"
+
+    def token_params(self, data):
+        return {
+            "grant_type": "authorization_code",
+            "client_id": self.config["client_id"],
+            "redirect_uri": self.config["redirect_uri"],
+            "code": data.get("code"),
+        }
+
+    async def fetch_profile(self, token):
+        user_data = await self.get("/v2/user/me", token)
+        try:
+            profile = user_data["kakao_account"]["profile"]
+        except (KeyError, TypeError):
+            raise OAuthError("kakao: no profile")
+        # 카카오는 이메일 동의 권한이 없어서 닉네임으로 찾음 (임시방편)
+        return {
+            "lookup": {"username": profile.get("nickname")},
+            "username": profile.get("nickname"),
+            "name": profile.get("nickname"),
+            "avatar": profile.get("profile_image_url") or "",
+        }
+
+
+class Naver(Provider):
+    name = "naver"
+
+    def token_params(self, data):
+        return {
+            "grant_type": "authorization_code",
+            "client_id": self.config["client_id"],
+            "client_secret": self.config["secret"],
+            "code": data.get("code"),
+            "state": data.get("state"),
+        }
+
+    async def fetch_profile(self, token):
+        user_data = await self.get("/v1/nid/me", token)
+        account = user_data.get("response") if isinstance(user_data, dict) else None
+        if not account:
+            raise OAuthError("naver: no profile")
+        return {
+            "lookup": {"username": account.get("nickname")},
+            "username": account.get("nickname"),
+            "name": account.get("name") or "",
+            "avatar": account.get("profile_image") or "",
+        }
+
+
+PROVIDERS = {provider.name: provider for provider in (GitHub, Kakao, Naver)}
@@ -0,0 +1,135 @@
+"""
+테스트 / 부하 테스트용 로컬 OAuth stub 서버
+
+GitHub, Kakao, Naver 의 token / 프로필 API 를 흉내냄. code 가 그대로 유저 이름이 되고
+delay 초 만큼 늦게 응답해서 provider 왕복 시간을 재현함. "bad" 로 시작하는 code 는 토큰을 안 줌.
+
+    with StubOAuthServer(delay=0.1) as server:
+        with override_settings(OAUTH_PROVIDERS=server.providers()):
+            ...
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class Handler(BaseHTTPRequestHandler):
+    # keep-alive (Content-Length 를 항상 보냄)
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 써서 Nagle 때문에 응답마다 40ms 씩 밀리지 않게
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def token(self):
+        return self.headers.get("Authorization", "").removeprefix("Bearer ").removeprefix("token-")
+
+    def handle_request(self, respond):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            respond()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        code = form.get("code", [""])[0]
+
+        def respond():
+            if not self.path.endswith("/token"):
+                self.send_json({"error": "not found"}, 404)
+            elif not code or code.startswith("bad"):
+                self.send_json({"error": "bad_verification_code"})
+            else:
+                self.send_json({"access_token": f"token-{code}"})
+
+        self.handle_request(respond)
+
+    def do_GET(self):
+        name = self.token()
+        routes = {
+            "/github/api/user": lambda: {
+                "login": name,
+                "name": None,
+                "avatar_url": f"https://avatars.example.com/{name}",
+            },
+            "/github/api/user/emails": lambda: [
+                {"email": f"{name}@users.example.com", "primary": False},
+                {"email": f"{name}@example.com", "primary": True},
+            ],
+            "/kakao/api/v2/user/me": lambda: {
+                "kakao_account": {"profile": {"nickname": name, "profile_image_url": ""}}
+            },
+            "/naver/api/v1/nid/me": lambda: {
+                "response": {"nickname": name, "name": name.title(), "profile_image": ""}
+            },
+        }
+
+        def respond():
+            if self.path not in routes:
+                self.send_json({"error": "not found"}, 404)
+            elif not name:
+                self.send_json({"error": "unauthorized"}, 401)
+            else:
+                self.send_json(routes[self.path]())
+
+        self.handle_request(respond)
+
+
+class StubOAuthServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 부하 테스트에서 커넥션이 한번에 몰려도 안 끊기게 (기본값 5)
+    request_queue_size = 256
+
+    def __init__(self, delay=0.0):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def providers(self):
+        """settings.OAUTH_PROVIDERS 대신 쓸 설정"""
+        return {
+            name: {
+                "client_id": f"{name}-client",
+                "secret": f"{name}-secret",
+                "redirect_uri": "http://127.0.0.1:3000/social",
+                "token_url": f"{self.url}/{name}/token",
+                "api_url": f"{self.url}/{name}/api",
+            }
+            for name in ("github", "kakao", "naver")
+        }
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
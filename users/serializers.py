@@ -25,4 +25,5 @@ class PrivateUserSerializer(ModelSerializer):
             "last_name",
             "groups",
             "user_permissions",
+            "updated_at",
         )
@@ -1,3 +1,207 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from unittest import mock
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APITestCase
+from common import metrics
+from . import oauth, tokens
+from currencies import rates
+from currencies.models import ExchangeRate
+from rooms.models import Room
+from .models import User
+from .oauth_stub import StubOAuthServer
 
-# Create your tests here.
+
+class TestJWT(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="jwt", name="JWT")
+        self.user.set_password("123")
+        self.user.save()
+
+    def login(self):
+        response = self.client.post(
+            "/api/v1/users/jwt-login",
+            {"username": "jwt", "password": "123"},
+        )
+        return response.json()
+
+    def test_authenticate_without_user_query(self):
+        access = self.login()["access"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/wishlists/", HTTP_JWT=access)
+        self.assertEqual(response.status_code, 200)
+        for query in queries:
+            self.assertNotIn('FROM "users_user"', query["sql"])
+
+    def test_room_detail_without_user_query(self):
+        # 가격 통화 (viewer_currency) 와 ETag 계산도 snapshot 으로
+        self.user.currency = "usd"
+        self.user.save()
+        rates.clear()
+        self.addCleanup(rates.clear)
+        ExchangeRate.objects.create(currency="usd", rate="0.00075")
+        room = Room.objects.create(
+            name="Room",
+            price=1000,
+            rooms=1,
+            toilets=1,
+            description="desc",
+            address="addr",
+            owner=User.objects.create(username="host"),
+        )
+        access = self.login()["access"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/v1/rooms/{room.pk}", HTTP_JWT=access)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["currency"], "usd")
+        for query in queries:
+            self.assertNotIn('FROM "users_user" WHERE "users_user"."id" = ', query["sql"])
+
+    def test_outdated_token_is_rejected(self):
+        access = tokens.encode(self.user, tokens.ACCESS, timedelta(minutes=1))
+        with mock.patch("users.tokens.TOKEN_VERSION", tokens.TOKEN_VERSION + 1):
+            with self.assertRaises(AuthenticationFailed):
+                tokens.decode(access, tokens.ACCESS)
+
+    def test_me_loads_full_profile(self):
+        access = self.login()["access"]
+        response = self.client.get("/api/v1/users/me", HTTP_JWT=access)
+        self.assertEqual(response.json()["username"], "jwt")
+
+    def test_refresh_and_logout(self):
+        issued = self.login()
+        response = self.client.post("/api/v1/users/jwt-refresh", {"refresh": issued["refresh"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.client.get("/api/v1/users/me", HTTP_JWT=response.json()["access"]).status_code,
+            200,
+        )
+
+        self.client.post("/api/v1/users/jwt-logout", {"refresh": issued["refresh"]})
+        response = self.client.post("/api/v1/users/jwt-refresh", {"refresh": issued["refresh"]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_rejects_wrong_type_and_expired(self):
+        issued = self.login()
+        response = self.client.get("/api/v1/users/me", HTTP_JWT=issued["refresh"])
+        self.assertEqual(response.status_code, 403)
+
+        expired = tokens.encode(self.user, tokens.ACCESS, timedelta(seconds=-1))
+        response = self.client.get("/api/v1/users/me", HTTP_JWT=expired)
+        self.assertEqual(response.status_code, 403)
+
+    def test_cached_claims_still_expire(self):
+        access = tokens.encode(self.user, tokens.ACCESS, timedelta(minutes=1))
+        self.assertEqual(tokens.decode(access, tokens.ACCESS)["pk"], self.user.pk)
+        # 두번째는 LRU 에서 나오지만 exp 는 다시 확인함
+        with mock.patch("users.tokens.time.time", return_value=time.time() + 120):
+            with self.assertRaises(AuthenticationFailed):
+                tokens.decode(access, tokens.ACCESS)
+
+
+class TestRoutedAuthentication(APITestCase):
+    def setUp(self):
+        metrics.reset()
+        self.user = User.objects.create(username="routed")
+
+    def test_anonymous_skips_backends(self):
+        with self.assertNumQueries(0):
+            self.client.get("/api/v1/users/me")
+        self.assertEqual(metrics.snapshot()["counters"]["auth.anonymous"], 1)
+
+    def test_token_and_session(self):
+        token = Token.objects.create(user=self.user)
+        response = self.client.get("/api/v1/users/me", HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.assertEqual(response.json()["username"], "routed")
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get("/api/v1/users/me").status_code, 200)
+        timers = metrics.snapshot()["timers"]
+        self.assertEqual(timers["auth.token"]["count"], 1)
+        self.assertEqual(timers["auth.session"]["count"], 1)
+
+
+class TestSocialLogin(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StubOAuthServer(delay=0.05).__enter__()
+        cls.settings = override_settings(OAUTH_PROVIDERS=cls.server.providers())
+        cls.settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        cls.server.__exit__()
+        super().tearDownClass()
+
+    def test_github(self):
+        response = self.client.post("/api/v1/users/github", {"code": "octocat"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        user = User.objects.get(username="octocat")
+        self.assertEqual((user.email, user.name), ("octocat@example.com", "No Name"))
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(self.client.get("/api/v1/users/me").json()["username"], "octocat")
+
+        # 같은 이메일이면 새로 만들지 않음
+        self.client.logout()
+        self.client.post("/api/v1/users/github", {"code": "octocat"}, format="json")
+        self.assertEqual(User.objects.filter(username="octocat").count(), 1)
+
+    def test_github_fetches_profile_and_emails_together(self):
+        self.server.max_in_flight = 0
+        self.client.post("/api/v1/users/github", {"code": "together"}, format="json")
+        self.assertEqual(self.server.max_in_flight, 2)
+
+    def test_client_is_closed_after_login(self):
+        # ASGI lifespan 밖 (async_to_sync 가 요청마다 새 루프) 에서는 로그인 한번에 클라이언트 하나
+        clients = []
+
+        def new_client():
+            pooled = new_client.original()
+            clients.append(pooled[0])
+            return pooled
+
+        new_client.original = oauth.new_client
+        with mock.patch("users.oauth.new_client", new_client):
+            for code in ("first", "second"):
+                self.client.post("/api/v1/users/github", {"code": code}, format="json")
+        self.assertEqual(len(clients), 2)
+        self.assertTrue(all(client.is_closed for client in clients))
+
+    def test_provider_is_abstract(self):
+        with self.assertRaises(TypeError):
+            oauth.Provider()
+
+    def test_kakao_and_naver(self):
+        response = self.client.post("/api/v1/users/kakao", {"code": "ryan"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            "/api/v1/users/naver", {"code": "green", "state": "s"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.objects.get(username="green").name, "Green")
+
+    def test_provider_errors(self):
+        response = self.client.post("/api/v1/users/github", {"code": "bad"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            "/api/v1/users/github", "[1]", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        with override_settings(
+            OAUTH_PROVIDERS={
+                **self.server.providers(),
+                "naver": {
+                    **self.server.providers()["naver"],
+                    "token_url": "http://127.0.0.1:9/token",
+                },
+            }
+        ):
+            response = self.client.post("/api/v1/users/naver", {"code": "green"})
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(User.objects.exists())
@@ -0,0 +1,122 @@
+"""
+JWT access / refresh token
+
+access token 에는 유저 정보 일부 (snapshot) 가 들어있어서 인증할때 DB 를 안 봄.
+서명 검증이 끝난 claims 는 프로세스 안의 LRU 에 넣어두고 같은 토큰이면 exp 만 다시 확인함.
+DB 는 refresh 할때 (유저 확인 + 폐기 여부) 와 로그아웃할때만 씀.
+"""
+
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+import jwt
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from .models import RevokedToken, User
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+# access token 모양 (snapshot 필드) 이 바뀌면 올림, 예전 access token 은 거절해서 refresh 로 다시 받게 함
+TOKEN_VERSION = 2
+
+# access token 에 넣는 유저 필드, 나머지 필드는 쓸때 DB 에서 불러옴 (deferred)
+SNAPSHOT_FIELDS = (
+    "username",
+    "name",
+    "avatar",
+    "is_host",
+    "is_staff",
+    "is_superuser",
+    "is_active",
+    # 가격 통화 (currencies.rates.viewer_currency), 없으면 요청마다 유저를 다시 읽음
+    "currency",
+)
+
+
+def encode(user, kind, lifetime):
+    now = int(time.time())
+    claims = {
+        "type": kind,
+        "pk": user.pk,
+        "iat": now,
+        "exp": now + int(lifetime.total_seconds()),
+        "jti": uuid.uuid4().hex,
+    }
+    if kind == ACCESS:
+        claims["ver"] = TOKEN_VERSION
+        claims["user"] = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+    return jwt.encode(claims, settings.JWT_SECRET, algorithm="HS256")
+
+
+def issue_tokens(user):
+    return {
+        ACCESS: encode(user, ACCESS, settings.JWT_ACCESS_LIFETIME),
+        REFRESH: encode(user, REFRESH, settings.JWT_REFRESH_LIFETIME),
+    }
+
+
+@lru_cache(maxsize=settings.JWT_CLAIMS_CACHE_SIZE)
+def verify(token):
+    """서명 검증 (같은 토큰은 한번만)"""
+    return jwt.decode(
+        token,
+        settings.JWT_SECRET,
+        algorithms=["HS256"],
+        options={"require": ["exp", "iat", "jti"]},
+    )
+
+
+def decode(token, kind):
+    try:
+        claims = verify(token)
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationFailed("Token expired")
+    except jwt.InvalidTokenError:
+        raise AuthenticationFailed("Invalid Token")
+    # LRU 에서 나온 claims 는 exp 검사를 안 거쳤으니까 여기서 다시 봄
+    if claims["exp"] <= time.time():
+        raise AuthenticationFailed("Token expired")
+    if claims.get("type") != kind:
+        raise AuthenticationFailed("Invalid Token")
+    if kind == ACCESS and claims.get("ver") != TOKEN_VERSION:
+        raise AuthenticationFailed("Token outdated")
+    return claims
+
+
+def user_from_claims(claims):
+    """DB 조회 없이 snapshot 으로 User 를 만듬 (snapshot 에 없는 필드는 쓸때 불러옴)"""
+    values = {"id": claims["pk"], **claims["user"]}
+    # from_db 는 모델 필드 순서대로 값을 받음
+    field_names = [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    return User.from_db(
+        "default",
+        field_names,
+        [values[name] for name in field_names],
+    )
+
+
+def refresh_access(token):
+    claims = decode(token, REFRESH)
+    if RevokedToken.objects.filter(jti=claims["jti"]).exists():
+        raise AuthenticationFailed("Token revoked")
+    try:
+        user = User.objects.get(pk=claims["pk"], is_active=True)
+    except User.DoesNotExist:
+        raise AuthenticationFailed("User not Found")
+    return encode(user, ACCESS, settings.JWT_ACCESS_LIFETIME)
+
+
+def revoke(token):
+    claims = decode(token, REFRESH)
+    RevokedToken.objects.get_or_create(
+        jti=claims["jti"],
+        defaults={
+            "expires_at": datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+        },
+    )
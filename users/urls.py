@@ -11,6 +11,8 @@ urlpatterns = [
     path("@<str:username>", views.PublicUser.as_view()),  # 공개프로필
     path("token-login", obtain_auth_token),  # 토큰 로그인
     path("jwt-login", views.JWTLogin.as_view()),  # jwt 로그인
+    path("jwt-refresh", views.JWTRefresh.as_view()),  # refresh token 으로 access token 재발급
+    path("jwt-logout", views.JWTLogout.as_view()),  # refresh token 폐기
     path("github", views.GithubLogin.as_view()),
     path("kakao", views.KakaoLogin.as_view()),
     path("naver", views.NaverLogin.as_view()),
@@ -6,20 +6,36 @@ from rest_framework.exceptions import ParseError, NotFound
 from rest_framework.permissions import IsAuthenticated
 from .serializers import PrivateUserSerializer, TinyUserSerializer
 from .models import User
-import jwt
-from django.conf import settings
-import requests
+from . import tokens
+from .oauth import PROVIDERS, OAuthError
+from common import metrics
+from common.cache import cache_response
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError
+from django.http import HttpResponse
+from django.views import View
+import httpx
+import json
+import time
+
+
+def get_full_user(request):
+    # JWT 로 인증된 유저는 token snapshot 필드만 있어서 전체 프로필이 필요하면 한번에 불러옴
+    user = request.user
+    if user.get_deferred_fields():
+        user = User.objects.get(pk=user.pk)
+    return user
 
 
 class Me(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
+        user = get_full_user(request)
         return Response(PrivateUserSerializer(user).data)
 
     def put(self, request):
-        user = request.user
+        user = get_full_user(request)
         serializer = PrivateUserSerializer(
             user,
             data=request.data,
@@ -64,6 +80,7 @@ class Users(APIView):
 
 
 class PublicUser(APIView):
+    @cache_response("users")
     def get(self, request, username):
         try:
             user = User.objects.get(username=username)
@@ -77,7 +94,7 @@ class ChangePassword(APIView):
     permission_classes = [IsAuthenticated]
 
     def put(self, request):
-        user = request.user
+        user = get_full_user(request)
         old_password = request.data.get("old_password")
         new_password = request.data.get("new_password")
         if not old_password or not new_password:
@@ -130,152 +147,106 @@ class JWTLogin(APIView):
             password=password,
         )
         if user:
-            token = jwt.encode(
-                {"pk": user.pk},
-                settings.SECRET_KEY,
-                algorithm="HS256",
+            issued = tokens.issue_tokens(user)
+            # "token" 은 예전 프론트 호환용 (= access)
+            return Response(
+                {
+                    "token": issued[tokens.ACCESS],
+                    "access": issued[tokens.ACCESS],
+                    "refresh": issued[tokens.REFRESH],
+                }
             )
-            return Response({"token": token})
         else:
             return Response({"error": "wrong password!"})
 
 
-class GithubLogin(APIView):
+class JWTRefresh(APIView):
     def post(self, request):
-        try:
-            code = request.data.get("code")
-            client_id = "4ff505a15275ca6c50a6"
-            github_secret = settings.GITHUB_SECRET
-            access_token = requests.post(
-                f"https://github.com/login/oauth/access_token?code={code}&client_id={client_id}&client_secret={github_secret}",
-                headers={
-                    "Accept": "application/json",
-                },
-            )
-            access_token = access_token.json().get("access_token")
-            user_data = requests.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            user_data = user_data.json()
-            if user_data.get("name") == None:
-                user_data["name"] = "No Name"
-
-            # 깃허브 이메일 받기(깃허브 이메일은 private이라서 따로 요청 url이 있음.)
-            user_emails = requests.get(
-                "https://api.github.com/user/emails",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            user_emails = user_emails.json()
-            github_email = user_emails[0]["email"]
-            try:
-                user = User.objects.get(email=github_email)
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-            except User.DoesNotExist:
-                user = User.objects.create(
-                    username=user_data.get("login"),
-                    email=github_email,
-                    name=user_data.get("name"),
-                    avatar=user_data.get("avatar_url"),
-                )
-                user.set_unusable_password()
-                user.save()
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-        except Exception:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
+        refresh = request.data.get("refresh")
+        if not refresh:
+            raise ParseError
+        return Response({"access": tokens.refresh_access(refresh)})
 
 
-class KakaoLogin(APIView):
+class JWTLogout(APIView):
     def post(self, request):
-        try:
-            code = request.data.get("code")
-            access_token = requests.post(
-                "https://kauth.kakao.com/oauth/token",
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-                data={
-                    "grant_type": "authorization_code",
-                    "client_id": "53fc0ecca4b497fbc215cf23e1b300fd",
-                    "redirect_uri": "http://127.0.0.1:3000/social/kakao",
-                    "code": code,
-                },
-            )
-            access_token = access_token.json().get("access_token")
-            user_data = requests.get(
-                "https://kapi.kakao.com/v2/user/me",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                },
-            )
-            user_data = user_data.json()
-            kakao_account = user_data["kakao_account"]
-            profile = kakao_account["profile"]
-
-            # 이메일을 카카오에서는 사업자등록? 해야 이메일 동의 권한을 받을수있더라고 이메일 없어서 이방식으로 하면 절대안됨. 임시방편임
-            try:
-                user = User.objects.get(username=profile.get("nickname"))
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-            except User.DoesNotExist:
-                user = User.objects.create(
-                    username=profile.get("nickname"),
-                    name=profile.get("nickname"),
-                    avatar=profile.get("profile_image_url"),
-                )
-                user.set_unusable_password()
-                user.save()
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-        except Exception:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
+        refresh = request.data.get("refresh")
+        if not refresh:
+            raise ParseError
+        tokens.revoke(refresh)
+        return Response({"ok": "logout!!"})
 
 
-class NaverLogin(APIView):
-    def post(self, request):
+def parse_body(request):
+    if request.content_type == "application/json":
+        data = json.loads(request.body or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError("body should be an object")
+        return data
+    return request.POST
+
+
+def login_social_user(request, profile):
+    """provider 프로필로 유저를 찾거나 만들어서 세션 로그인 (DB 작업은 여기서 한번에)"""
+    lookup = profile["lookup"]
+    if not all(lookup.values()):
+        raise OAuthError("empty profile")
+    try:
+        user = User.objects.get(**lookup)
+    except User.DoesNotExist:
+        user = User(
+            username=profile["username"],
+            email=profile.get("email", ""),
+            name=profile["name"],
+            avatar=profile["avatar"],
+        )
+        user.set_unusable_password()
+        user.save()
+    login(request, user)
+
+
+class SocialLogin(View):
+    """
+    소셜 로그인 (users.oauth)
+
+    provider 요청은 전부 await 라서 응답을 기다리는 동안 워커가 다른 요청을 처리함.
+    유저 조회/생성과 세션 로그인만 sync_to_async 로 한번에 넘김.
+    """
+
+    provider = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # APIView 처럼 CSRF 검사 안함 (4.1 의 csrf_exempt 는 async view 를 감싸지 못해서 직접 표시)
+        view.csrf_exempt = True
+        return view
+
+    async def post(self, request):
+        started = time.perf_counter()
         try:
-            code = request.data.get("code")
-            state = request.data.get("state")
-            access_token = requests.post(
-                "https://nid.naver.com/oauth2.0/token",
-                data={
-                    "grant_type": "authorization_code",
-                    "client_id": "fpoOdeasfK9LdgkuknhQ",
-                    "client_secret": settings.NAVER_SECRET,
-                    "code": code,
-                    "state": state,
-                },
-            )
-            access_token = access_token.json()
-            token = access_token.get("access_token")
-            user_data = requests.get(
-                "https://openapi.naver.com/v1/nid/me",
-                headers={"Authorization": f"Bearer {token}"},
-            )
+            data = parse_body(request)
+            profile = await PROVIDERS[self.provider]().authenticate(data)
+            await sync_to_async(login_social_user)(request, profile)
+        except (OAuthError, ValueError, IntegrityError):
+            metrics.incr(f"oauth.{self.provider}.failed")
+            return HttpResponse(status=status.HTTP_400_BAD_REQUEST)
+        except httpx.HTTPError:
+            # provider 연결 실패 / 시간 초과
+            metrics.incr(f"oauth.{self.provider}.unavailable")
+            return HttpResponse(status=status.HTTP_502_BAD_GATEWAY)
+        finally:
+            metrics.observe(f"oauth.{self.provider}", time.perf_counter() - started)
+        return HttpResponse(status=status.HTTP_200_OK)
 
-            user_data = user_data.json()
-            naver_account = user_data["response"]
-            try:
-                user = User.objects.get(username=naver_account.get("nickname"))
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-            except User.DoesNotExist:
-                user = User.objects.create(
-                    username=naver_account.get("nickname"),
-                    name=naver_account.get("name"),
-                    avatar=naver_account.get("profile_image"),
-                )
-                user.set_unusable_password()
-                user.save()
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
-        except Exception:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+class GithubLogin(SocialLogin):
+    provider = "github"
+
+
+class KakaoLogin(SocialLogin):
+    provider = "kakao"
+
+
+class NaverLogin(SocialLogin):
+    provider = "naver"
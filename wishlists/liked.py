@@ -0,0 +1,63 @@
+"""
+유저가 위시리스트에 담은 방/체험 id 모음
+
+serializer 의 is_liked 마다 Wishlist 를 조회하지 않고,
+요청당 한번 (캐시가 있으면 0번) 만 불러와서 메모리에서 확인함.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Value
+from .models import Wishlist
+
+
+def cache_key(user):
+    return f"wishlists:liked:{user.pk}"
+
+
+def load_liked(user):
+    rooms = (
+        Wishlist.rooms.through.objects.filter(wishlist__user=user)
+        .annotate(kind=Value("rooms"))
+        .values_list("kind", "room_id")
+    )
+    experiences = (
+        Wishlist.experiences.through.objects.filter(wishlist__user=user)
+        .annotate(kind=Value("experiences"))
+        .values_list("kind", "experience_id")
+    )
+    liked = {"rooms": set(), "experiences": set()}
+    for kind, pk in rooms.union(experiences, all=True):
+        liked[kind].add(pk)
+    return liked
+
+
+def get_liked(request):
+    """{"rooms": {...}, "experiences": {...}} - 한 요청 안에서는 한번만 계산"""
+    liked = getattr(request, "_liked", None)
+    if liked is not None:
+        return liked
+    user = request.user
+    if not user.is_authenticated:
+        liked = {"rooms": set(), "experiences": set()}
+    elif settings.LIKED_CACHE_TIMEOUT:
+        liked = cache.get(cache_key(user))
+        if liked is None:
+            liked = load_liked(user)
+            cache.set(cache_key(user), liked, settings.LIKED_CACHE_TIMEOUT)
+    else:
+        liked = load_liked(user)
+    request._liked = liked
+    return liked
+
+
+def is_liked(context, kind, pk):
+    request = context.get("request")
+    if request is None:
+        return False
+    return pk in get_liked(request)[kind]
+
+
+def forget_liked(user):
+    """위시리스트 내용이 바뀌었을때 호출"""
+    cache.delete(cache_key(user))
@@ -1,3 +1,60 @@
-from django.test import TestCase
+import json
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rooms.models import Room
+from users.models import User
+from .models import Wishlist
 
-# Create your tests here.
+
+class TestLiked(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="guest")
+        self.rooms = [
+            Room.objects.create(
+                name=f"Room {i}",
+                price=1,
+                rooms=1,
+                toilets=1,
+                description="desc",
+                address="addr",
+                owner=self.user,
+            )
+            for i in range(3)
+        ]
+        self.wishlist = Wishlist.objects.create(name="trip", user=self.user)
+        self.wishlist.rooms.add(self.rooms[0])
+        self.client.force_login(self.user)
+
+    def liked_rooms(self):
+        return {room["pk"] for room in self.client.get("/api/v1/rooms/").json() if room["is_liked"]}
+
+    def test_list_is_liked(self):
+        self.assertEqual(self.liked_rooms(), {self.rooms[0].pk})
+        # 두번째부터는 캐시에서 (세션 + 유저 + 방)
+        with self.assertNumQueries(3):
+            self.client.get("/api/v1/rooms/")
+
+    def test_toggle_invalidates(self):
+        self.assertEqual(self.liked_rooms(), {self.rooms[0].pk})
+        self.client.put(f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.rooms[1].pk}")
+        self.assertEqual(self.liked_rooms(), {self.rooms[0].pk, self.rooms[1].pk})
+        self.client.put(f"/api/v1/wishlists/{self.wishlist.pk}/rooms/{self.rooms[0].pk}")
+        self.assertEqual(self.liked_rooms(), {self.rooms[1].pk})
+
+    def test_detail_is_liked(self):
+        response = self.client.get(f"/api/v1/rooms/{self.rooms[0].pk}")
+        self.assertTrue(response.json()["is_liked"])
+        self.client.logout()
+        response = self.client.get(f"/api/v1/rooms/{self.rooms[0].pk}")
+        self.assertFalse(response.json()["is_liked"])
+
+    def test_wishlists_stream(self):
+        Wishlist.objects.create(name="empty", user=self.user)
+        response = self.client.get("/api/v1/wishlists/")
+        self.assertTrue(response.streaming)
+        self.assertTrue(response.has_header("ETag"))
+        wishlists = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([wishlist["name"] for wishlist in wishlists], ["trip", "empty"])
+        self.assertEqual([room["pk"] for room in wishlists[0]["rooms"]], [self.rooms[0].pk])
+        self.assertTrue(wishlists[0]["rooms"][0]["is_liked"])
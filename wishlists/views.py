@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -5,20 +6,40 @@ from rest_framework.exceptions import NotFound
 from rest_framework.status import HTTP_200_OK
 from .serializers import WishlistSerializer, WishlistDetailSerializer
 from .models import Wishlist
+from .liked import forget_liked
+from common.mixins import ConditionalGetMixin
+from common.streaming import stream_response
+from common.aio import AsyncAPIView, aget_object
+from currencies.rates import price_validator
 from rooms.models import Room
+from rooms.views import ViewerMixin, with_cover_photo
 
 
-class Wishlists(APIView):
+class Wishlists(ConditionalGetMixin, AsyncAPIView):
     permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        all_wishlists = Wishlist.objects.filter(user=request.user)
-        serializer = WishlistSerializer(
+    validator_relations = ("rooms", "rooms__photos")
+
+    def get_validator_queryset(self, request):
+        return Wishlist.objects.filter(user=request.user)
+
+    def get_validator_extra(self, request):
+        # 방 가격이 보는 사람 통화로 바뀌어서 들어감
+        return [request.user.pk, *price_validator(request)]
+
+    async def get(self, request):
+        # 스트리밍 body 는 common.asgi 가 조각마다 스레드에서 읽음
+        all_wishlists = (
+            Wishlist.objects.filter(user=request.user)
+            .prefetch_related(
+                Prefetch("rooms", queryset=with_cover_photo(Room.objects.all()))
+            )
+            .order_by("pk")
+        )
+        return stream_response(
             all_wishlists,
-            many=True,
-            context={"request": request},
+            WishlistSerializer,
+            {"request": request},
         )
-        return Response(serializer.data)
 
     def post(self, request):
         serializer = WishlistSerializer(data=request.data)
@@ -30,9 +51,16 @@ class Wishlists(APIView):
             return Response(serializer.errors)
 
 
-class WishlistDetail(APIView):
+class WishlistDetail(ViewerMixin, ConditionalGetMixin, AsyncAPIView):
 
     permission_classes = [IsAuthenticated]
+    validator_relations = ("rooms", "rooms__photos")
+
+    def get_validator_queryset(self, request, pk):
+        return Wishlist.objects.filter(pk=pk, user=request.user)
+
+    def get_validator_extra(self, request, pk):
+        return [request.user.pk, *price_validator(request)]
 
     def get_object(self, pk, user):
         try:
@@ -41,8 +69,14 @@ class WishlistDetail(APIView):
         except Wishlist.DoesNotExist:
             raise NotFound
 
-    def get(self, request, pk):
-        wishlist = self.get_object(pk, request.user)
+    async def get(self, request, pk):
+        wishlist = await aget_object(
+            Wishlist.objects.prefetch_related(
+                Prefetch("rooms", queryset=with_cover_photo(Room.objects.all()))
+            ),
+            pk=pk,
+            user=request.user,
+        )
         serializer = WishlistSerializer(
             wishlist,
             context={"request": request},
@@ -52,6 +86,7 @@ class WishlistDetail(APIView):
     def delete(self, request, pk):
         wishlist = self.get_object(pk, request.user)
         wishlist.delete()
+        forget_liked(request.user)
         return Response(status=HTTP_200_OK)
 
     def put(self, request, pk):
@@ -89,4 +124,5 @@ class WishlistToggle(APIView):
             wishlist.rooms.remove(room)
         else:
             wishlist.rooms.add(room)
+        forget_liked(request.user)
         return Response(status=HTTP_200_OK)